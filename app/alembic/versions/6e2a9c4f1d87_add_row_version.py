@@ -0,0 +1,70 @@
+"""add_row_version
+
+Revision ID: 6e2a9c4f1d87
+Revises: 8b3e6d1f0a52
+Create Date: 2025-02-10 14:36:05.512093
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "6e2a9c4f1d87"
+down_revision = "8b3e6d1f0a52"
+branch_labels = None
+depends_on = None
+
+
+# Tables and their generated columns
+TABLES = {
+    "team": (),
+    "employee": (),
+    "vacation": ("period",),
+}
+
+
+def upgrade():
+    op.execute(sa.schema.CreateSequence(sa.Sequence("row_version")))
+    # Generated columns are not computed yet in NEW of a BEFORE trigger, they
+    # are named as arguments to be left out of the comparison
+    op.execute(
+        """
+        CREATE FUNCTION bump_row_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            -- Null without arguments
+            generated text[] := coalesce(TG_ARGV, '{}');
+        BEGIN
+            IF to_jsonb(NEW) - generated IS DISTINCT FROM to_jsonb(OLD) - generated THEN
+                NEW.version := nextval('row_version');
+            END IF;
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    for table, generated in TABLES.items():
+        op.add_column(
+            table,
+            sa.Column(
+                "version",
+                sa.BigInteger(),
+                server_default=sa.text("nextval('row_version')"),
+                nullable=False,
+            ),
+        )
+        arguments = ", ".join(f"'{column}'" for column in generated)
+        op.execute(
+            f"CREATE TRIGGER {table}_version_tg BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION bump_row_version({arguments})"
+        )
+
+
+def downgrade():
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER {table}_version_tg ON {table}")
+        op.drop_column(table, "version")
+    op.execute("DROP FUNCTION bump_row_version()")
+    op.execute(sa.schema.DropSequence(sa.Sequence("row_version")))
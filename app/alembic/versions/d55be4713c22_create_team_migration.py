@@ -6,12 +6,12 @@ Create Date: 2024-12-14 23:40:57.429492
 
 """
 
+import uuid
+
 import sqlalchemy as sa
 from alembic import op
-from sqlalchemy import orm
 
 from app.model.base import CustomUUID
-from app.model.team import TeamModel
 
 
 # revision identifiers, used by Alembic.
@@ -31,24 +31,21 @@ def upgrade():
     )
     op.create_index(op.f("ix_team_id"), "team", ["id"], unique=False)
 
-    # Add default team
-    bind = op.get_bind()
-    session = orm.Session(bind=bind)
-    staff = TeamModel(name="General staff")
-    session.add(staff)
-    session.commit()
+    # Add default team, with the table as of this revision rather than the
+    # model which gains columns in later ones
+    staff_id = uuid.uuid4()
+    team = sa.table("team", sa.column("id", CustomUUID()), sa.column("name"))
+    op.execute(team.insert().values(id=staff_id, name="General staff"))
 
     op.add_column(
         "employee",
         sa.Column(
-            "team_id", CustomUUID(), nullable=False, server_default=str(staff.id)
+            "team_id", CustomUUID(), nullable=False, server_default=str(staff_id)
         ),
     )
     op.create_foreign_key(
         "employee_team_id_fk", "employee", "team", ["team_id"], ["id"]
     )
-
-    session.close()
     # ### end Alembic commands ###
 
 
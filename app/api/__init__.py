@@ -1,14 +1,19 @@
 import time
 from datetime import datetime, timezone
+from http import HTTPStatus
 
 from fastapi import FastAPI, Request
 
+from ..core.config import settings
+from ..db.pool import pool_stats, track_pool_usage
+from ..db.session import READ_PRIMARY_COOKIE
 from ..timeseries.mongo import get_mongo_collection
-from .routes import employee, health, team, vacation
+from .routes import calendar, employee, health, imports, internal, team, vacation
 
 
 __all__ = (
     "add_app_routes",
+    "read_your_writes_middleware",
     "stats_middleware",
 )
 
@@ -18,7 +23,10 @@ def add_app_routes(app: FastAPI):
     Add all routers
     """
     app.include_router(health.router)
+    app.include_router(calendar.router)
     app.include_router(employee.router)
+    app.include_router(imports.router)
+    app.include_router(internal.router)
     app.include_router(team.router)
     app.include_router(vacation.router)
 
@@ -29,14 +37,42 @@ async def stats_middleware(request: Request, call_next):
     """
 
     start_time = time.perf_counter()
-    response = await call_next(request)
+    with track_pool_usage() as pool_usage:
+        response = await call_next(request)
+    pools = pool_stats()
 
     get_mongo_collection().insert_one(
         {
             "status_code": response.status_code,
             "response_time": time.perf_counter() - start_time,
             "timestamp": datetime.now(tz=timezone.utc),
+            "pool_checkouts": pool_usage.checkouts,
+            "pool_wait": pool_usage.wait_seconds,
+            "pool_checked_out": sum(pool.checked_out for pool in pools),
+            "pool_overflow": sum(pool.overflow for pool in pools),
         },
     )
 
     return response
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """
+    Middleware sending clients to the primary for a while after they wrote,
+    replicas may not have their writes yet
+    """
+    response = await call_next(request)
+
+    if (
+        settings.SQLALCHEMY_REPLICA_URIS
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < HTTPStatus.BAD_REQUEST
+    ):
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            "1",
+            max_age=settings.SQLALCHEMY_READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+        )
+
+    return response
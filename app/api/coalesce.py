@@ -0,0 +1,94 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+from ..core.config import settings
+from ..schema.coalesce import CoalescingStatsSchema
+
+
+__all__ = (
+    "Coalescer",
+    "coalescing_stats",
+)
+
+
+Result = TypeVar("Result")
+
+
+_coalescers: dict[str, "Coalescer"] = {}
+
+
+class Coalescer:
+    """
+    Runs identical concurrent reads once in this process, requests asking
+    for a key already being loaded wait for that load and share its result
+
+    Results are kept `REQUEST_COALESCING_TTL` seconds after their load
+    completes, by default only loads in flight are shared
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.ttl = settings.REQUEST_COALESCING_TTL
+        self.requests = self.loads = self.coalesced = 0
+        self._loads: dict[Hashable, asyncio.Task] = {}
+        _coalescers[name] = self
+
+    @property
+    def enabled(self) -> bool:
+        return settings.REQUEST_COALESCING
+
+    async def run(
+        self, key: Hashable | None, load: Callable[[], Awaitable[Result]]
+    ) -> Result:
+        """
+        Result of `load`, shared with other requests of the same `key`, run
+        on its own when `key` is None
+
+        Loads run in a task of their own, one request going away does not
+        cancel those of others, so `load` must not use anything bound to the
+        request, such as its session
+        """
+        self.requests += 1
+        if key is None or not self.enabled:
+            self.loads += 1
+            return await load()
+        if (task := self._loads.get(key)) is None:
+            self.loads += 1
+            task = asyncio.ensure_future(load())
+            self._loads[key] = task
+            task.add_done_callback(lambda done: self._loaded(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _loaded(self, key: Hashable, task: asyncio.Task):
+        # Errors are not kept, and retrieved in case no request waits anymore
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0:
+            self._forget(key, task)
+        else:
+            asyncio.get_running_loop().call_later(self.ttl, self._forget, key, task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._loads.get(key) is task:
+            del self._loads[key]
+
+
+def coalescing_stats() -> list[CoalescingStatsSchema]:
+    """
+    Counters of coalescers
+    """
+    return [
+        CoalescingStatsSchema(
+            name=name,
+            enabled=coalescer.enabled,
+            requests=coalescer.requests,
+            loads=coalescer.loads,
+            coalesced=coalescer.coalesced,
+            in_flight=sum(
+                not task.done()
+                for task in coalescer._loads.values()  # pylint:disable=protected-access
+            ),
+        )
+        for name, coalescer in _coalescers.items()
+    ]
@@ -0,0 +1,42 @@
+from http import HTTPStatus
+from uuid import UUID
+
+from fastapi import HTTPException, Query
+from pydantic import TypeAdapter, ValidationError
+
+from ..repository.base import MAX_PAGE_SIZE
+
+
+__all__ = (
+    "split_fields",
+    "split_ids",
+)
+
+
+_ids_adapter = TypeAdapter(list[UUID])
+
+
+def split_fields(value: str | None) -> tuple[str, ...] | None:
+    """
+    Names of a comma separated `fields` or `expand` query parameter, None
+    when it was not given
+    """
+    if value is None:
+        return None
+    return tuple(name for name in (part.strip() for part in value.split(",")) if name)
+
+
+def split_ids(ids: str = Query(description="Comma separated IDs")) -> list[UUID]:
+    """
+    FastAPI dependency parsing a comma separated `ids` query parameter, at
+    most `MAX_PAGE_SIZE` of them
+    """
+    try:
+        parsed = _ids_adapter.validate_python(split_fields(ids))
+    except ValidationError as exc:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, "Invalid ids") from exc
+    if len(parsed) > MAX_PAGE_SIZE:
+        raise HTTPException(
+            HTTPStatus.BAD_REQUEST, f"At most {MAX_PAGE_SIZE} ids at once"
+        )
+    return parsed
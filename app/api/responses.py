@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import inspect
+from collections.abc import Callable
+from functools import wraps
+from http import HTTPStatus
+from typing import Any
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from starlette.responses import Response
+
+
+__all__ = (
+    "PydanticJSONRoute",
+    "entity_tag",
+    "not_modified",
+    "render_json",
+)
+
+
+def _response_parameter(endpoint: Callable) -> str | None:
+    """
+    Name of the parameter FastAPI injects the sub response in, if any
+    """
+    for name, parameter in inspect.signature(
+        endpoint, eval_str=True
+    ).parameters.items():
+        if isinstance(parameter.annotation, type) and issubclass(
+            parameter.annotation, Response
+        ):
+            return name
+    return None
+
+
+def _respond_with_json(endpoint: Callable, route: "PydanticJSONRoute") -> Callable:
+    response_parameter = _response_parameter(endpoint)
+
+    def respond(content: Any, kwargs: dict[str, Any]) -> Response:
+        if isinstance(content, Response):
+            return content
+        response = Response(
+            route.render(content),
+            status_code=route.status_code or 200,
+            media_type="application/json",
+        )
+        # Headers and status set on the sub response are kept as FastAPI does
+        if (sub_response := kwargs.get(response_parameter)) is not None:
+            if sub_response.status_code:
+                response.status_code = sub_response.status_code
+            response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    if asyncio.iscoroutinefunction(endpoint):
+
+        @wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            return respond(await endpoint(*args, **kwargs), kwargs)
+
+        return async_wrapper
+
+    @wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        return respond(endpoint(*args, **kwargs), kwargs)
+
+    return wrapper
+
+
+class PydanticJSONRoute(APIRoute):
+    """
+    Route serializing what its endpoint returns once with pydantic-core
+
+    FastAPI validates a returned value against the response model, dumps it
+    to Python objects then encodes them with the stdlib. Endpoints already
+    return validated objects, they are encoded directly by the serializer of
+    the response model instead. It only writes the fields of the model, and
+    fails rather than guess on a value that is not of the declared type, so
+    bodies match the OpenAPI schema
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        # Signature and return annotation are read through `__wrapped__`
+        super().__init__(path, _respond_with_json(endpoint, self), **kwargs)
+        self.response_adapter = (
+            None if self.response_model is None else TypeAdapter(self.response_model)
+        )
+
+    def render(self, content: Any) -> bytes:
+        """
+        JSON body of `content` as the route answers it, for endpoints sharing
+        a body between requests
+        """
+        if self.response_adapter is None:
+            return to_json(content)
+        return self.response_adapter.dump_json(
+            content,
+            include=self.response_model_include,
+            exclude=self.response_model_exclude,
+            by_alias=self.response_model_by_alias,
+            exclude_unset=self.response_model_exclude_unset,
+            exclude_defaults=self.response_model_exclude_defaults,
+            exclude_none=self.response_model_exclude_none,
+            warnings="error",
+        )
+
+
+def render_json(request: Request, content: Any) -> bytes:
+    """
+    JSON body the route of `request` answers with for `content`
+    """
+    return request.scope["route"].render(content)
+
+
+def entity_tag(request: Request, version: str) -> str:
+    """
+    Strong ETag of the response to a GET reading rows at `version`, the
+    response also depends on the path and query
+    """
+    digest = hashlib.md5(
+        f"{request.url.path}?{request.url.query}:{version}".encode()
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """
+    `304 Not Modified` response when `If-None-Match` has `etag`, for routes
+    to return before reading and serializing what the client already has
+    """
+    if (if_none_match := request.headers.get("if-none-match")) is None:
+        return None
+    # Weak comparison, as If-None-Match requires
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag not in tags and "*" not in tags:
+        return None
+    return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
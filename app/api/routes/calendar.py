@@ -0,0 +1,102 @@
+from http import HTTPStatus
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...db.session import get_async_db, get_async_read_db
+from ...domain.calendar import update_calendar as domain_update_calendar
+from ...domain.holiday import add_holiday, remove_holiday
+from ...repository.calendar import AsyncCalendarRepository, AsyncHolidayRepository
+from ...schema.calendar import (
+    CalendarCreateSchema,
+    CalendarSchema,
+    CalendarUpdateSchema,
+    HolidayCreateSchema,
+    HolidaySchema,
+)
+from ..responses import PydanticJSONRoute
+
+
+router = APIRouter(prefix="/calendar", tags=["Calendar"], route_class=PydanticJSONRoute)
+
+
+@router.get("/{calendar_id}")
+async def get_calendar(
+    session: AsyncSession = Depends(get_async_read_db),
+    *,
+    calendar_id: UUID,
+) -> CalendarSchema:
+    """
+    Get calendar by ID
+    """
+    if (
+        calendar := await AsyncCalendarRepository.get_by_id(
+            session,
+            calendar_id=calendar_id,
+        )
+    ) is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND)
+
+    return calendar
+
+
+@router.post("", status_code=HTTPStatus.CREATED)
+async def create_calendar(
+    calendar: CalendarCreateSchema,
+    session: AsyncSession = Depends(get_async_db),
+) -> CalendarSchema:
+    """
+    Create a calendar
+    """
+    return await AsyncCalendarRepository.create(session, calendar)
+
+
+@router.patch("/{calendar_id}")
+async def update_calendar(
+    update_data: CalendarUpdateSchema,
+    session: AsyncSession = Depends(get_async_db),
+    *,
+    calendar_id: UUID,
+) -> CalendarSchema:
+    """
+    Update calendar
+    """
+    calendar = await get_calendar(session, calendar_id=calendar_id)
+    return await session.run_sync(domain_update_calendar, calendar, update_data)
+
+
+@router.post("/{calendar_id}/holiday", status_code=HTTPStatus.CREATED)
+async def create_calendar_holiday(
+    holiday: HolidayCreateSchema,
+    session: AsyncSession = Depends(get_async_db),
+    *,
+    calendar_id: UUID,
+) -> HolidaySchema:
+    """
+    Add a holiday to calendar
+    """
+    calendar = await get_calendar(session, calendar_id=calendar_id)
+    return await session.run_sync(add_holiday, calendar, holiday)
+
+
+@router.delete("/{calendar_id}/holiday/{holiday_id}")
+async def delete_calendar_holiday(
+    session: AsyncSession = Depends(get_async_db),
+    *,
+    calendar_id: UUID,
+    holiday_id: UUID,
+) -> HolidaySchema:
+    """
+    Remove a holiday from calendar
+    """
+    if (
+        holiday := await AsyncHolidayRepository.get_by_id_calendar_id(
+            session, holiday_id, calendar_id
+        )
+    ) is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND)
+
+    await session.run_sync(remove_holiday, holiday)
+
+    return holiday
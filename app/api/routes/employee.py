@@ -1,33 +1,68 @@
 from http import HTTPStatus
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...db.session import get_db
+from ...db.session import get_async_db, get_async_read_db
 from ...domain.employee import update_employee as domain_update_employee
-from ...domain.exceptions import DomainException
-from ...domain.vacation import new_vacation, update_vacation
-from ...repository.employee import EmployeeRepository
-from ...repository.vacation import VacationRepository
+from ...domain.exceptions import DomainException, VacationNotFoundException
+from ...domain.schedule import add_schedule_change, remove_schedule_change
+from ...domain.vacation import (
+    delete_vacation_async,
+    new_vacation_async,
+    new_vacations_async,
+    update_vacation_async,
+)
+from ...repository.balance import AsyncVacationBalanceRepository
+from ...repository.base import (
+    MAX_PAGE_SIZE,
+    PAGE_SIZE,
+    InvalidCursorException,
+    InvalidFieldsException,
+)
+from ...repository.employee import AsyncEmployeeRepository
+from ...repository.schedule import AsyncEmployeeScheduleRepository
+from ...repository.vacation import AsyncVacationRepository
+from ...schema.balance import BalanceSchema
 from ...schema.employee import (
     EmployeeCreateSchema,
     EmployeeSchema,
     EmployeeUpdateSchema,
 )
+from ...schema.lookup import LookupSchema
+from ...schema.page import PageSchema
+from ...schema.projection import VacationProjection
+from ...schema.schedule import EmployeeScheduleCreateSchema, EmployeeScheduleSchema
 from ...schema.vacation import (
+    VacationBatchResultSchema,
     VacationCreateSchema,
     VacationSchema,
     VacationUpdateSchema,
 )
+from ..params import split_fields, split_ids
+from ..responses import PydanticJSONRoute, entity_tag, not_modified
+
+
+router = APIRouter(prefix="/employee", tags=["Employee"], route_class=PydanticJSONRoute)
 
 
-router = APIRouter(prefix="/employee", tags=["Employee"])
+@router.get("")
+async def get_employees(
+    session: AsyncSession = Depends(get_async_read_db),
+    ids: list[UUID] = Depends(split_ids),
+) -> LookupSchema[EmployeeSchema]:
+    """
+    Get employees by ID in one query, in the order of `ids`, those not found
+    are listed in `missing`
+    """
+    return await AsyncEmployeeRepository.get_many_by_ids(session, ids)
 
 
 @router.get("/{employee_id}")
-def get_employee(
-    session: Session = Depends(get_db),
+async def get_employee(
+    session: AsyncSession = Depends(get_async_read_db),
     *,
     employee_id: UUID,
 ) -> EmployeeSchema:
@@ -35,10 +70,7 @@ def get_employee(
     Get employee by ID
     """
     if (
-        employee := EmployeeRepository.get_by_id(
-            session,
-            employee_id=employee_id,
-        )
+        employee := await AsyncEmployeeRepository.get_cached(session, employee_id)
     ) is None:
         raise HTTPException(HTTPStatus.NOT_FOUND)
 
@@ -46,63 +78,123 @@ def get_employee(
 
 
 @router.post("", status_code=HTTPStatus.CREATED)
-def create_employee(
+async def create_employee(
     employee: EmployeeCreateSchema,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ) -> EmployeeSchema:
     """
     Create an employee
     """
-    return EmployeeRepository.create(session, employee)
+    return await AsyncEmployeeRepository.create(session, employee)
+
+
+@router.post("/batch", status_code=HTTPStatus.CREATED)
+async def create_employees(
+    employees: list[EmployeeCreateSchema],
+    session: AsyncSession = Depends(get_async_db),
+) -> list[EmployeeSchema]:
+    """
+    Create many employees in one transaction, results keep the order of the
+    request
+    """
+    return await AsyncEmployeeRepository.bulk_create(session, employees)
 
 
 @router.patch("/{employee_id}")
-def update_employee(
+async def update_employee(
     update_data: EmployeeUpdateSchema,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
     *,
     employee_id: UUID,
 ) -> EmployeeSchema:
     """
     Update employee
     """
-    employee = get_employee(session, employee_id=employee_id)
-    return domain_update_employee(session, employee, update_data)
+    # Read from the session rather than the cache to be updated
+    if (
+        employee := await AsyncEmployeeRepository.get_by_id(
+            session,
+            employee_id=employee_id,
+        )
+    ) is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND)
+    return await session.run_sync(domain_update_employee, employee, update_data)
 
 
 @router.post("/{employee_id}/vacation", status_code=HTTPStatus.CREATED)
-def create_employee_vacation(
+async def create_employee_vacation(
     vacation: VacationCreateSchema,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
     *,
     employee_id: UUID,
 ) -> VacationSchema:
     """
     Create a vacation for employee
     """
-    employee = get_employee(session, employee_id=employee_id)
+    employee = await get_employee(session, employee_id=employee_id)
     try:
-        return new_vacation(session, vacation, employee)
+        return await new_vacation_async(session, vacation, employee)
     except DomainException as exc:
         raise HTTPException(HTTPStatus.BAD_REQUEST, str(exc)) from exc
 
 
+@router.post("/{employee_id}/vacation/batch")
+async def create_employee_vacations(
+    vacations: list[VacationCreateSchema],
+    session: AsyncSession = Depends(get_async_db),
+    *,
+    employee_id: UUID,
+) -> list[VacationBatchResultSchema]:
+    """
+    Create many vacations for employee in one transaction, results keep
+    the order of the request
+    """
+    employee = await get_employee(session, employee_id=employee_id)
+    return await new_vacations_async(session, vacations, employee)
+
+
 @router.get("/{employee_id}/vacation")
-def get_employee_vacations(
-    session: Session = Depends(get_db),
+async def get_employee_vacations(
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_read_db),
     *,
     employee_id: UUID,
-) -> list[VacationSchema]:
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    expand: str | None = None,
+) -> PageSchema[VacationProjection | dict[str, Any]]:
     """
-    Get all vacations for employee
+    Get a page of vacations for employee, ordered by start date
+
+    `fields` and `expand` are comma separated, as for `GET /vacation`, and
+    `If-None-Match` is answered as it is there
     """
-    employee = get_employee(session, employee_id=employee_id)
-    return VacationRepository.get_by_employee_id(session, employee.id)
+    employee = await get_employee(session, employee_id=employee_id)
+    page_args = {
+        "employee_id": employee.id,
+        "limit": limit,
+        "cursor": cursor,
+        "fields": split_fields(fields),
+        "expand": split_fields(expand),
+    }
+    try:
+        etag = entity_tag(
+            request, await AsyncVacationRepository.page_version(session, **page_args)
+        )
+        if (unchanged := not_modified(request, etag)) is not None:
+            return unchanged
+        page = await AsyncVacationRepository.project_page(session, **page_args)
+    except (InvalidCursorException, InvalidFieldsException) as exc:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, str(exc)) from exc
+    response.headers["ETag"] = etag
+    return page
 
 
 @router.get("/{employee_id}/vacation/{vacation_id}")
-def get_employee_vacation(
-    session: Session = Depends(get_db),
+async def get_employee_vacation(
+    session: AsyncSession = Depends(get_async_read_db),
     *,
     employee_id: UUID,
     vacation_id: UUID,
@@ -110,9 +202,9 @@ def get_employee_vacation(
     """
     Create a vacation for employee
     """
-    employee = get_employee(session, employee_id=employee_id)
+    employee = await get_employee(session, employee_id=employee_id)
     if (
-        vacation := VacationRepository.get_by_employee_id_employee_id(
+        vacation := await AsyncVacationRepository.get_by_employee_id_employee_id(
             session, vacation_id, employee.id
         )
     ) is None:
@@ -122,9 +214,9 @@ def get_employee_vacation(
 
 
 @router.patch("/{employee_id}/vacation/{vacation_id}")
-def update_employee_vacation(
+async def update_employee_vacation(
     update_data: VacationUpdateSchema,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
     *,
     employee_id: UUID,
     vacation_id: UUID,
@@ -132,19 +224,21 @@ def update_employee_vacation(
     """
     Update a vacation for employee
     """
-    vacation = get_employee_vacation(
+    vacation = await get_employee_vacation(
         session, employee_id=employee_id, vacation_id=vacation_id
     )
 
     try:
-        return update_vacation(session, vacation, update_data)
+        return await update_vacation_async(session, vacation, update_data)
+    except VacationNotFoundException as exc:
+        raise HTTPException(HTTPStatus.NOT_FOUND) from exc
     except DomainException as exc:
         raise HTTPException(HTTPStatus.BAD_REQUEST, str(exc)) from exc
 
 
 @router.delete("/{employee_id}/vacation/{vacation_id}")
-def delete_employee_vacation(
-    session: Session = Depends(get_db),
+async def delete_employee_vacation(
+    session: AsyncSession = Depends(get_async_db),
     *,
     employee_id: UUID,
     vacation_id: UUID,
@@ -152,10 +246,78 @@ def delete_employee_vacation(
     """
     Delete a vacation for employee
     """
-    vacation = get_employee_vacation(
+    vacation = await get_employee_vacation(
         session, employee_id=employee_id, vacation_id=vacation_id
     )
 
-    VacationRepository.delete(session, vacation)
+    try:
+        return await delete_vacation_async(session, vacation)
+    except VacationNotFoundException as exc:
+        raise HTTPException(HTTPStatus.NOT_FOUND) from exc
 
-    return vacation
+
+@router.get("/{employee_id}/balance")
+async def get_employee_balance(
+    session: AsyncSession = Depends(get_async_read_db),
+    *,
+    employee_id: UUID,
+    year: int | None = None,
+) -> list[BalanceSchema]:
+    """
+    Get worked days taken as vacation by employee per year and type
+    """
+    employee = await get_employee(session, employee_id=employee_id)
+    return await AsyncVacationBalanceRepository.get_by_employee_id(
+        session, employee.id, year
+    )
+
+
+@router.get("/{employee_id}/schedule")
+async def get_employee_schedules(
+    session: AsyncSession = Depends(get_async_read_db),
+    *,
+    employee_id: UUID,
+) -> list[EmployeeScheduleSchema]:
+    """
+    Get all dated schedule changes for employee
+    """
+    employee = await get_employee(session, employee_id=employee_id)
+    return await AsyncEmployeeScheduleRepository.get_by_employee_id(
+        session, employee.id
+    )
+
+
+@router.post("/{employee_id}/schedule", status_code=HTTPStatus.CREATED)
+async def create_employee_schedule(
+    schedule: EmployeeScheduleCreateSchema,
+    session: AsyncSession = Depends(get_async_db),
+    *,
+    employee_id: UUID,
+) -> EmployeeScheduleSchema:
+    """
+    Create a dated schedule change for employee
+    """
+    employee = await get_employee(session, employee_id=employee_id)
+    return await session.run_sync(add_schedule_change, employee, schedule)
+
+
+@router.delete("/{employee_id}/schedule/{schedule_id}")
+async def delete_employee_schedule(
+    session: AsyncSession = Depends(get_async_db),
+    *,
+    employee_id: UUID,
+    schedule_id: UUID,
+) -> EmployeeScheduleSchema:
+    """
+    Delete a dated schedule change for employee
+    """
+    if (
+        schedule := await AsyncEmployeeScheduleRepository.get_by_id_employee_id(
+            session, schedule_id, employee_id
+        )
+    ) is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND)
+
+    await session.run_sync(remove_schedule_change, schedule)
+
+    return schedule
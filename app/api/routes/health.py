@@ -1,11 +1,13 @@
 from fastapi import APIRouter
 
+from ..responses import PydanticJSONRoute
 
-router = APIRouter(prefix="/health", tags=["Health"])
+
+router = APIRouter(prefix="/health", tags=["Health"], route_class=PydanticJSONRoute)
 
 
 @router.get("")
-def ping():
+async def ping():
     """
     Health check
     """
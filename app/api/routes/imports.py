@@ -0,0 +1,42 @@
+import io
+from pathlib import PurePath
+
+from fastapi import APIRouter, Depends, UploadFile
+from sqlalchemy.orm import Session
+
+from ...db.session import get_db
+from ...domain.imports import import_rows, read_rows
+from ...schema.imports import ImportFormat, ImportKind, ImportReportSchema
+from ..responses import PydanticJSONRoute
+
+
+router = APIRouter(prefix="/import", tags=["Import"], route_class=PydanticJSONRoute)
+
+
+@router.post("/{kind}")
+def import_file(
+    file: UploadFile,
+    session: Session = Depends(get_db),
+    *,
+    kind: ImportKind,
+    format: ImportFormat | None = None,  # pylint:disable=redefined-builtin
+) -> ImportReportSchema:
+    """
+    Bulk import teams, employees or vacations from a CSV or NDJSON file
+
+    Format defaults to the file extension, then CSV
+
+    Stays sync, rows are sent with psycopg2 `COPY` and the file is read with
+    blocking calls on the threadpool
+    """
+    if format is None:
+        suffix = PurePath(file.filename or "").suffix.lstrip(".").lower()
+        format = (
+            ImportFormat(suffix) if suffix in set(ImportFormat) else ImportFormat.CSV
+        )
+    # Uploads are spooled to disk past a size, rows are read lazily from there
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_rows(session, kind, read_rows(stream, format))
+    finally:
+        stream.detach()
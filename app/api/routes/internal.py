@@ -0,0 +1,36 @@
+from fastapi import APIRouter
+
+from ...db.cache import identity_cache_stats
+from ...db.pool import pool_stats
+from ...schema.cache import IdentityCacheStatsSchema
+from ...schema.coalesce import CoalescingStatsSchema
+from ...schema.pool import PoolStatsSchema
+from ..coalesce import coalescing_stats
+from ..responses import PydanticJSONRoute
+
+
+router = APIRouter(prefix="/internal", tags=["Internal"], route_class=PydanticJSONRoute)
+
+
+@router.get("/pool")
+async def get_pool_stats() -> list[PoolStatsSchema]:
+    """
+    Database connection pools usage
+    """
+    return pool_stats()
+
+
+@router.get("/cache")
+async def get_cache_stats() -> list[IdentityCacheStatsSchema]:
+    """
+    Identity caches usage of this process
+    """
+    return identity_cache_stats()
+
+
+@router.get("/coalescing")
+async def get_coalescing_stats() -> list[CoalescingStatsSchema]:
+    """
+    Requests coalesced with identical concurrent ones in this process
+    """
+    return coalescing_stats()
@@ -1,58 +1,201 @@
+from datetime import date
 from http import HTTPStatus
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...db.session import get_db
+from ...db.session import get_async_db, get_async_read_db
+from ...domain.availability import MAX_AVAILABILITY_DAYS, team_availability
+from ...domain.team import read_team
 from ...domain.team import update_team as domain_update_team
-from ...repository.team import TeamRepository
+from ...repository.balance import AsyncVacationBalanceRepository
+from ...repository.base import (
+    MAX_PAGE_SIZE,
+    PAGE_SIZE,
+    InvalidCursorException,
+    InvalidFieldsException,
+)
+from ...repository.employee import AsyncEmployeeRepository
+from ...repository.team import AsyncTeamRepository
+from ...schema.availability import TeamAvailabilitySchema
+from ...schema.balance import BalanceSchema
+from ...schema.lookup import LookupSchema
+from ...schema.page import PageSchema
+from ...schema.projection import EmployeeProjection
 from ...schema.team import TeamCreateSchema, TeamSchema, TeamUpdateSchema
+from ..params import split_fields, split_ids
+from ..responses import PydanticJSONRoute, entity_tag, not_modified
 
 
-router = APIRouter(prefix="/team", tags=["Team"])
+router = APIRouter(prefix="/team", tags=["Team"], route_class=PydanticJSONRoute)
+
+
+@router.get("")
+async def get_teams(
+    session: AsyncSession = Depends(get_async_read_db),
+    ids: list[UUID] = Depends(split_ids),
+) -> LookupSchema[TeamSchema]:
+    """
+    Get teams by ID in one query, in the order of `ids`, those not found
+    are listed in `missing`
+    """
+    return await AsyncTeamRepository.get_many_by_ids(session, ids)
+
+
+async def _get_team(session: AsyncSession, team_id: UUID) -> TeamSchema:
+    if (team := await AsyncTeamRepository.get_cached(session, team_id)) is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND)
+    return team
 
 
 @router.get("/{team_id}")
-def get_team(
-    session: Session = Depends(get_db),
+async def get_team(
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_read_db),
     *,
     team_id: UUID,
-) -> TeamSchema:
+    fields: str | None = None,
+    expand: str | None = None,
+) -> TeamSchema | dict[str, Any]:
     """
     Get team by ID
+
+    `fields` and `expand` are comma separated, the team then only has the
+    requested fields and its `employees` only when expanded
+
+    Answers `304 Not Modified` when `If-None-Match` has the ETag of the team
+    and its employees as they are
     """
-    if (
-        team := TeamRepository.get_by_id(
-            session,
-            team_id=team_id,
-        )
-    ) is None:
+    if (version := await AsyncTeamRepository.get_version(session, team_id)) is None:
         raise HTTPException(HTTPStatus.NOT_FOUND)
+    etag = entity_tag(request, version)
+    if (unchanged := not_modified(request, etag)) is not None:
+        return unchanged
 
+    if fields is not None or expand is not None:
+        try:
+            team = await session.run_sync(
+                read_team,
+                team_id,
+                fields=split_fields(fields),
+                expand=split_fields(expand),
+            )
+        except InvalidFieldsException as exc:
+            raise HTTPException(HTTPStatus.BAD_REQUEST, str(exc)) from exc
+    else:
+        team = await AsyncTeamRepository.get_cached(session, team_id, version=version)
+    if team is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND)
+
+    response.headers["ETag"] = etag
     return team
 
 
 @router.post("", status_code=HTTPStatus.CREATED)
-def create_team(
+async def create_team(
     team: TeamCreateSchema,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ) -> TeamSchema:
     """
     Create a team
     """
-    return TeamRepository.create(session, team)
+    return await AsyncTeamRepository.create(session, team)
+
+
+@router.post("/batch", status_code=HTTPStatus.CREATED)
+async def create_teams(
+    teams: list[TeamCreateSchema],
+    session: AsyncSession = Depends(get_async_db),
+) -> list[TeamSchema]:
+    """
+    Create many teams in one transaction, results keep the order of the
+    request
+    """
+    return await AsyncTeamRepository.bulk_create(session, teams)
 
 
 @router.patch("/{team_id}")
-def update_team(
+async def update_team(
     update_data: TeamUpdateSchema,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
     *,
     team_id: UUID,
 ) -> TeamSchema:
     """
     Update employee
     """
-    team = get_team(session, team_id=team_id)
-    return domain_update_team(session, team, update_data)
+    # Read from the session rather than the cache to be updated
+    if (
+        team := await AsyncTeamRepository.get_by_id(
+            session,
+            team_id=team_id,
+        )
+    ) is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND)
+    return await session.run_sync(domain_update_team, team, update_data)
+
+
+@router.get("/{team_id}/employee")
+async def get_team_employees(
+    session: AsyncSession = Depends(get_async_read_db),
+    *,
+    team_id: UUID,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+) -> PageSchema[EmployeeProjection | dict[str, Any]]:
+    """
+    Get a page of team employees
+
+    `fields` is comma separated, employees then only have those fields
+    """
+    if not await AsyncTeamRepository.project_many(session, id=team_id, fields=["id"]):
+        raise HTTPException(HTTPStatus.NOT_FOUND)
+    try:
+        page = await AsyncEmployeeRepository.project_page(
+            session,
+            team_id=team_id,
+            limit=limit,
+            cursor=cursor,
+            fields=split_fields(fields),
+        )
+    except (InvalidCursorException, InvalidFieldsException) as exc:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, str(exc)) from exc
+    return page
+
+
+@router.get("/{team_id}/balance")
+async def get_team_balance(
+    session: AsyncSession = Depends(get_async_read_db),
+    *,
+    team_id: UUID,
+    year: int | None = None,
+) -> list[BalanceSchema]:
+    """
+    Get worked days taken as vacation by team employees per year and type
+    """
+    team = await _get_team(session, team_id)
+    return await AsyncVacationBalanceRepository.get_by_team_id(session, team.id, year)
+
+
+@router.get("/{team_id}/availability")
+async def get_team_availability(
+    session: AsyncSession = Depends(get_async_read_db),
+    *,
+    team_id: UUID,
+    start: date,
+    end: date,
+) -> TeamAvailabilitySchema:
+    """
+    Get how many team employees are absent and present on each day
+    """
+    if not 0 <= (end - start).days < MAX_AVAILABILITY_DAYS:
+        raise HTTPException(
+            HTTPStatus.BAD_REQUEST,
+            f"End must be after start and within {MAX_AVAILABILITY_DAYS} days",
+        )
+    team = await _get_team(session, team_id)
+    return await session.run_sync(team_availability, team.id, start, end)
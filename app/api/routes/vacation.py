@@ -1,34 +1,158 @@
 from datetime import date
+from http import HTTPStatus
+from typing import Any
+from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...db.session import get_db
+from ...db.session import (
+    READ_PRIMARY_COOKIE,
+    async_read_session,
+    context_session,
+    get_async_read_db,
+)
+from ...domain.export import encode_rows
 from ...model.vacation import VacationType
-from ...repository.vacation import VacationRepository
+from ...repository.base import (
+    MAX_PAGE_SIZE,
+    PAGE_SIZE,
+    InvalidCursorException,
+    InvalidFieldsException,
+)
+from ...repository.vacation import AsyncVacationRepository, VacationRepository
+from ...schema.export import ExportFormat
+from ...schema.lookup import LookupSchema
+from ...schema.page import PageSchema
+from ...schema.projection import VacationProjection
 from ...schema.vacation import VacationSchema
+from ..coalesce import Coalescer
+from ..params import split_fields, split_ids
+from ..responses import PydanticJSONRoute, entity_tag, not_modified, render_json
 
 
-router = APIRouter(prefix="/vacation", tags=["Employee"])
+router = APIRouter(prefix="/vacation", tags=["Employee"], route_class=PydanticJSONRoute)
+
+_coalescer = Coalescer("vacations")
 
 
 @router.get("", tags=["Vacation"])
-def get_vacations(
-    session: Session = Depends(get_db),
+async def get_vacations(
+    request: Request,
     *,
     start_date: date | None = None,
     end_date: date | None = None,
     team_id: UUID4 | None = None,
     type: VacationType | None = None,  # pylint:disable=redefined-builtin
-) -> list[VacationSchema]:
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    expand: str | None = None,
+) -> PageSchema[VacationProjection | dict[str, Any]]:
     """
-    Get vacations from query params
+    Get a page of vacations from query params, ordered by start date
+
+    `fields` and `expand` are comma separated, vacations then only have the
+    requested fields, `employee_id` included, and the `employee` only when
+    expanded
+
+    Responses have an ETag made from the versions of the page rows, read
+    without loading them, `If-None-Match` with it is answered with
+    `304 Not Modified`
+
+    The version and the page are read in one snapshot, identical concurrent
+    requests, compared on parsed params and that version, share the read of
+    the page and its encoded body
     """
-    return VacationRepository.get_by_query_params(
-        session,
-        start_date=start_date,
-        end_date=end_date,
-        team_id=team_id,
-        type_=type,
+    page_args = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "team_id": team_id,
+        "type_": type,
+        "limit": limit,
+        "cursor": cursor,
+        "fields": split_fields(fields),
+        "expand": split_fields(expand),
+    }
+    # Clients that just wrote must not share a read started before
+    primary = READ_PRIMARY_COOKIE in request.cookies
+    params = tuple(page_args.items())
+
+    try:
+        async with async_read_session(primary=primary) as session:
+            version = await AsyncVacationRepository.page_version_by_query_params(
+                session, **page_args
+            )
+            etag = entity_tag(request, version)
+            if (response := not_modified(request, etag)) is not None:
+                return response
+
+            async def read_page() -> bytes:
+                page = await AsyncVacationRepository.project_page_by_query_params(
+                    session, **page_args
+                )
+                return render_json(request, page)
+
+            # Pages at the same version are the same rows
+            body = await _coalescer.run(
+                None if primary else (params, version), read_page
+            )
+    except (InvalidCursorException, InvalidFieldsException) as exc:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, str(exc)) from exc
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/lookup", tags=["Vacation"])
+async def get_vacations_by_ids(
+    session: AsyncSession = Depends(get_async_read_db),
+    ids: list[UUID] = Depends(split_ids),
+) -> LookupSchema[VacationSchema]:
+    """
+    Get vacations by ID in one query, in the order of `ids`, those not found
+    are listed in `missing`
+    """
+    return await AsyncVacationRepository.get_many_by_ids(session, ids)
+
+
+_EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+@router.get("/export", tags=["Vacation"], response_class=StreamingResponse)
+def export_vacations(
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    team_id: UUID4 | None = None,
+    type: VacationType | None = None,  # pylint:disable=redefined-builtin
+    format: ExportFormat = ExportFormat.NDJSON,  # pylint:disable=redefined-builtin
+) -> StreamingResponse:
+    """
+    Stream vacations from query params with their employee as NDJSON or CSV,
+    ordered by start date
+
+    Stays sync, rows are read with a psycopg2 server side cursor on the
+    threadpool while the body is sent
+    """
+
+    def stream():
+        # The body is sent after the route returns, along with its session
+        with context_session() as session:
+            result = VacationRepository.stream_by_query_params(
+                session,
+                start_date=start_date,
+                end_date=end_date,
+                team_id=team_id,
+                type_=type,
+            )
+            yield from encode_rows(list(result.keys()), result.partitions(), format)
+
+    return StreamingResponse(
+        stream(),
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="vacations.{format}"'},
     )
@@ -0,0 +1,59 @@
+"""
+Compare creating employees one at a time and with `bulk_create`
+
+Run with `python -m app.benchmarks.bulk --employees 10000`, rows are created
+in a transaction rolled back at the end
+"""
+
+import argparse
+import time
+
+from ..db.session import _get_fastapi_sessionmaker
+from ..db.statements import record_statements
+from ..repository.employee import EmployeeRepository
+from ..repository.team import TeamRepository
+from ..schema.employee import EmployeeCreateSchema
+from ..schema.team import TeamCreateSchema
+
+
+def main():
+    """
+    Print time and statements to create the same employees with `create`
+    and with `bulk_create`
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.bulk")
+    parser.add_argument("--employees", type=int, default=10_000)
+    args = parser.parse_args()
+
+    sessionmaker = _get_fastapi_sessionmaker()
+    with sessionmaker.context_session() as session:
+        team = TeamRepository.create(session, TeamCreateSchema(name="bulk"))
+        employees = [
+            EmployeeCreateSchema(
+                first_name=f"bulk {i}", last_name="bulk", team_id=team.id
+            )
+            for i in range(args.employees)
+        ]
+
+        print(f"{args.employees} employees")
+        print(f"{'':>12} {'seconds':>8} {'statements':>10}")
+        for name, create in (
+            (
+                "create",
+                lambda: [
+                    EmployeeRepository.create(session, employee)
+                    for employee in employees
+                ],
+            ),
+            ("bulk_create", lambda: EmployeeRepository.bulk_create(session, employees)),
+        ):
+            with record_statements(sessionmaker.cached_engine) as statements:
+                start = time.perf_counter()
+                create()
+                seconds = time.perf_counter() - start
+            print(f"{name:>12} {seconds:>8.2f} {len(statements):>10}")
+        session.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compare bursts of identical vacation page requests with and without
+request coalescing
+
+Run with `python -m app.benchmarks.coalescing`, data is created in a
+dedicated team and removed afterwards
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import delete, select
+
+from ..api.coalesce import coalescing_stats
+from ..core.config import settings
+from ..db.session import _get_async_engine, context_session
+from ..db.statements import record_statements
+from ..main import app
+from ..model.employee import EmployeeModel
+from ..model.team import TeamModel
+from ..model.vacation import VacationModel
+from .pagination import create_vacations
+
+
+async def _burst(url: str, requests: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*(client.get(url) for _ in range(requests)))
+    assert len({response.content for response in responses}) == 1
+
+
+async def _run(url: str, requests: int):
+    async with app.router.lifespan_context(app):
+        engine = _get_async_engine().sync_engine
+        print(f"{'':>12} {'statements':>10} {'ms':>8}")
+        for name, enabled in (("separate", False), ("coalesced", True)):
+            settings.REQUEST_COALESCING = enabled
+            with record_statements(engine) as statements:
+                start = time.perf_counter()
+                await _burst(url, requests)
+                elapsed = time.perf_counter() - start
+            print(f"{name:>12} {len(statements):>10} {elapsed * 1000:>8.1f}")
+        for stats in coalescing_stats():
+            print(
+                f"{stats.name}: {stats.requests} requests, {stats.loads} loads, "
+                f"{stats.coalesced} coalesced"
+            )
+
+
+def main():
+    """
+    Print statements and time of a burst of concurrent requests for the same
+    team vacations page, each reading it then sharing reads
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.coalescing")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    with context_session() as session:
+        team_id = create_vacations(session, args.rows)
+        employee_ids = session.scalars(
+            select(EmployeeModel.id).where(EmployeeModel.team_id == team_id)
+        ).all()
+
+    try:
+        asyncio.run(
+            _run(f"/vacation?team_id={team_id}&limit={args.limit}", args.requests)
+        )
+    finally:
+        with context_session() as session:
+            session.execute(
+                delete(VacationModel).where(VacationModel.employee_id.in_(employee_ids))
+            )
+            session.execute(
+                delete(EmployeeModel).where(EmployeeModel.team_id == team_id)
+            )
+            session.execute(delete(TeamModel).where(TeamModel.id == team_id))
+
+
+if __name__ == "__main__":
+    main()
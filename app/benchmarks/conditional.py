@@ -0,0 +1,74 @@
+"""
+Compare polling vacation pages with and without their ETag
+
+Run with `python -m app.benchmarks.conditional`, data is created in a
+dedicated team and removed afterwards
+"""
+
+import argparse
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+
+from ..db.session import _get_async_engine, context_session
+from ..db.statements import record_statements
+from ..main import app
+from ..model.employee import EmployeeModel
+from ..model.team import TeamModel
+from ..model.vacation import VacationModel
+from .pagination import create_vacations
+
+
+def main():
+    """
+    Print time, statements and body size per poll of a page of team
+    vacations, answered in full or with `304 Not Modified`
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.conditional")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with context_session() as session:
+        team_id = create_vacations(session, args.rows)
+        employee_ids = session.scalars(
+            select(EmployeeModel.id).where(EmployeeModel.team_id == team_id)
+        ).all()
+
+    try:
+        url = f"/vacation?team_id={team_id}&limit={args.limit}"
+        with TestClient(app) as client:
+            etag = client.get(url).headers["etag"]
+            engine = _get_async_engine().sync_engine
+            print(f"{'':>14} {'ms':>8} {'statements':>10} {'bytes':>8}")
+            for name, headers in (
+                ("without ETag", {}),
+                ("If-None-Match", {"If-None-Match": etag}),
+            ):
+                timings = []
+                with record_statements(engine) as statements:
+                    for _ in range(args.repeat):
+                        start = time.perf_counter()
+                        response = client.get(url, headers=headers)
+                        timings.append((time.perf_counter() - start) * 1000)
+                print(
+                    f"{name:>14} {statistics.median(timings):>8.2f} "
+                    f"{len(statements) / args.repeat:>10.1f} "
+                    f"{len(response.content):>8}"
+                )
+    finally:
+        with context_session() as session:
+            session.execute(
+                delete(VacationModel).where(VacationModel.employee_id.in_(employee_ids))
+            )
+            session.execute(
+                delete(EmployeeModel).where(EmployeeModel.team_id == team_id)
+            )
+            session.execute(delete(TeamModel).where(TeamModel.id == team_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Count statements of vacation reads with the employee identity cache cold
+and warm
+
+Run with `python -m app.benchmarks.identity_cache`, data is created in a
+dedicated team and removed afterwards
+"""
+
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+
+from ..db.cache import get_cache_backend, identity_cache_stats
+from ..db.session import _get_async_engine, context_session
+from ..db.statements import record_statements
+from ..main import app
+from ..model.employee import EmployeeModel
+from ..model.team import TeamModel
+from ..model.vacation import VacationModel
+from .pagination import VACATIONS_PER_EMPLOYEE, create_vacations
+
+
+def main():
+    """
+    Print statements and time per request reading employees vacation pages,
+    once with each employee missing from the cache then cached
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.identity_cache")
+    parser.add_argument("--employees", type=int, default=200)
+    args = parser.parse_args()
+
+    with context_session() as session:
+        team_id = create_vacations(session, args.employees * VACATIONS_PER_EMPLOYEE)
+        employee_ids = session.scalars(
+            select(EmployeeModel.id).where(EmployeeModel.team_id == team_id)
+        ).all()
+
+    try:
+        with TestClient(app) as client:
+            # Caches are bypassed until the invalidation listener is connected
+            while not get_cache_backend().connected:
+                time.sleep(0.05)
+            engine = _get_async_engine().sync_engine
+            print(f"{'':>8} {'statements':>10} {'ms':>8}")
+            for name in ("cold", "warm"):
+                with record_statements(engine) as statements:
+                    start = time.perf_counter()
+                    for employee_id in employee_ids:
+                        client.get(f"/employee/{employee_id}/vacation?limit=10")
+                    elapsed = time.perf_counter() - start
+                print(
+                    f"{name:>8} {len(statements) / len(employee_ids):>10.1f} "
+                    f"{elapsed / len(employee_ids) * 1000:>8.2f}"
+                )
+            for stats in identity_cache_stats():
+                print(f"{stats.name}: {stats.hits} hits, {stats.misses} misses")
+    finally:
+        with context_session() as session:
+            session.execute(
+                delete(VacationModel).where(VacationModel.employee_id.in_(employee_ids))
+            )
+            session.execute(
+                delete(EmployeeModel).where(EmployeeModel.team_id == team_id)
+            )
+            session.execute(delete(TeamModel).where(TeamModel.id == team_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Load test employee reads served by the async stack and by the sync stack
+
+Run with `python -m app.benchmarks.load`, each app is served by uvicorn in
+its own process, data is created in a dedicated team and removed afterwards
+"""
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from http import HTTPStatus
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from ..api.responses import PydanticJSONRoute
+from ..api.routes import employee
+from ..db.session import async_engine_lifespan, context_session, get_db
+from ..model.employee import EmployeeModel
+from ..model.team import TeamModel
+from ..model.vacation import VacationModel
+from ..repository.base import PAGE_SIZE
+from ..repository.employee import EmployeeRepository
+from ..repository.vacation import VacationRepository
+from ..schema.employee import EmployeeSchema
+from ..schema.page import PageSchema
+from ..schema.vacation import VacationSchema
+from .pagination import VACATIONS_PER_EMPLOYEE, create_vacations
+
+
+_sync_router = APIRouter(prefix="/employee", route_class=PydanticJSONRoute)
+
+
+@_sync_router.get("/{employee_id}")
+def _get_employee(
+    session: Session = Depends(get_db),
+    *,
+    employee_id: UUID,
+) -> EmployeeSchema:
+    if (
+        employee := EmployeeRepository.get_by_id(session, employee_id=employee_id)
+    ) is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND)
+    return employee
+
+
+@_sync_router.get("/{employee_id}/vacation")
+def _get_employee_vacations(
+    session: Session = Depends(get_db),
+    *,
+    employee_id: UUID,
+    limit: int = PAGE_SIZE,
+) -> PageSchema[VacationSchema]:
+    found = _get_employee(session, employee_id=employee_id)
+    return VacationRepository.project_page(session, employee_id=found.id, limit=limit)
+
+
+# Same routes as before they were made async
+sync_app = FastAPI()
+sync_app.include_router(_sync_router)
+
+async_app = FastAPI(lifespan=async_engine_lifespan)
+async_app.include_router(employee.router)
+
+
+def _serve(name: str, port: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            f"{__spec__.name}:{name}",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ]
+    )
+
+
+async def _get(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, path: str
+) -> int:
+    """
+    Send a GET on a kept alive connection, return the response status
+
+    httpx spends more CPU per request than the servers it measures, bare
+    HTTP/1.1 keeps the load generator out of the way
+    """
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *headers = head.decode("latin-1").split("\r\n")
+    length = next(
+        int(value)
+        for name, _, value in (header.partition(":") for header in headers)
+        if name.lower() == "content-length"
+    )
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def _connect(port: int, timeout: float = 30):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            return await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def _load(
+    port: int, paths: list[str], concurrency: int, seconds: float
+) -> tuple[list[float], int]:
+    """
+    Latencies of successful requests sent by concurrent clients in a loop
+    for a duration, along with the count of failed ones
+    """
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def run(offset: int):
+        nonlocal errors
+        reader, writer = await _connect(port)
+        i = offset
+        try:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                if await _get(reader, writer, paths[i % len(paths)]) < 400:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+                i += 1
+        finally:
+            writer.close()
+
+    await asyncio.gather(*(run(i) for i in range(concurrency)))
+    return latencies, errors
+
+
+async def _bench(name: str, port: int, paths: list[str], args) -> str:
+    server = _serve(name, port)
+    try:
+        await _load(port, paths, args.concurrency, args.warmup)
+        latencies, errors = await _load(port, paths, args.concurrency, args.seconds)
+    finally:
+        server.terminate()
+        server.wait()
+    p50, p99 = (statistics.quantiles(latencies, n=100)[i] * 1000 for i in (49, 98))
+    return (
+        f"{name:>10} {len(latencies) / args.seconds:>8.0f} "
+        f"{p50:>8.1f} {p99:>8.1f} {errors:>7}"
+    )
+
+
+def main():
+    """
+    Print requests per second and latencies of employee and vacation page
+    reads under the same concurrency for each stack
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.load")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--employees", type=int, default=100)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    with context_session() as session:
+        team_id = create_vacations(session, args.employees * VACATIONS_PER_EMPLOYEE)
+        employee_ids = session.scalars(
+            select(EmployeeModel.id).where(EmployeeModel.team_id == team_id)
+        ).all()
+
+    try:
+        paths = [
+            path
+            for employee_id in employee_ids
+            for path in (
+                f"/employee/{employee_id}",
+                f"/employee/{employee_id}/vacation?limit=20",
+            )
+        ]
+        print(f"{args.concurrency} concurrent clients for {args.seconds:.0f}s")
+        print(f"{'':>10} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for port, name in enumerate(("sync_app", "async_app"), args.port):
+            print(asyncio.run(_bench(name, port, paths, args)))
+    finally:
+        with context_session() as session:
+            session.execute(
+                delete(VacationModel).where(VacationModel.employee_id.in_(employee_ids))
+            )
+            session.execute(
+                delete(EmployeeModel).where(EmployeeModel.team_id == team_id)
+            )
+            session.execute(delete(TeamModel).where(TeamModel.id == team_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Compare keyset and OFFSET pagination of vacations deep into a large table
+
+Run with `python -m app.benchmarks.pagination --rows 10000000`, rows are
+created in a transaction rolled back at the end
+"""
+
+# pylint:disable=protected-access
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import func, insert, literal, select, text
+
+from ..db.session import _get_fastapi_sessionmaker
+from ..model.employee import EmployeeModel
+from ..model.team import TeamModel
+from ..model.vacation import VacationModel, VacationType
+from ..repository.vacation import VacationRepository
+
+
+VACATIONS_PER_EMPLOYEE = 100
+
+
+def create_vacations(session, rows: int) -> UUID:
+    """
+    One day vacations a week apart, `VACATIONS_PER_EMPLOYEE` per employee of
+    a new team, returns the team ID
+    """
+    team_id = session.scalar(
+        insert(TeamModel).values(name="pagination").returning(TeamModel.id)
+    )
+    employees = func.generate_series(1, -(-rows // VACATIONS_PER_EMPLOYEE))
+    session.execute(
+        insert(EmployeeModel).from_select(
+            ["id", "first_name", "last_name", "team_id"],
+            select(
+                func.gen_random_uuid(),
+                literal("pagination"),
+                literal("pagination"),
+                literal(team_id),
+            ).select_from(employees),
+        )
+    )
+    weeks = (
+        func.generate_series(0, VACATIONS_PER_EMPLOYEE - 1)
+        .table_valued("value")
+        .render_derived(name="week")
+    )
+    start_date = literal(date(2040, 1, 1)) + weeks.c.value * 7
+    session.execute(
+        insert(VacationModel).from_select(
+            ["id", "employee_id", "start_date", "end_date", "type", "total_work_days"],
+            select(
+                func.gen_random_uuid(),
+                EmployeeModel.id,
+                start_date,
+                start_date,
+                literal(VacationType.PAID.name),
+                literal(1),
+            )
+            .select_from(EmployeeModel)
+            .join(weeks, literal(True))
+            .where(EmployeeModel.team_id == team_id)
+            .limit(rows),
+        )
+    )
+    session.execute(text(f"ANALYZE {VacationModel.__tablename__}"))
+    return team_id
+
+
+def _median_ms(read: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    """
+    Print the median time to read a page at increasing depths
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.pagination")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with _get_fastapi_sessionmaker().context_session() as session:
+        create_vacations(session, args.rows)
+        total = session.scalar(select(func.count()).select_from(VacationModel))
+        keys = (VacationModel.start_date, VacationModel.id)
+        projection = VacationRepository._sparse_projection(None, None)
+
+        print(f"{total} vacations, {args.limit} per page")
+        print(f"{'depth':>10} {'keyset ms':>10} {'offset ms':>10}")
+        depth = 1
+        while depth < total:
+            start_date, vacation_id = session.execute(
+                select(*keys).order_by(*keys).offset(depth - 1).limit(1)
+            ).one()
+            # Same cursor a client gets on the page ending at `depth`
+            cursor = VacationRepository._encode_cursor((start_date, vacation_id))
+            keyset = _median_ms(
+                lambda: VacationRepository.project_page_by_query_params(
+                    session,
+                    limit=args.limit,  # pylint:disable=cell-var-from-loop
+                    cursor=cursor,  # pylint:disable=cell-var-from-loop
+                ),
+                args.repeat,
+            )
+            # Same rows and columns, skipped with OFFSET
+            offset = _median_ms(
+                lambda: VacationRepository._project(
+                    session,
+                    projection,
+                    VacationRepository._params_select(
+                        projection, None, None, None, None
+                    )
+                    .order_by(*keys)
+                    .offset(depth)  # pylint:disable=cell-var-from-loop
+                    .limit(args.limit),
+                ),
+                args.repeat,
+            )
+            print(f"{depth:>10} {keyset:>10.2f} {offset:>10.2f}")
+            depth *= 10
+        session.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Compare reading vacations as ORM objects and schemas with projections
+
+Run with `python -m app.benchmarks.projection`, rows are created in a
+transaction rolled back at the end
+"""
+
+# pylint:disable=protected-access
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from ..db.session import context_session
+from ..repository.vacation import VacationRepository
+from ..schema.vacation import VacationSchema
+from .pagination import create_vacations
+
+
+def _measure(read: Callable[[], bytes], repeat: int) -> tuple[float, int]:
+    """
+    Median CPU seconds and peak bytes allocated of a read
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        read()
+        timings.append(time.process_time() - start)
+    tracemalloc.start()
+    read()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def main():
+    """
+    Print per row CPU time and memory of a large page read both ways and
+    serialized to JSON
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.projection")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # What FastAPI does with a response model
+    adapter = TypeAdapter(list[VacationSchema])
+    with context_session() as session:
+        create_vacations(session, args.rows)
+
+        def full() -> bytes:
+            session.expunge_all()
+            query = VacationRepository._seek(
+                VacationRepository.query_by_params(session),
+                limit=args.rows,
+                cursor=None,
+            )
+            return adapter.dump_json(
+                [
+                    VacationRepository._create_schema_and_assign_model(model)
+                    for model in query.all()[: args.rows]
+                ]
+            )
+
+        def projected() -> bytes:
+            return to_json(
+                VacationRepository.project_page_by_query_params(
+                    session, limit=args.rows
+                ).items
+            )
+
+        if full() != projected():
+            raise RuntimeError("Projection does not serialize like the schema")
+        results = {
+            "orm + schema": _measure(full, args.repeat),
+            "projection": _measure(projected, args.repeat),
+        }
+        session.rollback()
+
+    print(f"{args.rows} vacations")
+    print(f"{'':>14} {'us/row':>8} {'bytes/row':>10}")
+    for name, (seconds, peak) in results.items():
+        print(f"{name:>14} {seconds / args.rows * 1e6:>8.1f} {peak / args.rows:>10.0f}")
+    (full_seconds, full_peak), (seconds, peak) = results.values()
+    print(
+        f"projection takes {full_seconds / seconds:.1f}x less CPU "
+        f"and {full_peak / peak:.1f}x less memory"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare FastAPI default response pipeline with pydantic-core serialization
+
+Run with `python -m app.benchmarks.responses`, no database is needed
+"""
+
+import argparse
+import time
+import uuid
+from datetime import date, timedelta
+
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from ..api.responses import PydanticJSONRoute
+from ..model.vacation import VacationType
+from ..schema.employee import EmployeeSchema
+from ..schema.vacation import VacationSchema
+
+
+def _vacations(count: int) -> list[VacationSchema]:
+    employee = EmployeeSchema(
+        id=uuid.uuid4(), first_name="first", last_name="last", team_id=uuid.uuid4()
+    )
+    return [
+        VacationSchema(
+            id=uuid.uuid4(),
+            start_date=date(2025, 1, 1) + timedelta(days=i),
+            end_date=date(2025, 1, 1) + timedelta(days=i + 2),
+            type=VacationType.PAID,
+            total_work_days=2,
+            employee=employee,
+        )
+        for i in range(count)
+    ]
+
+
+def _client(route_class: type[APIRoute], vacations: list[VacationSchema]):
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/vacation")
+    def get_vacations() -> list[VacationSchema]:
+        return vacations
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def main():
+    """
+    Print requests per second of a large list response for each route class
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.responses")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    vacations = _vacations(args.items)
+    bodies = {}
+    rates = {}
+    for name, route_class in (("fastapi", APIRoute), ("pydantic", PydanticJSONRoute)):
+        client = _client(route_class, vacations)
+        bodies[name] = client.get("/vacation").json()
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            client.get("/vacation")
+        rates[name] = args.requests / (time.perf_counter() - start)
+
+    if bodies["fastapi"] != bodies["pydantic"]:
+        raise RuntimeError("Responses differ")
+    print(f"{args.items} vacations per response")
+    for name, rate in rates.items():
+        print(f"{name:>10} {rate:>8.1f} requests/s")
+    print(f"{rates['pydantic'] / rates['fastapi']:.1f}x throughput")
+
+
+if __name__ == "__main__":
+    main()
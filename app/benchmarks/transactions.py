@@ -0,0 +1,136 @@
+"""
+Count transactions and statements of vacation merges
+
+Run with `python -m app.benchmarks.transactions`, data is created in a
+dedicated team and removed afterwards
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from sqlalchemy import delete, event
+
+from ..db.session import _get_fastapi_sessionmaker, context_session
+from ..db.statements import record_statements
+from ..domain.vacation import delete_vacation, new_vacation, new_vacations
+from ..model.balance import VacationBalanceModel
+from ..model.employee import EmployeeModel
+from ..model.team import TeamModel
+from ..model.vacation import VacationModel, VacationType
+from ..repository.employee import EmployeeRepository
+from ..repository.team import TeamRepository
+from ..schema.employee import EmployeeCreateSchema, EmployeeSchema
+from ..schema.team import TeamCreateSchema
+from ..schema.vacation import VacationCreateSchema
+
+
+ORIGIN = date(2060, 1, 5)
+
+
+def _vacation(start: int, days: int = 1) -> VacationCreateSchema:
+    return VacationCreateSchema(
+        start_date=ORIGIN + timedelta(days=start),
+        end_date=ORIGIN + timedelta(days=start + days - 1),
+        type=VacationType.PAID,
+    )
+
+
+def _measure(
+    setup: Callable | None, operation: Callable, repeat: int
+) -> tuple[float, float, float]:
+    """
+    Transactions, statements and milliseconds per operation, each one run
+    in its own session as a request would, after its setup in another one
+    """
+    engine = _get_fastapi_sessionmaker().cached_engine
+    transactions = statements = 0
+    elapsed = 0.0
+
+    def _begin(_):
+        nonlocal transactions
+        transactions += 1
+
+    for i in range(repeat):
+        if setup is not None:
+            with context_session() as session:
+                setup(session, i)
+        event.listen(engine, "begin", _begin)
+        try:
+            with record_statements(engine) as recorded:
+                start = time.perf_counter()
+                with context_session() as session:
+                    operation(session, i)
+                elapsed += time.perf_counter() - start
+            statements += len(recorded)
+        finally:
+            event.remove(engine, "begin", _begin)
+    return transactions / repeat, statements / repeat, elapsed / repeat * 1000
+
+
+def main():
+    """
+    Print transactions, statements and time per operation of vacation writes
+    merging with existing vacations
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.transactions")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--overlaps", type=int, default=5)
+    args = parser.parse_args()
+
+    with context_session() as session:
+        team = TeamRepository.create(session, TeamCreateSchema(name="transactions"))
+        employee = EmployeeRepository.create(
+            session,
+            EmployeeCreateSchema(
+                first_name="transactions", last_name="transactions", team_id=team.id
+            ),
+        )
+        employee = EmployeeSchema.model_validate(employee.model_dump())
+
+    # Each operation works on its own weeks
+    span = 7 * (args.overlaps + 1)
+
+    def overlaps(session, i: int):
+        # One day vacations a week apart, then merged by one covering them
+        for n in range(args.overlaps):
+            new_vacation(session, _vacation(i * span + n * 7), employee)
+
+    def merge(session, i: int):
+        new_vacation(session, _vacation(i * span, args.overlaps * 7 - 2), employee)
+
+    def merge_batch(session, i: int):
+        base = (args.repeat + i) * span
+        new_vacations(
+            session,
+            [_vacation(base + n * 7) for n in range(args.overlaps)]
+            + [_vacation(base, args.overlaps * 7 - 2)],
+            employee,
+        )
+
+    def create_delete(session, i: int):
+        base = (2 * args.repeat + i) * span
+        delete_vacation(session, new_vacation(session, _vacation(base), employee))
+
+    try:
+        print(f"{'':>26} {'transactions':>12} {'statements':>10} {'ms':>8}")
+        for name, setup, operation in (
+            (f"merge of {args.overlaps}", overlaps, merge),
+            (f"batch of {args.overlaps + 1} merged", None, merge_batch),
+            ("create then delete", None, create_delete),
+        ):
+            transactions, statements, ms = _measure(setup, operation, args.repeat)
+            print(f"{name:>26} {transactions:>12.1f} {statements:>10.1f} {ms:>8.2f}")
+    finally:
+        with context_session() as session:
+            for model in (VacationModel, VacationBalanceModel):
+                session.execute(delete(model).where(model.employee_id == employee.id))
+            session.execute(
+                delete(EmployeeModel).where(EmployeeModel.team_id == team.id)
+            )
+            session.execute(delete(TeamModel).where(TeamModel.id == team.id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Stress concurrent vacation writes and check no merge was lost
+
+Run with `python -m app.benchmarks.vacation_concurrency`, data is created in
+a dedicated team and removed afterwards
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from uuid import UUID
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from ..db.session import _get_fastapi_sessionmaker
+from ..domain.exceptions import DomainException
+from ..domain.schedule import recompute_workdays
+from ..domain.vacation import new_vacation
+from ..model.balance import VacationBalanceModel
+from ..model.employee import EmployeeModel
+from ..model.team import TeamModel
+from ..model.vacation import VacationModel, VacationType
+from ..repository.balance import VacationBalanceRepository
+from ..repository.employee import EmployeeRepository
+from ..repository.team import TeamRepository
+from ..repository.vacation import VacationRepository
+from ..schema.employee import EmployeeCreateSchema
+from ..schema.team import TeamCreateSchema
+from ..schema.vacation import VacationCreateSchema
+
+
+ORIGIN = date(2030, 1, 7)
+
+
+def random_vacation(rng: random.Random, span: int) -> VacationCreateSchema:
+    start_date = ORIGIN + timedelta(days=rng.randrange(span))
+    return VacationCreateSchema(
+        start_date=start_date,
+        end_date=start_date + timedelta(days=rng.randrange(5)),
+        type=rng.choice(list(VacationType)),
+    )
+
+
+def _submit(employee_id: UUID, vacation_in: VacationCreateSchema) -> str:
+    """
+    Create a vacation in its own transaction, return how it went
+    """
+    with _get_fastapi_sessionmaker().context_session() as session:
+        employee = EmployeeRepository.get_by_id(session, employee_id)
+        try:
+            new_vacation(session, vacation_in, employee)
+        except DomainException:
+            return "rejected"
+        except Exception:  # pylint:disable=broad-exception-caught
+            return "failed"
+    return "created"
+
+
+def _run(
+    workers: int, jobs: list[tuple[UUID, VacationCreateSchema]]
+) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as executor:
+        outcomes = list(executor.map(lambda job: _submit(*job), jobs))
+    return time.perf_counter() - start, outcomes
+
+
+def check_vacations(
+    session: Session,
+    employee_ids: list[UUID],
+    created: list[tuple[UUID, VacationCreateSchema]],
+) -> list[str]:
+    """
+    Vacations of a type must neither overlap nor touch, every day of created
+    vacations must still be covered and worked days and balances must be up
+    to date
+
+    Vacations and balances are recounted in `session`, roll it back after
+    """
+    problems = []
+    covered = defaultdict(set)
+    for employee_id in employee_ids:
+        by_type = defaultdict(list)
+        for vacation in VacationRepository.get_by_employee_id(session, employee_id):
+            by_type[vacation.type].append(vacation)
+            covered[employee_id, vacation.type].update(
+                vacation.start_date + timedelta(days=i)
+                for i in range((vacation.end_date - vacation.start_date).days + 1)
+            )
+        for vacations in by_type.values():
+            vacations.sort(key=lambda vacation: vacation.start_date)
+            for previous, vacation in zip(vacations, vacations[1:]):
+                if vacation.start_date <= previous.end_date + timedelta(days=1):
+                    problems.append(
+                        f"employee {employee_id}: {previous.start_date}"
+                        f"..{previous.end_date} and {vacation.start_date}"
+                        f"..{vacation.end_date} not merged"
+                    )
+
+    for employee_id, vacation_in in created:
+        days = covered[employee_id, vacation_in.type]
+        if any(
+            vacation_in.start_date + timedelta(days=i) not in days
+            for i in range((vacation_in.end_date - vacation_in.start_date).days + 1)
+        ):
+            problems.append(
+                f"employee {employee_id}: {vacation_in.start_date}"
+                f"..{vacation_in.end_date} lost"
+            )
+
+    def balances() -> list[tuple]:
+        return [
+            (employee_id, balance.year, balance.type, balance.days)
+            for employee_id in employee_ids
+            for balance in VacationBalanceRepository.get_by_employee_id(
+                session, employee_id
+            )
+        ]
+
+    written = balances()
+    if changed := recompute_workdays(session, employee_ids):
+        problems.append(f"{changed} vacations with stale worked days")
+    if written != balances():
+        problems.append("balances differ from the vacations")
+    return problems
+
+
+def main():
+    """
+    Write random overlapping vacations from many threads, first all for a
+    few employees then each thread for its own employee
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m app.benchmarks.vacation_concurrency"
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--vacations", type=int, default=400)
+    parser.add_argument("--employees", type=int, default=2)
+    parser.add_argument(
+        "--without-locks",
+        action="store_true",
+        help="Disable employee locks to check the stress test catches races",
+    )
+    args = parser.parse_args()
+
+    if args.without_locks:
+        EmployeeRepository.lock = lambda *_: None
+
+    rng = random.Random(0)
+    with _get_fastapi_sessionmaker().context_session() as session:
+        team = TeamRepository.create(session, TeamCreateSchema(name="stress"))
+        employee_ids = [
+            EmployeeRepository.create(
+                session,
+                EmployeeCreateSchema(
+                    first_name=f"stress {i}", last_name="stress", team_id=team.id
+                ),
+            ).id
+            for i in range(max(args.employees, args.workers))
+        ]
+
+    failed = False
+    try:
+        scenarios = {
+            "same employees": [
+                (
+                    rng.choice(employee_ids[: args.employees]),
+                    random_vacation(rng, 60),
+                )
+                for _ in range(args.vacations)
+            ],
+            # Far apart so each worker keeps writing its own employee
+            "one employee per worker": [
+                (employee_ids[i % args.workers], random_vacation(rng, 3650))
+                for i in range(args.vacations)
+            ],
+        }
+        for name, jobs in scenarios.items():
+            seconds, outcomes = _run(args.workers, jobs)
+            with _get_fastapi_sessionmaker().context_session() as session:
+                problems = check_vacations(
+                    session,
+                    employee_ids,
+                    [
+                        job
+                        for job, outcome in zip(jobs, outcomes)
+                        if outcome == "created"
+                    ],
+                )
+                session.rollback()
+            print(
+                f"{name}: {len(jobs) / seconds:.0f} writes/s, "
+                + ", ".join(
+                    f"{outcomes.count(outcome)} {outcome}"
+                    for outcome in sorted(set(outcomes))
+                )
+            )
+            for problem in problems[:10]:
+                print(f"  {problem}")
+            failed |= bool(problems) or "failed" in outcomes
+    finally:
+        with _get_fastapi_sessionmaker().context_session() as session:
+            for model in (VacationModel, VacationBalanceModel):
+                session.execute(
+                    delete(model).where(model.employee_id.in_(employee_ids))
+                )
+            session.execute(
+                delete(EmployeeModel).where(EmployeeModel.team_id == team.id)
+            )
+            session.execute(delete(TeamModel).where(TeamModel.id == team.id))
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare the closed-form workday engine with the former day-by-day loop
+
+Run with `python -m app.benchmarks.workdays`
+"""
+
+import random
+import timeit
+from collections.abc import Container
+from datetime import date, timedelta
+
+from ..domain.workdays import WEEKEND, compute_workdays, compute_workdays_batch
+
+
+def _legacy_compute_workdays(
+    start_date: date,
+    end_date: date,
+    days_off: Container[int] = WEEKEND,
+) -> int:
+    return sum(
+        day.weekday() not in days_off
+        for day in (
+            start_date + timedelta(days=i)
+            for i in range((end_date - start_date).days + 1)
+        )
+    )
+
+
+def _intervals(count: int, max_days: int) -> tuple[list[date], list[date]]:
+    rng = random.Random(0)
+    origin = date(2000, 1, 1)
+    starts = [origin + timedelta(days=rng.randrange(10_000)) for _ in range(count)]
+    ends = [start + timedelta(days=rng.randrange(max_days)) for start in starts]
+    return starts, ends
+
+
+def main(count: int = 1_000, repeat: int = 5):
+    """
+    Print timings for each implementation over ranges of increasing length
+    """
+    for max_days in (7, 90, 365, 3650):
+        starts, ends = _intervals(count, max_days)
+        expected = [_legacy_compute_workdays(s, e) for s, e in zip(starts, ends)]
+        assert [compute_workdays(s, e) for s, e in zip(starts, ends)] == expected
+        assert compute_workdays_batch(starts, ends) == expected
+
+        timings = {
+            "legacy": lambda: [
+                _legacy_compute_workdays(s, e) for s, e in zip(starts, ends)
+            ],
+            "closed-form": lambda: [
+                compute_workdays(s, e) for s, e in zip(starts, ends)
+            ],
+            "batch": lambda: compute_workdays_batch(starts, ends),
+        }
+        results = {
+            name: min(timeit.repeat(func, number=1, repeat=repeat))
+            for name, func in timings.items()
+        }
+        print(
+            f"ranges up to {max_days:>4} days, {count} intervals: "
+            + ", ".join(
+                f"{name} {seconds * 1e6 / count:.2f}us"
+                f" (x{results['legacy'] / seconds:.1f})"
+                for name, seconds in results.items()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Maintenance commands, run with `python -m app.commands <command>`
+"""
+
+import argparse
+import io
+import sys
+from uuid import UUID
+
+from ..db.session import _get_fastapi_sessionmaker
+from ..domain.balance import backfill_balances
+from ..domain.imports import CHUNK_SIZE, import_rows, read_rows
+from ..domain.schedule import recompute_workdays
+from ..repository.employee import EmployeeRepository
+from ..schema.imports import ImportFormat, ImportKind, ImportReportSchema
+
+
+def _recompute_workdays(args: argparse.Namespace):
+    with _get_fastapi_sessionmaker().context_session() as session:
+        # Vacation writes would apply balance deltas replaced meanwhile
+        if args.employee_id:
+            employee_ids = sorted(set(args.employee_id))
+            EmployeeRepository.lock_many(session, employee_ids)
+        else:
+            employee_ids = None
+            EmployeeRepository.lock_all(session)
+        changed = recompute_workdays(session, employee_ids)
+    print(f"{changed} vacations updated")
+
+
+def _backfill_balances(args: argparse.Namespace):
+    with _get_fastapi_sessionmaker().context_session() as session:
+        changed = backfill_balances(session, page_size=args.page_size)
+    print(f"Balances rebuilt, {changed} vacations recounted")
+
+
+def _import(args: argparse.Namespace):
+    def progress(report: ImportReportSchema):
+        print(f"{report.rows} rows read, {report.errors} errors", file=sys.stderr)
+
+    format_ = args.format or (
+        ImportFormat.NDJSON if args.path.endswith(".ndjson") else ImportFormat.CSV
+    )
+    with (
+        open(args.path, encoding="utf-8-sig", newline="")
+        if args.path != "-"
+        else io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+    ) as stream, _get_fastapi_sessionmaker().context_session() as session:
+        report = import_rows(
+            session,
+            args.kind,
+            read_rows(stream, format_),
+            chunk_size=args.chunk_size,
+            on_progress=progress,
+        )
+    print(report.model_dump_json(indent=2))
+
+
+def main():
+    """
+    Parse command line and run command
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.commands")
+    commands = parser.add_subparsers(required=True)
+
+    recompute = commands.add_parser(
+        "recompute-workdays",
+        help="Recount worked days of vacations against calendars and schedules",
+    )
+    recompute.add_argument(
+        "--employee-id",
+        action="append",
+        type=UUID,
+        help="Only recount vacations of this employee, can be repeated",
+    )
+    recompute.set_defaults(func=_recompute_workdays)
+
+    backfill = commands.add_parser(
+        "backfill-balances",
+        help="Rebuild vacation balances of every employee from their vacations",
+    )
+    backfill.add_argument(
+        "--page-size",
+        type=int,
+        default=1000,
+        help="Employees recounted at once",
+    )
+    backfill.set_defaults(func=_backfill_balances)
+
+    import_ = commands.add_parser(
+        "import",
+        help="Bulk import teams, employees or vacations from a CSV or NDJSON file",
+    )
+    import_.add_argument("kind", type=ImportKind, choices=list(ImportKind))
+    import_.add_argument("path", help="File to import, - for standard input")
+    import_.add_argument(
+        "--format",
+        type=ImportFormat,
+        choices=list(ImportFormat),
+        help="File format, guessed from the extension when omitted",
+    )
+    import_.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help="Rows validated and copied at once",
+    )
+    import_.set_defaults(func=_import)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
-from typing import Any, Optional, Union
+from typing import Annotated, Any, Literal, Optional, Union
 
 from pydantic import MongoDsn, PostgresDsn, ValidationInfo, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -16,6 +16,36 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     SQLALCHEMY_DATABASE_URI: Union[Optional[PostgresDsn], Optional[str]] = None
+    SQLALCHEMY_POOL_SIZE: int = 5
+    SQLALCHEMY_MAX_OVERFLOW: int = 10
+    # Seconds to wait for a connection before "QueuePool limit reached"
+    SQLALCHEMY_POOL_TIMEOUT: float = 30
+    # Seconds after which connections are replaced, -1 to keep them
+    SQLALCHEMY_POOL_RECYCLE: int = -1
+    # Only applies to the psycopg2 engine
+    SQLALCHEMY_POOL_PRE_PING: bool = True
+    # Milliseconds, 0 to disable
+    SQLALCHEMY_STATEMENT_TIMEOUT: int = 0
+    # Comma separated, read only routes read from these when set
+    SQLALCHEMY_REPLICA_URIS: Annotated[list[PostgresDsn], NoDecode] = []
+    SQLALCHEMY_REPLICA_CONNECT_TIMEOUT: float = 2
+    # Seconds a replica that failed to connect is left aside
+    SQLALCHEMY_REPLICA_RETRY_SECONDS: float = 30
+    # Seconds of replication lag past which a replica is left aside, at most
+    # SQLALCHEMY_READ_YOUR_WRITES_SECONDS for clients to read their writes
+    SQLALCHEMY_REPLICA_MAX_LAG_SECONDS: float = 5
+    # Seconds a client reads from the primary after it wrote
+    SQLALCHEMY_READ_YOUR_WRITES_SECONDS: int = 5
+    # Employees and teams cached by ID per process, 0 to disable
+    IDENTITY_CACHE_SIZE: int = 10000
+    IDENTITY_CACHE_TTL: float = 60
+    # "postgres" keeps caches of several processes coherent with NOTIFY,
+    # "local" only suits a single process
+    IDENTITY_CACHE_BACKEND: Literal["local", "postgres"] = "postgres"
+    # Identical concurrent reads share one load, and its result for that many
+    # seconds after it completes
+    REQUEST_COALESCING: bool = True
+    REQUEST_COALESCING_TTL: float = 0
 
     ENABLE_STATS: bool = False
     MONGODB_SERVER: str | None = None
@@ -47,6 +77,17 @@ class Settings(BaseSettings):
             path=f"{values.data.get('POSTGRES_DB') or ''}",
         )
 
+    @field_validator("SQLALCHEMY_REPLICA_URIS", mode="before")
+    @classmethod
+    def _split_replica_uris(cls, v: str | list[str]) -> list[str]:
+        """
+        Split comma separated dsn
+        """
+        if isinstance(v, str):
+            return [uri.strip() for uri in v.split(",") if uri.strip()]
+
+        return v
+
     @field_validator("MONGODB_DSN", mode="before")
     @classmethod
     def assemble_mongo_connection(
@@ -0,0 +1,331 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Generic, TypeVar
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..schema.base import BaseSchema
+from ..schema.cache import IdentityCacheStatsSchema
+from .session import _get_async_engine
+
+
+__all__ = (
+    "CacheBackend",
+    "IdentityCache",
+    "LocalCacheBackend",
+    "PostgresCacheBackend",
+    "ProcessCache",
+    "get_cache_backend",
+    "identity_cache_lifespan",
+    "identity_cache_stats",
+    "invalidate",
+    "invalidated",
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+Value = TypeVar("Value")
+Schema = TypeVar("Schema", bound=BaseSchema)
+
+
+CHANNEL = "identity_cache"
+# Keys of a session waiting for it to commit
+_PENDING = "identity_cache_pending"
+# NOTIFY payloads must be shorter than 8000 bytes
+_MAX_PAYLOAD = 7900
+
+_caches: dict[str, "ProcessCache"] = {}
+
+
+class ProcessCache(Generic[Value]):
+    """
+    Values by ID in this process, the least recently used are evicted past
+    `IDENTITY_CACHE_SIZE` and entries expire after `IDENTITY_CACHE_TTL`
+
+    Entries are dropped with `invalidate` by the sessions writing them, the
+    cache backend tells other processes
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.maxsize = settings.IDENTITY_CACHE_SIZE
+        self.ttl = settings.IDENTITY_CACHE_TTL
+        self.hits = self.misses = self.invalidations = 0
+        # Bumped on each invalidation, see `set`
+        self.generation = 0
+        # Expiry, value and version of the rows it was read from if known
+        self._entries: OrderedDict[UUID, tuple[float, Value, str | None]] = (
+            OrderedDict()
+        )
+        _caches[name] = self
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0 and get_cache_backend().connected
+
+    def get(self, id_: UUID, version: str | None = None) -> Value | None:
+        """
+        Cached value, None when missing, expired or cached at another
+        `version` than the one given
+        """
+        if not self.enabled:
+            return None
+        entry = self._entries.get(id_)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(id_, None)
+            self.misses += 1
+            return None
+        if version is not None and entry[2] != version:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(id_)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, id_: UUID, value: Value, generation: int, version: str | None = None):
+        """
+        Cache a value read when the cache was at `generation`, it may be
+        stale if an invalidation came since and is then left out
+
+        `version` is that of the rows, read before the value
+        """
+        if not self.enabled or generation != self.generation:
+            return
+        self._entries[id_] = (time.monotonic() + self.ttl, value, version)
+        self._entries.move_to_end(id_)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, id_: UUID | None = None):
+        """
+        Drop a value, all of them when `id_` is None
+        """
+        self.generation += 1
+        self.invalidations += 1
+        if id_ is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(id_, None)
+
+
+class IdentityCache(ProcessCache[Schema]):
+    """
+    Schemas by ID, returned as copies not bound to any session
+    """
+
+    def get(self, id_: UUID, version: str | None = None) -> Schema | None:
+        if (schema := super().get(id_, version)) is None:
+            return None
+        return schema.model_copy()
+
+    def put(self, schema: Schema, generation: int, version: str | None = None):
+        """
+        Cache a schema by its ID, as `set` does
+        """
+        cached = schema.model_copy()
+        # Models belong to the session that read them
+        cached._model = None  # pylint:disable=protected-access
+        self.set(schema.id, cached, generation, version)
+
+
+def _drop(keys: Iterable[str]):
+    for key in keys:
+        name, _, id_ = key.partition(":")
+        if (cache := _caches.get(name)) is not None:
+            cache.pop(None if id_ == "*" else UUID(id_))
+
+
+def _drop_all():
+    for cache in _caches.values():
+        cache.pop()
+
+
+class CacheBackend(ABC):
+    """
+    Tells processes sharing the database about invalidations, caches are
+    bypassed while the backend is not `connected`
+    """
+
+    connected = True
+
+    @abstractmethod
+    def publish(self, session: Session, keys: set[str]):
+        """
+        Send `name:id` keys, `name:*` for a whole cache, invalidated by a
+        session about to commit
+        """
+
+    async def start(self):
+        """
+        Start receiving invalidations
+        """
+
+    async def stop(self):
+        """
+        Stop receiving invalidations
+        """
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    Invalidations only reach caches of this process, for a single worker and
+    for tests
+    """
+
+    def publish(self, session: Session, keys: set[str]):
+        pass
+
+
+class PostgresCacheBackend(CacheBackend):
+    """
+    Invalidations are sent with NOTIFY in the writing transaction, Postgres
+    delivers them once it commits, and every process LISTENs on a dedicated
+    connection
+
+    Caches are emptied and bypassed while that connection is down, they may
+    have missed invalidations
+    """
+
+    def __init__(self, engine: AsyncEngine, retry_seconds: float = 5):
+        self.engine = engine
+        self.retry_seconds = retry_seconds
+        self.connected = False
+        self._task: asyncio.Task | None = None
+
+    def publish(self, session: Session, keys: set[str]):
+        payload = ",".join(sorted(keys))
+        if len(payload) > _MAX_PAYLOAD:
+            payload = ",".join(sorted({f"{key.partition(':')[0]}:*" for key in keys}))
+        session.execute(select(func.pg_notify(CHANNEL, payload)))
+
+    def _on_notify(self, _connection, _pid, _channel, payload: str):
+        _drop(payload.split(","))
+
+    async def _listen(self):
+        _, options = self.engine.dialect.create_connect_args(self.engine.url)
+        while True:
+            try:
+                await self._listen_once(options)
+            except Exception:  # pylint:disable=broad-exception-caught
+                # Any error only ends this connection, caches stay bypassed
+                # until the next one listens
+                logger.exception("Identity cache listener failed")
+            await asyncio.sleep(self.retry_seconds)
+
+    async def _listen_once(self, options: dict):
+        connection = await asyncpg.connect(**options)
+        lost = asyncio.Event()
+        connection.add_termination_listener(lambda _: lost.set())
+        try:
+            await connection.add_listener(CHANNEL, self._on_notify)
+            _drop_all()
+            self.connected = True
+            await lost.wait()
+            logger.warning("Identity cache listener disconnected")
+        finally:
+            self.connected = False
+            _drop_all()
+            connection.terminate()
+
+    async def start(self):
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+@lru_cache()
+def get_cache_backend() -> CacheBackend:
+    """
+    Backend of `IDENTITY_CACHE_BACKEND`
+    """
+    if settings.IDENTITY_CACHE_BACKEND == "postgres":
+        return PostgresCacheBackend(_get_async_engine())
+    return LocalCacheBackend()
+
+
+def _publish(session: Session):
+    if keys := session.info.get(_PENDING):
+        get_cache_backend().publish(session, keys)
+
+
+def _drop_pending(session: Session):
+    _drop(session.info.pop(_PENDING, ()))
+
+
+def invalidate(
+    session: Session, cache: ProcessCache, ids: Iterable[UUID] | None = None
+):
+    """
+    Drop values of `ids` written by a session, the whole cache when None
+
+    They are dropped from this process now and again once the session
+    commits, another session may have cached them from the previous rows
+    meanwhile, other processes are told through the cache backend
+    """
+    keys = (
+        {f"{cache.name}:*"} if ids is None else {f"{cache.name}:{id_}" for id_ in ids}
+    )
+    if _PENDING not in session.info:
+        session.info[_PENDING] = set()
+        event.listen(session, "before_commit", _publish, once=True)
+        event.listen(session, "after_commit", _drop_pending, once=True)
+    session.info[_PENDING] |= keys
+    _drop(keys)
+
+
+def invalidated(session: Session, cache: ProcessCache, id_: UUID) -> bool:
+    """
+    Whether a session invalidated the value of `id_` and did not commit yet,
+    a value it reads meanwhile must not be cached for other sessions
+    """
+    pending = session.info.get(_PENDING, ())
+    return f"{cache.name}:{id_}" in pending or f"{cache.name}:*" in pending
+
+
+def identity_cache_stats() -> list[IdentityCacheStatsSchema]:
+    """
+    Size and counters of process caches
+    """
+    return [
+        IdentityCacheStatsSchema(
+            name=name,
+            size=len(cache._entries),  # pylint:disable=protected-access
+            maxsize=cache.maxsize,
+            enabled=cache.enabled,
+            hits=cache.hits,
+            misses=cache.misses,
+            invalidations=cache.invalidations,
+        )
+        for name, cache in _caches.items()
+    ]
+
+
+@asynccontextmanager
+async def identity_cache_lifespan(_):
+    """
+    Receive invalidations of other processes while the app runs
+    """
+    backend = get_cache_backend()
+    await backend.start()
+    yield
+    await backend.stop()
@@ -0,0 +1,44 @@
+from collections.abc import Iterator
+from typing import Any
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+__all__ = (
+    "explain",
+    "full_scans",
+)
+
+
+class explain(Executable, ClauseElement):  # pylint:disable=invalid-name
+    """
+    `EXPLAIN (FORMAT JSON)` of a statement, binds are processed as usual
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: Executable):
+        self.statement = statement
+
+
+@compiles(explain, "postgresql")
+def _compile_explain(element: explain, compiler, **kwargs) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kwargs)
+
+
+_INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+def full_scans(plan: dict[str, Any]) -> Iterator[str]:
+    """
+    Yield relations read with a sequential scan and indexes read without
+    any index condition in a JSON plan node
+    """
+    node_type = plan.get("Node Type")
+    if node_type == "Seq Scan":
+        yield plan["Relation Name"]
+    elif node_type in _INDEX_SCANS and "Index Cond" not in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", ()):
+        yield from full_scans(child)
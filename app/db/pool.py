@@ -0,0 +1,145 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+
+from ..schema.pool import PoolStatsSchema
+
+
+__all__ = (
+    "InstrumentedAsyncQueuePool",
+    "InstrumentedQueuePool",
+    "RequestPoolUsage",
+    "instrument_pool",
+    "pool_stats",
+    "track_pool_usage",
+)
+
+
+@dataclass
+class _PoolCounters:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds: float = 0
+    max_wait_seconds: float = 0
+    peak_checked_out: int = 0
+    peak_overflow: int = 0
+
+
+@dataclass
+class RequestPoolUsage:
+    """
+    Connections a request got from pools and how long it waited for them
+    """
+
+    checkouts: int = 0
+    wait_seconds: float = 0
+
+
+_request_usage: ContextVar[RequestPoolUsage | None] = ContextVar(
+    "_request_usage", default=None
+)
+
+_pools: dict[str, Engine] = {}
+
+
+class _InstrumentedPoolMixin:
+    """
+    Time how long getting a connection takes, pre-ping included
+    """
+
+    counters: _PoolCounters
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.counters.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.counters.wait_seconds += waited
+            self.counters.max_wait_seconds = max(self.counters.max_wait_seconds, waited)
+            if (usage := _request_usage.get()) is not None:
+                usage.wait_seconds += waited
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.counters = self.counters
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """
+    `QueuePool` timing checkouts
+    """
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """
+    `AsyncAdaptedQueuePool` timing checkouts
+    """
+
+
+def instrument_pool(engine: Engine, name: str) -> Engine:
+    """
+    Count checkouts and track peak usage of an engine pool with pool events,
+    stats are then reported under `name`
+    """
+    pool = engine.pool
+    pool.counters = _PoolCounters()
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(*_):
+        # The pool may have been recreated since
+        current = engine.pool
+        counters = current.counters
+        counters.checkouts += 1
+        counters.peak_checked_out = max(counters.peak_checked_out, current.checkedout())
+        counters.peak_overflow = max(counters.peak_overflow, current.overflow())
+        if (usage := _request_usage.get()) is not None:
+            usage.checkouts += 1
+
+    _pools[name] = engine
+    return engine
+
+
+def pool_stats() -> list[PoolStatsSchema]:
+    """
+    Current usage and counters of instrumented pools
+    """
+    return [
+        PoolStatsSchema(
+            name=name,
+            size=engine.pool.size(),
+            max_overflow=engine.pool._max_overflow,  # pylint:disable=protected-access
+            checked_out=engine.pool.checkedout(),
+            overflow=max(engine.pool.overflow(), 0),
+            checkouts=engine.pool.counters.checkouts,
+            timeouts=engine.pool.counters.timeouts,
+            wait_seconds=engine.pool.counters.wait_seconds,
+            max_wait_seconds=engine.pool.counters.max_wait_seconds,
+            peak_checked_out=engine.pool.counters.peak_checked_out,
+            peak_overflow=max(engine.pool.counters.peak_overflow, 0),
+        )
+        for name, engine in _pools.items()
+    ]
+
+
+@contextmanager
+def track_pool_usage() -> Iterator[RequestPoolUsage]:
+    """
+    Collect pool usage of the code run in the context, threads and tasks
+    started from it included
+    """
+    usage = RequestPoolUsage()
+    token = _request_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _request_usage.reset(token)
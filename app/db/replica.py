@@ -0,0 +1,95 @@
+import itertools
+import time
+from collections.abc import Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+__all__ = (
+    "ON_REPLICA",
+    "REPLICATION_LAG",
+    "ReplicaSet",
+)
+
+
+# Set in `Session.info` of sessions reading from a replica
+ON_REPLICA = "on_replica"
+
+# Seconds since the last transaction replayed, 0 once all WAL received is
+# replayed since the primary may just be idle, NULL outside of recovery
+REPLICATION_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaSet:
+    """
+    Replica engines taken in turn, a replica that failed to connect or lags
+    more than `max_lag_seconds` is left aside for a while then tried again
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        retry_seconds: float,
+        max_lag_seconds: float,
+    ):
+        self.engines = list(engines)
+        self.retry_seconds = retry_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self._down_until = [0.0] * len(self.engines)
+        self._lag_checked_until = [0.0] * len(self.engines)
+        self._turn = itertools.count()
+
+    def available(self) -> list[AsyncEngine]:
+        """
+        Replicas not known to be down, starting with the one whose turn it is
+        """
+        if not self.engines:
+            return []
+        now = time.monotonic()
+        start = next(self._turn) % len(self.engines)
+        return [
+            self.engines[i % len(self.engines)]
+            for i in range(start, start + len(self.engines))
+            if self._down_until[i % len(self.engines)] <= now
+        ]
+
+    def mark_down(self, engine: AsyncEngine):
+        """
+        Leave a replica aside for `retry_seconds`
+        """
+        self._down_until[self.engines.index(engine)] = (
+            time.monotonic() + self.retry_seconds
+        )
+
+    def is_down(self, engine: AsyncEngine) -> bool:
+        """
+        Whether a replica is left aside
+        """
+        return self._down_until[self.engines.index(engine)] > time.monotonic()
+
+    def lag_check_due(self, engine: AsyncEngine) -> bool:
+        """
+        Whether the lag of a replica may have grown past `max_lag_seconds`
+        since it was last read
+        """
+        return self._lag_checked_until[self.engines.index(engine)] <= time.monotonic()
+
+    def check_lag(self, engine: AsyncEngine, lag: float | None) -> bool:
+        """
+        Whether a replica is recent enough, left aside otherwise
+
+        Lag grows at most as fast as time passes, a replica lagging `lag`
+        seconds needs no check for `max_lag_seconds - lag` seconds
+        """
+        lag = lag or 0
+        if lag > self.max_lag_seconds:
+            self.mark_down(engine)
+            return False
+        self._lag_checked_until[self.engines.index(engine)] = (
+            time.monotonic() + self.max_lag_seconds - lag
+        )
+        return True
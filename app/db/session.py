@@ -1,18 +1,214 @@
+from contextlib import AbstractContextManager, asynccontextmanager
 from functools import lru_cache
-from typing import Iterator
+from typing import Any, AsyncIterator, Iterator
 
+from fastapi import Request
 from fastapi_utils.session import FastAPISessionMaker
+from sqlalchemy import Engine, create_engine, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 
+from .pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_pool
+from .replica import ON_REPLICA, REPLICATION_LAG, ReplicaSet
+
+
+# Set on responses to writes, for `SQLALCHEMY_READ_YOUR_WRITES_SECONDS`
+READ_PRIMARY_COOKIE = "read_primary"
+
 
 def get_db() -> Iterator[Session]:
-    """FastAPI dependency that provides a sqlalchemy session"""
+    """
+    FastAPI dependency that provides a sqlalchemy session, the unit of work of
+    the request, committed once when it succeeds
+    """
     yield from _get_fastapi_sessionmaker().get_db()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency that provides an asyncio sqlalchemy session, committed
+    when the request succeeds as `get_db` does
+    """
+    async with _get_async_sessionmaker()() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency for read only routes, an asyncio sqlalchemy session in
+    a read only transaction on a replica
+
+    Clients that just wrote, told by `READ_PRIMARY_COOKIE`, read from the
+    primary so they see their writes
+    """
+    async with async_read_session(
+        primary=READ_PRIMARY_COOKIE in request.cookies
+    ) as session:
+        yield session
+
+
+@asynccontextmanager
+async def async_read_session(
+    *, primary: bool = False, replicas: ReplicaSet | None = None
+) -> AsyncIterator[AsyncSession]:
+    """
+    Session in a read only transaction on the first replica that connects
+    and does not lag, on the primary without replica available or when asked to
+
+    The transaction is REPEATABLE READ, its statements see the same snapshot
+
+    Replicas default to those of `SQLALCHEMY_REPLICA_URIS`
+    """
+    replicas = _get_replicas() if replicas is None else replicas
+    for engine in [] if primary else replicas.available():
+        session = _get_read_sessionmaker(engine)()
+        try:
+            # Connects and begins
+            await session.connection()
+        except (OSError, DBAPIError):
+            await session.close()
+            replicas.mark_down(engine)
+            continue
+        if replicas.lag_check_due(engine) and not replicas.check_lag(
+            engine, await session.scalar(REPLICATION_LAG)
+        ):
+            await session.close()
+            continue
+        session.info[ON_REPLICA] = True
+        break
+    else:
+        session = _get_read_sessionmaker(_get_async_engine())()
+    async with session:
+        yield session
+
+
+def context_session() -> AbstractContextManager[Session]:
+    """
+    Session not bound to a request, for work outliving it such as a
+    streamed response body
+    """
+    return _get_fastapi_sessionmaker().context_session()
+
+
+@asynccontextmanager
+async def async_engine_lifespan(_):
+    """
+    Close asyncio engine connections with app
+    """
+    yield
+    if _get_async_engine.cache_info().currsize:
+        await _get_async_engine().dispose()
+    if _get_replicas.cache_info().currsize:
+        for engine in _get_replicas().engines:
+            await engine.dispose()
+
+
+def _pool_options() -> dict[str, Any]:
+    return {
+        "pool_size": settings.SQLALCHEMY_POOL_SIZE,
+        "max_overflow": settings.SQLALCHEMY_MAX_OVERFLOW,
+        "pool_timeout": settings.SQLALCHEMY_POOL_TIMEOUT,
+        "pool_recycle": settings.SQLALCHEMY_POOL_RECYCLE,
+    }
+
+
+class _SessionMaker(FastAPISessionMaker):
+    """
+    Session maker creating its engine from pool settings
+    """
+
+    def get_new_engine(self) -> Engine:
+        connect_args = {}
+        if settings.SQLALCHEMY_STATEMENT_TIMEOUT:
+            connect_args["options"] = (
+                f"-c statement_timeout={settings.SQLALCHEMY_STATEMENT_TIMEOUT}"
+            )
+        engine = create_engine(
+            self.database_uri,
+            poolclass=InstrumentedQueuePool,
+            pool_pre_ping=settings.SQLALCHEMY_POOL_PRE_PING,
+            connect_args=connect_args,
+            **_pool_options(),
+        )
+        return instrument_pool(engine, "sync")
+
+
 @lru_cache()
 def _get_fastapi_sessionmaker() -> FastAPISessionMaker:
     """This function could be replaced with a global variable if preferred"""
-    return FastAPISessionMaker(settings.SQLALCHEMY_DATABASE_URI.unicode_string())
+    return _SessionMaker(settings.SQLALCHEMY_DATABASE_URI.unicode_string())
+
+
+def _create_async_engine(uri: str, name: str, **connect_args) -> AsyncEngine:
+    """
+    asyncpg engine with pool settings
+
+    Connections are not pinged on checkout, with asyncpg a ping is a
+    transaction of its own and triples round trips of short requests. A
+    dead connection is invalidated along with the pool on its first error
+    """
+    if settings.SQLALCHEMY_STATEMENT_TIMEOUT:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.SQLALCHEMY_STATEMENT_TIMEOUT)
+        }
+    engine = create_async_engine(
+        make_url(uri).set(drivername="postgresql+asyncpg"),
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args=connect_args,
+        **_pool_options(),
+    )
+    instrument_pool(engine.sync_engine, name)
+    return engine
+
+
+@lru_cache()
+def _get_async_engine() -> AsyncEngine:
+    return _create_async_engine(
+        settings.SQLALCHEMY_DATABASE_URI.unicode_string(), "async"
+    )
+
+
+@lru_cache()
+def _get_replicas() -> ReplicaSet:
+    return ReplicaSet(
+        [
+            _create_async_engine(
+                uri.unicode_string(),
+                f"replica {i}",
+                timeout=settings.SQLALCHEMY_REPLICA_CONNECT_TIMEOUT,
+            )
+            for i, uri in enumerate(settings.SQLALCHEMY_REPLICA_URIS)
+        ],
+        retry_seconds=settings.SQLALCHEMY_REPLICA_RETRY_SECONDS,
+        max_lag_seconds=settings.SQLALCHEMY_REPLICA_MAX_LAG_SECONDS,
+    )
+
+
+@lru_cache()
+def _get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=_get_async_engine(), autoflush=False)
+
+
+@lru_cache()
+def _get_read_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    # Statements of a read share one snapshot, such as an ETag version and
+    # the rows it was computed from
+    return async_sessionmaker(
+        bind=engine.execution_options(
+            isolation_level="REPEATABLE READ", postgresql_readonly=True
+        ),
+        autoflush=False,
+    )
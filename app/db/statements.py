@@ -0,0 +1,24 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import Engine, event
+
+
+__all__ = ("record_statements",)
+
+
+@contextmanager
+def record_statements(engine: Engine) -> Iterator[list[str]]:
+    """
+    Collect SQL statements sent by an engine while the context is open
+    """
+    statements = []
+
+    def _record(_conn, _cursor, statement, *_):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
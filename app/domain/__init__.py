@@ -1,3 +1,11 @@
+from .availability import *
+from .balance import *
+from .calendar import *
 from .employee import *
+from .export import *
+from .holiday import *
+from .imports import *
+from .schedule import *
 from .team import *
 from .vacation import *
+from .workdays import *
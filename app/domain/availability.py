@@ -0,0 +1,100 @@
+from collections import Counter, defaultdict
+from datetime import date
+from itertools import accumulate
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from ..repository.employee import EmployeeRepository
+from ..repository.schedule import EmployeeScheduleRepository
+from ..repository.vacation import VacationRepository
+from ..schema.availability import TeamAvailabilitySchema
+from .calendar import get_work_calendar
+from .workdays import WorkSchedule, workday_flags
+
+
+__all__ = (
+    "MAX_AVAILABILITY_DAYS",
+    "team_availability",
+)
+
+
+MAX_AVAILABILITY_DAYS = 366
+
+
+def team_availability(
+    session: Session,
+    team_id: UUID,
+    start_date: date,
+    end_date: date,
+) -> TeamAvailabilitySchema:
+    """
+    Count team employees absent and present on each day of a period
+
+    Employees sharing a calendar and a schedule form a group, each vacation
+    adds two entries to the difference array of its group and a prefix sum
+    gives the group absences per day. Cost is O(vacations + days x groups)
+    """
+    employees = EmployeeRepository.get_work_schedules(session, team_id=team_id)
+    changes = defaultdict(list)
+    for row in EmployeeScheduleRepository.get_changes(
+        session, [employee.id for employee in employees]
+    ):
+        changes[row.employee_id].append((row.effective_date, row.work_schedule))
+    groups = {
+        employee.id: (
+            employee.calendar_id,
+            employee.work_schedule,
+            tuple(sorted(changes[employee.id])),
+        )
+        for employee in employees
+    }
+    headcounts = Counter(groups.values())
+
+    first = start_date.toordinal()
+    days = end_date.toordinal() - first + 1
+    differences = defaultdict(lambda: [0] * (days + 1))
+    # Vacations come sorted by employee and start, overlapping ones of
+    # different types are only counted once
+    counted_until: dict[UUID, int] = {}
+    for vacation in VacationRepository.get_team_intervals(
+        session, team_id, start_date, end_date
+    ):
+        if (group := groups.get(vacation.employee_id)) is None:
+            continue
+        low = max(
+            vacation.start_date.toordinal(),
+            counted_until.get(vacation.employee_id, first - 1) + 1,
+        )
+        high = min(vacation.end_date.toordinal(), first + days - 1)
+        if low > high:
+            continue
+        difference = differences[group]
+        difference[low - first] += 1
+        difference[high - first + 1] -= 1
+        counted_until[vacation.employee_id] = high
+
+    absent = [0] * days
+    present = [0] * days
+    for group, headcount in headcounts.items():
+        calendar_id, work_schedule, group_changes = group
+        flags = workday_flags(
+            start_date,
+            end_date,
+            calendar=get_work_calendar(session, calendar_id),
+            schedule=WorkSchedule(work_schedule, group_changes),
+        )
+        for day, (worked, group_absent) in enumerate(
+            zip(flags, accumulate(differences[group][:days]))
+        ):
+            if worked:
+                absent[day] += group_absent
+                present[day] += headcount - group_absent
+
+    return TeamAvailabilitySchema(
+        start_date=start_date,
+        end_date=end_date,
+        employees=len(employees),
+        absent=absent,
+        present=present,
+    )
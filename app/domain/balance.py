@@ -0,0 +1,84 @@
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date
+from typing import Protocol
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from ..model.vacation import VacationType
+from ..repository.balance import VacationBalanceRepository
+from ..repository.employee import EmployeeRepository
+from .schedule import recompute_workdays
+from .workdays import WorkCalendar, WorkSchedule, compute_workdays, year_parts
+
+
+__all__ = (
+    "backfill_balances",
+    "update_balance",
+)
+
+
+class _Period(Protocol):
+    start_date: date
+    end_date: date
+    type: VacationType
+
+
+def _balance_days(
+    employee_id: UUID,
+    periods: Iterable[_Period],
+    calendar: WorkCalendar | None,
+    schedule: WorkSchedule,
+) -> Counter:
+    """
+    Worked days of periods by `(employee_id, year, type)`
+    """
+    days = Counter()
+    for period in periods:
+        for year, start_date, end_date in year_parts(
+            period.start_date, period.end_date
+        ):
+            days[employee_id, year, period.type] += compute_workdays(
+                start_date, end_date, calendar=calendar, schedule=schedule
+            )
+    return days
+
+
+def update_balance(  # pylint:disable=too-many-arguments
+    session: Session,
+    employee_id: UUID,
+    *,
+    removed: Iterable[_Period] = (),
+    added: Iterable[_Period] = (),
+    calendar: WorkCalendar | None,
+    schedule: WorkSchedule,
+):
+    """
+    Apply to employee balances the difference between vacation periods
+    removed and added, in the caller transaction
+    """
+    deltas = _balance_days(employee_id, added, calendar, schedule)
+    deltas.subtract(_balance_days(employee_id, removed, calendar, schedule))
+    VacationBalanceRepository.add(session, deltas)
+
+
+def backfill_balances(session: Session, *, page_size: int = 1000) -> int:
+    """
+    Rebuild balances of every employee from their vacations, a page of
+    employees at a time, and return the number of vacations recounted
+
+    Vacation writes wait until the session commits, a delta applied
+    meanwhile would be lost when balances are replaced. One lock for all
+    employees, holding one per employee would fill the server lock table
+    """
+    EmployeeRepository.lock_all(session)
+    changed = 0
+    employee_ids = None
+    while employee_ids := EmployeeRepository.get_ids(
+        session,
+        after=employee_ids[-1] if employee_ids else None,
+        limit=page_size,
+    ):
+        changed += recompute_workdays(session, employee_ids)
+    return changed
@@ -0,0 +1,64 @@
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from ..db.cache import ProcessCache, invalidate, invalidated
+from ..db.replica import ON_REPLICA
+from ..repository.calendar import CalendarRepository, HolidayRepository
+from ..schema.calendar import CalendarSchema, CalendarUpdateSchema
+from .workdays import WorkCalendar
+
+
+__all__ = (
+    "get_work_calendar",
+    "invalidate_work_calendar",
+    "update_calendar",
+)
+
+
+# Work calendars by calendar ID, holidays are loaded again after the
+# calendar was edited in any process or once expired
+_work_calendars: ProcessCache[WorkCalendar] = ProcessCache("work_calendar")
+
+
+def get_work_calendar(
+    session: Session, calendar_id: UUID | None
+) -> WorkCalendar | None:
+    """
+    Get the cached work calendar, loading its holidays on first use
+    """
+    if calendar_id is None:
+        return None
+
+    generation = _work_calendars.generation
+    if (work_calendar := _work_calendars.get(calendar_id)) is None:
+        work_calendar = WorkCalendar(HolidayRepository.get_days(session, calendar_id))
+        # Replicas may not have the holidays invalidations were sent for yet,
+        # holidays this session is writing may not be committed
+        if not session.info.get(ON_REPLICA) and not invalidated(
+            session, _work_calendars, calendar_id
+        ):
+            _work_calendars.set(calendar_id, work_calendar, generation)
+
+    return work_calendar
+
+
+def invalidate_work_calendar(session: Session, calendar_id: UUID):
+    """
+    Drop cached work calendar in every process, next use will load it from
+    db, see `invalidate`
+    """
+    invalidate(session, _work_calendars, [calendar_id])
+
+
+def update_calendar(
+    session: Session,
+    calendar: CalendarSchema,
+    update_data: CalendarUpdateSchema,
+) -> CalendarSchema:
+    """
+    Update calendar schema then db
+    """
+    for key, value in update_data.model_dump().items():
+        setattr(calendar, key, value)
+    return CalendarRepository.update(session, calendar)
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 
 from ..repository.employee import EmployeeRepository
 from ..schema.employee import EmployeeSchema, EmployeeUpdateSchema
+from .schedule import recompute_workdays
 
 
 __all__ = ("update_employee",)
@@ -14,8 +15,17 @@ def update_employee(
 ) -> EmployeeSchema:
     """
     Update employee schema then db
+
+    Vacations are recounted when the calendar or weekly schedule changes
     """
-    for key, value in update_data.model_dump().items():
+    changes = update_data.model_dump()
+    # Vacations are locked while recounted, until the session commits
+    if recount := bool(changes.keys() & {"calendar_id", "work_schedule"}):
+        EmployeeRepository.lock(session, employee.id)
+    for key, value in changes.items():
         setattr(employee, key, value)
 
-    return EmployeeRepository.update(session, employee)
+    employee = EmployeeRepository.update(session, employee)
+    if recount:
+        recompute_workdays(session, (employee.id,))
+    return employee
@@ -4,6 +4,7 @@ __all__ = (
     "InvalidVacationException",
     "NoWorkDaysException",
     "VacationAlreadyExistsException",
+    "VacationNotFoundException",
 )
 
 
@@ -35,3 +36,9 @@ class BridgingDifferentTypesException(InvalidVacationException):
     """
     Raised when new vacation would bridge two existing vacations with different types
     """
+
+
+class VacationNotFoundException(DomainException):
+    """
+    Raised when a vacation was deleted by another transaction
+    """
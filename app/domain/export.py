@@ -0,0 +1,45 @@
+import csv
+import io
+from collections.abc import Iterable, Iterator, Sequence
+
+from pydantic_core import to_json
+from sqlalchemy import Row
+
+from ..schema.export import ExportFormat
+
+
+__all__ = ("encode_rows",)
+
+
+def _encode_csv(
+    columns: Sequence[str], chunks: Iterable[Sequence[Row]]
+) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if header_only := buffer.getvalue():
+        yield header_only
+
+
+def _encode_ndjson(
+    columns: Sequence[str], chunks: Iterable[Sequence[Row]]
+) -> Iterator[str]:
+    for chunk in chunks:
+        yield "".join(to_json(dict(zip(columns, row))).decode() + "\n" for row in chunk)
+
+
+def encode_rows(
+    columns: Sequence[str], chunks: Iterable[Sequence[Row]], format_: ExportFormat
+) -> Iterator[str]:
+    """
+    Lazily encode chunks of rows as CSV with a header or as newline delimited
+    JSON, one string per chunk so memory only depends on the chunk size
+    """
+    if format_ == ExportFormat.CSV:
+        return _encode_csv(columns, chunks)
+    return _encode_ndjson(columns, chunks)
@@ -0,0 +1,63 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from ..repository.calendar import HolidayRepository
+from ..repository.employee import EmployeeRepository
+from ..schema.calendar import CalendarSchema, HolidayCreateSchema, HolidaySchema
+from .calendar import invalidate_work_calendar
+from .schedule import recount_day
+
+
+__all__ = (
+    "add_holiday",
+    "remove_holiday",
+)
+
+
+# Employees recounted at once
+PAGE_SIZE = 1000
+
+
+def _recount_calendar_day(session: Session, calendar_id: UUID, day: date):
+    """
+    Recount vacations covering `day` of employees following a calendar, a
+    page of them at a time
+
+    Vacation writes of every employee wait until the session commits, a
+    calendar may have too many employees to hold a lock for each
+    """
+    invalidate_work_calendar(session, calendar_id)
+    EmployeeRepository.lock_all(session)
+    employee_ids = None
+    while employee_ids := EmployeeRepository.get_ids(
+        session,
+        after=employee_ids[-1] if employee_ids else None,
+        limit=PAGE_SIZE,
+        calendar_id=calendar_id,
+    ):
+        recount_day(session, employee_ids, day)
+
+
+def add_holiday(
+    session: Session,
+    calendar: CalendarSchema,
+    holiday_in: HolidayCreateSchema,
+) -> HolidaySchema:
+    """
+    Add holiday to calendar, vacations on that day are recounted along with
+    balances
+    """
+    holiday = HolidayRepository.create(session, calendar.id, holiday_in)
+    _recount_calendar_day(session, calendar.id, holiday.day)
+    return holiday
+
+
+def remove_holiday(session: Session, holiday: HolidaySchema):
+    """
+    Remove holiday from its calendar, vacations on that day are recounted
+    along with balances
+    """
+    HolidayRepository.delete(session, holiday)
+    _recount_calendar_day(session, holiday.calendar_id, holiday.day)
@@ -0,0 +1,187 @@
+import csv
+import json
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import Any, TextIO
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+
+from ..db.cache import invalidate
+from ..repository.employee import EmployeeRepository
+from ..repository.imports import ImportRepository
+from ..repository.team import TeamRepository
+from ..schema.imports import (
+    EmployeeImportSchema,
+    ImportErrorSchema,
+    ImportFormat,
+    ImportKind,
+    ImportReportSchema,
+    TeamImportSchema,
+    VacationImportSchema,
+)
+from .schedule import count_workdays, recompute_workdays
+
+
+__all__ = (
+    "import_rows",
+    "read_rows",
+)
+
+
+CHUNK_SIZE = 5000
+
+# Rejected rows kept in a report, all of them are counted
+MAX_ERROR_ROWS = 100
+
+_SCHEMAS: dict[ImportKind, type[BaseModel]] = {
+    ImportKind.TEAM: TeamImportSchema,
+    ImportKind.EMPLOYEE: EmployeeImportSchema,
+    ImportKind.VACATION: VacationImportSchema,
+}
+
+
+def _read_csv(stream: TextIO) -> Iterator[tuple[int, Any]]:
+    reader = csv.DictReader(stream)
+    for row in reader:
+        # Empty cells fall back to schema defaults
+        yield reader.line_num, {
+            key: value for key, value in row.items() if value not in ("", None)
+        }
+
+
+def _read_ndjson(stream: TextIO) -> Iterator[tuple[int, Any]]:
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            yield line, json.loads(text)
+        except json.JSONDecodeError as exc:
+            yield line, exc
+
+
+def read_rows(stream: TextIO, format_: ImportFormat) -> Iterator[tuple[int, Any]]:
+    """
+    Lazily read `(line, row)` pairs from a CSV file with a header or from
+    newline delimited JSON, a row that cannot be decoded is an exception
+    """
+    if format_ == ImportFormat.CSV:
+        return _read_csv(stream)
+    return _read_ndjson(stream)
+
+
+def _format_error(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}"
+            for error in exc.errors()
+        )
+    return str(exc)
+
+
+def _add_errors(
+    report: ImportReportSchema, count: int, errors: Iterable[tuple[int, str]]
+):
+    report.errors += count
+    room = MAX_ERROR_ROWS - len(report.error_rows)
+    report.error_rows.extend(
+        ImportErrorSchema(line=line, error=error)
+        for line, error in islice(errors, max(room, 0))
+    )
+
+
+def import_rows(
+    session: Session,
+    kind: ImportKind,
+    rows: Iterable[tuple[int, Any]],
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    on_progress: Callable[[ImportReportSchema], None] | None = None,
+) -> ImportReportSchema:
+    """
+    Bulk import `(line, row)` pairs in one transaction
+
+    Rows are validated and copied to a staging table one chunk at a time so
+    memory does not depend on the number of rows, then merged with set-based
+    statements. Teams and employees with an existing ID are updated, vacations
+    are merged like `new_vacation` does with vacations of the same type
+
+    Vacations of employees whose calendar or weekly schedule changed are
+    recounted, writes of employee vacations are locked from the checks until
+    the session commits as `new_vacation` does
+
+    Invalid rows, rows referencing unknown objects and vacations bridging
+    different types are reported and skipped, `on_progress` is called after
+    each chunk
+    """
+    schema = _SCHEMAS[kind]
+    report = ImportReportSchema(kind=kind)
+    ImportRepository.create_staging(session, kind)
+
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        valid, errors = [], []
+        for line, row in chunk:
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                valid.append((line, schema.model_validate(row).model_dump()))
+            except ValueError as exc:
+                errors.append((line, _format_error(exc)))
+        ImportRepository.copy(session, kind, valid)
+        report.rows += len(chunk)
+        _add_errors(report, len(errors), errors)
+        if on_progress is not None:
+            on_progress(report)
+
+    ImportRepository.analyze_staging(session, kind)
+    if kind != ImportKind.TEAM:
+        # Taken before rows are merged, a writer holding an employee lock may
+        # be waiting for one of them
+        EmployeeRepository.lock_all(session)
+    for count, errors in ImportRepository.reject_unknown_references(
+        session, kind, limit=MAX_ERROR_ROWS
+    ):
+        _add_errors(report, count, errors)
+
+    if kind == ImportKind.TEAM:
+        report.imported = ImportRepository.merge_teams(session)
+        invalidate(session, TeamRepository.cache)
+    elif kind == ImportKind.EMPLOYEE:
+        report.imported, changed_ids = ImportRepository.merge_employees(session)
+        invalidate(session, EmployeeRepository.cache)
+        invalidate(session, TeamRepository.cache)
+        for start in range(0, len(changed_ids), chunk_size):
+            recompute_workdays(session, changed_ids[start : start + chunk_size])
+    else:
+        _add_errors(
+            report,
+            *ImportRepository.reject_bridging_types(session, limit=MAX_ERROR_ROWS),
+        )
+        report.imported = ImportRepository.build_vacation_islands(session)
+        # Counted a page of employees at a time to bound memory
+        employee_ids = None
+        while employee_ids := ImportRepository.get_island_employee_ids(
+            session,
+            after=employee_ids[-1] if employee_ids else None,
+            limit=chunk_size,
+        ):
+            ImportRepository.set_island_workdays(
+                session,
+                count_workdays(
+                    session,
+                    ImportRepository.get_island_intervals(session, employee_ids),
+                    employee_ids,
+                ),
+            )
+        report.skipped = ImportRepository.apply_vacation_islands(session)
+        # Balances are rebuilt from the vacations now written
+        employee_ids = None
+        while employee_ids := ImportRepository.get_island_employee_ids(
+            session,
+            after=employee_ids[-1] if employee_ids else None,
+            limit=chunk_size,
+        ):
+            recompute_workdays(session, employee_ids)
+
+    return report
@@ -0,0 +1,192 @@
+from collections import Counter, defaultdict
+from collections.abc import Collection, Iterable
+from datetime import date
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from ..repository.balance import VacationBalanceRepository
+from ..repository.employee import EmployeeRepository
+from ..repository.schedule import EmployeeScheduleRepository
+from ..repository.vacation import VacationRepository
+from ..schema.employee import EmployeeSchema
+from ..schema.schedule import EmployeeScheduleCreateSchema, EmployeeScheduleSchema
+from .calendar import get_work_calendar
+from .workdays import WorkSchedule, compute_workdays_batch, year_parts
+
+
+__all__ = (
+    "add_schedule_change",
+    "count_workdays",
+    "get_work_schedule",
+    "recompute_workdays",
+    "recount_day",
+    "remove_schedule_change",
+)
+
+
+def get_work_schedule(session: Session, employee: EmployeeSchema | Row) -> WorkSchedule:
+    """
+    Get employee weekly schedule along with its dated changes, `employee`
+    may be a row of `EmployeeRepository.get_work_schedules`
+    """
+    return WorkSchedule(
+        employee.work_schedule,
+        (
+            (change.effective_date, change.work_schedule)
+            for change in EmployeeScheduleRepository.get_changes(
+                session, (employee.id,)
+            )
+        ),
+    )
+
+
+def add_schedule_change(
+    session: Session,
+    employee: EmployeeSchema,
+    schedule_in: EmployeeScheduleCreateSchema,
+) -> EmployeeScheduleSchema:
+    """
+    Add a dated schedule change then recount employee vacations
+    """
+    EmployeeRepository.lock(session, employee.id)
+    schedule = EmployeeScheduleRepository.create(session, employee.id, schedule_in)
+    recompute_workdays(session, (employee.id,))
+    return schedule
+
+
+def remove_schedule_change(session: Session, schedule: EmployeeScheduleSchema):
+    """
+    Remove a dated schedule change then recount employee vacations
+    """
+    EmployeeRepository.lock(session, schedule.employee_id)
+    EmployeeScheduleRepository.delete(session, schedule)
+    recompute_workdays(session, (schedule.employee_id,))
+
+
+def count_workdays(
+    session: Session,
+    intervals: Iterable[Row],
+    employee_ids: Collection[UUID] | None = None,
+) -> dict[UUID, int]:
+    """
+    Count worked days of `(id, employee_id, start_date, end_date)` intervals
+    by ID, all of them belonging to `employee_ids`, every employee if None
+
+    Intervals are split on schedule changes and every part sharing a calendar
+    is counted in a single batch
+    """
+    employees = {
+        row.id: row
+        for row in EmployeeRepository.get_work_schedules(session, employee_ids)
+    }
+    changes = defaultdict(list)
+    for row in EmployeeScheduleRepository.get_changes(session, employee_ids):
+        changes[row.employee_id].append((row.effective_date, row.work_schedule))
+    schedules = {
+        employee_id: WorkSchedule(employee.work_schedule, changes[employee_id])
+        for employee_id, employee in employees.items()
+    }
+
+    # calendar ID -> starts, ends, schedules and interval of each part
+    batches = defaultdict(lambda: ([], [], [], []))
+    for interval in intervals:
+        starts, ends, work_schedules, interval_ids = batches[
+            employees[interval.employee_id].calendar_id
+        ]
+        for start_date, end_date, work_schedule in schedules[
+            interval.employee_id
+        ].segments(interval.start_date, interval.end_date):
+            starts.append(start_date)
+            ends.append(end_date)
+            work_schedules.append(work_schedule)
+            interval_ids.append(interval.id)
+
+    totals = defaultdict(int)
+    for calendar_id, (starts, ends, work_schedules, interval_ids) in batches.items():
+        counts = compute_workdays_batch(
+            starts,
+            ends,
+            calendar=get_work_calendar(session, calendar_id),
+            work_schedules=work_schedules,
+        )
+        for interval_id, count in zip(interval_ids, counts):
+            totals[interval_id] += count
+    return totals
+
+
+class _YearPart(NamedTuple):
+    id: tuple[UUID, int]
+    employee_id: UUID
+    start_date: date
+    end_date: date
+
+
+def recompute_workdays(
+    session: Session,
+    employee_ids: Collection[UUID] | None = None,
+) -> int:
+    """
+    Recount `total_work_days` of all vacations of some employees, all of them
+    if `employee_ids` is None, and return the number of vacations changed
+
+    Vacation balances of those employees are rebuilt from the same counts
+    """
+    vacations = {
+        vacation.id: vacation
+        for vacation in VacationRepository.get_intervals(session, employee_ids)
+    }
+    counts = count_workdays(
+        session,
+        (
+            _YearPart((vacation.id, year), vacation.employee_id, start_date, end_date)
+            for vacation in vacations.values()
+            for year, start_date, end_date in year_parts(
+                vacation.start_date, vacation.end_date
+            )
+        ),
+        employee_ids,
+    )
+
+    totals = defaultdict(int)
+    balances = defaultdict(int)
+    for (vacation_id, year), count in counts.items():
+        vacation = vacations[vacation_id]
+        totals[vacation_id] += count
+        balances[vacation.employee_id, year, vacation.type] += count
+
+    changed = {
+        vacation.id: totals[vacation.id]
+        for vacation in vacations.values()
+        if totals[vacation.id] != vacation.total_work_days
+    }
+    VacationRepository.update_total_work_days(session, changed)
+    VacationBalanceRepository.replace(session, employee_ids, balances)
+    return len(changed)
+
+
+def recount_day(session: Session, employee_ids: Collection[UUID], day: date) -> int:
+    """
+    Recount `total_work_days` of vacations of some employees covering `day`,
+    once it became or stopped being a holiday, and return the number of
+    vacations changed
+
+    Only the year of `day` changes, the difference is added to the balances
+    of that year
+    """
+    vacations = VacationRepository.get_intervals(session, employee_ids, day=day)
+    counts = count_workdays(session, vacations, employee_ids)
+
+    changed = {}
+    deltas = Counter()
+    for vacation in vacations:
+        if (count := counts[vacation.id]) != vacation.total_work_days:
+            changed[vacation.id] = count
+            deltas[vacation.employee_id, day.year, vacation.type] += (
+                count - vacation.total_work_days
+            )
+    VacationRepository.update_total_work_days(session, changed)
+    VacationBalanceRepository.add(session, deltas)
+    return len(changed)
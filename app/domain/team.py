@@ -1,10 +1,41 @@
+from collections.abc import Sequence
+from uuid import UUID
+
 from sqlalchemy.orm import Session
 
+from ..repository.base import InvalidFieldsException
+from ..repository.employee import EmployeeRepository
 from ..repository.team import TeamRepository
 from ..schema.team import TeamSchema, TeamUpdateSchema
 
 
-__all__ = ("update_team",)
+__all__ = (
+    "read_team",
+    "update_team",
+)
+
+
+def read_team(
+    session: Session,
+    team_id: UUID,
+    *,
+    fields: Sequence[str] | None = None,
+    expand: Sequence[str] | None = None,
+) -> dict | None:
+    """
+    Team with only the requested fields, its employees are read when
+    `expand` has `employees`
+    """
+    expand = list(dict.fromkeys(expand or ()))
+    if unknown := set(expand) - {"employees"}:
+        raise InvalidFieldsException(f"Unknown fields {', '.join(sorted(unknown))}")
+    teams = TeamRepository.project_many(session, id=team_id, fields=fields, expand=())
+    if not teams:
+        return None
+    team = teams[0]
+    if "employees" in expand:
+        team["employees"] = EmployeeRepository.project_many(session, team_id=team_id)
+    return team
 
 
 def update_team(
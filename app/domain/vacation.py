@@ -1,40 +1,123 @@
-from collections.abc import Container
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from datetime import date, timedelta
+from operator import attrgetter
+from typing import Protocol, TypeVar
+from uuid import UUID
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from ..model.vacation import VacationType
+from ..repository.employee import EmployeeRepository
 from ..repository.vacation import VacationRepository
 from ..schema.employee import EmployeeSchema
-from ..schema.vacation import VacationCreateSchema, VacationSchema, VacationUpdateSchema
+from ..schema.vacation import (
+    VacationBatchResultSchema,
+    VacationCreateSchema,
+    VacationSchema,
+    VacationUpdateSchema,
+)
+from .balance import update_balance
+from .calendar import get_work_calendar
 from .exceptions import (
     BridgingDifferentTypesException,
+    InvalidVacationException,
     NoWorkDaysException,
     VacationAlreadyExistsException,
+    VacationNotFoundException,
 )
+from .schedule import get_work_schedule
+from .workdays import WorkCalendar, WorkSchedule, compute_workdays
 
 
 __all__ = (
-    "compute_workdays",
+    "delete_vacation",
+    "delete_vacation_async",
     "new_vacation",
+    "new_vacation_async",
+    "new_vacations",
+    "new_vacations_async",
     "update_vacation",
+    "update_vacation_async",
 )
 
 
-def compute_workdays(
-    start_date: date,
-    end_date: date,
-    days_off: Container[int] = (5, 6),  # weekend
-) -> int:
+class _Period(Protocol):
+    start_date: date
+    end_date: date
+    type: VacationType
+
+
+Period = TypeVar("Period", bound=_Period)
+
+
+@dataclass
+class _Slot:
+    """
+    Vacation period, along with what was merged in it when part of the
+    timeline built while merging a batch
+    """
+
+    start_date: date
+    end_date: date
+    type: VacationType
+    # Existing vacation kept for this period, others merged in are deleted
+    vacation: VacationSchema | None = None
+    absorbed: list[VacationSchema] = field(default_factory=list)
+    # Indexes of batch vacations merged in this period
+    indexes: list[int] = field(default_factory=list)
+
+
+def _merge_overlaps(
+    vacation_in: _Period,
+    overlaps: Sequence[Period],
+) -> tuple[date, date, list[Period]]:
     """
-    Compute days worked between two days.
-    Day indexes for `days_off` have the same meaning as `date.weekday`
+    Check vacation rules against overlapping or adjacent vacations sorted by
+    start date
+
+    Returns merged start and end dates and the vacations of the same type
+    that are absorbed
     """
-    return sum(
-        day.weekday() not in days_off
-        for day in (
-            start_date + timedelta(days=i)
-            for i in range((end_date - start_date).days + 1)
+    for overlap in overlaps:
+        if (
+            overlap.start_date <= vacation_in.start_date
+            and overlap.end_date >= vacation_in.end_date
+        ):
+            raise VacationAlreadyExistsException(
+                "Vacation already exists on those dates, if you want to change it update it"
+            )
+
+    if len(unique_types := set((overlap.type for overlap in overlaps))) > 1:
+        raise BridgingDifferentTypesException(
+            "Bridging vacation with following types: "
+            f"{', '.join(map(lambda x: x.name, unique_types))}"
         )
+
+    absorbed = [overlap for overlap in overlaps if overlap.type == vacation_in.type]
+
+    return (
+        min([vacation_in.start_date, *(overlap.start_date for overlap in absorbed)]),
+        max([vacation_in.end_date, *(overlap.end_date for overlap in absorbed)]),
+        absorbed,
+    )
+
+
+def _get_work_time(
+    session: Session, employee_id: UUID
+) -> tuple[WorkCalendar | None, WorkSchedule]:
+    """
+    Calendar and weekly schedule of an employee read from db once its
+    vacations are locked, an update waited for may have changed them and the
+    employee given to writers may come from a cache
+    """
+    (employee,) = EmployeeRepository.get_work_schedules(session, (employee_id,))
+    return (
+        get_work_calendar(session, employee.calendar_id),
+        get_work_schedule(session, employee),
     )
 
 
@@ -44,6 +127,7 @@ def new_vacation(
     employee: EmployeeSchema,
     *,
     _create: bool = True,
+    _replaced: _Period | None = None,
 ) -> VacationSchema:
     """
     Handle creation of new vacation
@@ -53,101 +137,230 @@ def new_vacation(
     Computes number of workdays
 
     This will not join two vacations with a week-end between them
+
+    Employee vacations are locked from the overlap read until the session
+    commits so concurrent writes cannot merge against a stale state, days are
+    counted on the calendar and weekly schedule read past the lock
     """
-    kwargs = {}
-    if not _create:
-        kwargs = {"ne": {"id": vacation_in.id}}
+    if _create:
+        EmployeeRepository.lock(session, employee.id)
 
-    employee_vacation_overlap = VacationRepository.get_many(
+    employee_vacation_overlap = VacationRepository.get_overlapping(
         session,
-        le={"start_date": vacation_in.end_date + timedelta(days=1)},
-        ge={"end_date": vacation_in.start_date - timedelta(days=1)},
-        order_by={"start_date": "ASC"},
-        employee_id=employee.id,
-        **kwargs,
+        employee.id,
+        vacation_in.start_date,
+        vacation_in.end_date,
+        exclude_id=None if _create else vacation_in.id,
     )
 
-    # Wont iter written as a loop for simplicity
-    print(employee_vacation_overlap)
-    for overlap in employee_vacation_overlap:
-        if (
-            overlap.start_date <= vacation_in.start_date
-            and overlap.end_date >= vacation_in.end_date
-        ):
-            raise VacationAlreadyExistsException(
-                "Vacation already exists on those dates, if you want to change it update it"
-            )
+    start_date, end_date, absorbed = _merge_overlaps(
+        vacation_in, employee_vacation_overlap
+    )
 
-    if (
-        len(
-            unique_types := set((overlap.type for overlap in employee_vacation_overlap))
-        )
-        > 1
-    ):
-        raise BridgingDifferentTypesException(
-            "Bridging vacation with following types: "
-            f"{', '.join(map(lambda x: x.name, unique_types))}"
+    calendar, schedule = _get_work_time(session, employee.id)
+    workdays = compute_workdays(
+        start_date,
+        end_date,
+        calendar=calendar,
+        schedule=schedule,
+    )
+
+    if not absorbed and workdays == 0:
+        raise NoWorkDaysException("Trying to create a vacation on not worked days")
+
+    update_balance(
+        session,
+        employee.id,
+        removed=absorbed if _replaced is None else [*absorbed, _replaced],
+        added=[_Slot(start_date, end_date, vacation_in.type)],
+        calendar=calendar,
+        schedule=schedule,
+    )
+
+    if _create and not absorbed:
+        return VacationRepository.create(
+            session,
+            employee.id,
+            workdays,
+            vacation_in,
         )
 
-    # The filtering in python here should be much less intensive than the one
-    # we did to first get the overlaps
-    employee_vacation_overlap = [
-        overlap
-        for overlap in employee_vacation_overlap
-        if overlap.type == vacation_in.type
-    ]
+    if _create:
+        to_update, *absorbed = absorbed
+    else:
+        to_update = vacation_in
 
-    if not employee_vacation_overlap:
-        # Create new one
-        workdays = compute_workdays(vacation_in.start_date, vacation_in.end_date)
+    VacationRepository.delete_many(session, absorbed)
 
-        if workdays == 0:
-            raise NoWorkDaysException("Trying to create a vacation on not worked days")
+    to_update.start_date = start_date
+    to_update.end_date = end_date
+    to_update.total_work_days = workdays
 
-        if _create:
-            return VacationRepository.create(
-                session,
-                employee.id,
-                workdays,
+    return VacationRepository.update(session, to_update)
+
+
+def _neighbours(timeline: list[_Slot], vacation_in: _Period) -> tuple[int, int]:
+    """
+    Bounds of slots overlapping or adjacent to a vacation in a timeline of
+    disjoint slots sorted by start date
+    """
+    high = bisect_right(
+        timeline,
+        vacation_in.end_date + timedelta(days=1),
+        key=attrgetter("start_date"),
+    )
+    low = high
+    day_before = vacation_in.start_date - timedelta(days=1)
+    while low > 0 and timeline[low - 1].end_date >= day_before:
+        low -= 1
+    return low, high
+
+
+def new_vacations(
+    session: Session,
+    vacations_in: Sequence[VacationCreateSchema],
+    employee: EmployeeSchema,
+) -> list[VacationBatchResultSchema]:
+    """
+    Handle creation of many vacations for an employee
+
+    Employee vacations around the batch are loaded once, then new vacations
+    are merged in start date order with the same rules as `new_vacation`
+    and everything is written in one transaction
+
+    Results keep the order of `vacations_in`, a vacation breaking a rule gets
+    an error and does not prevent others from being created
+    """
+    if not vacations_in:
+        return []
+
+    EmployeeRepository.lock(session, employee.id)
+    calendar, schedule = _get_work_time(session, employee.id)
+
+    # One timeline per type, slots of a type never overlap each other
+    timelines: dict[VacationType, list[_Slot]] = defaultdict(list)
+    for vacation in VacationRepository.get_overlapping(
+        session,
+        employee.id,
+        min(vacation_in.start_date for vacation_in in vacations_in),
+        max(vacation_in.end_date for vacation_in in vacations_in),
+    ):
+        timelines[vacation.type].append(
+            _Slot(
+                vacation.start_date,
+                vacation.end_date,
+                vacation.type,
+                vacation=vacation,
+            )
+        )
+
+    results = [VacationBatchResultSchema() for _ in vacations_in]
+    for index in sorted(
+        range(len(vacations_in)),
+        key=lambda i: (vacations_in[i].start_date, vacations_in[i].end_date),
+    ):
+        vacation_in = vacations_in[index]
+        bounds = {
+            type_: _neighbours(timeline, vacation_in)
+            for type_, timeline in timelines.items()
+        }
+        try:
+            start_date, end_date, absorbed = _merge_overlaps(
                 vacation_in,
+                sorted(
+                    (
+                        slot
+                        for type_, (low, high) in bounds.items()
+                        for slot in timelines[type_][low:high]
+                    ),
+                    key=attrgetter("start_date"),
+                ),
             )
+            if not absorbed and not compute_workdays(
+                vacation_in.start_date,
+                vacation_in.end_date,
+                calendar=calendar,
+                schedule=schedule,
+            ):
+                raise NoWorkDaysException(
+                    "Trying to create a vacation on not worked days"
+                )
+        except InvalidVacationException as exc:
+            results[index].error = str(exc)
+            continue
 
-        vacation_in.total_work_days = compute_workdays(
-            vacation_in.start_date,
-            vacation_in.end_date,
-        )
-        return VacationRepository.update(session, vacation_in)
+        merged = _Slot(start_date, end_date, vacation_in.type, indexes=[index])
+        for slot in absorbed:
+            merged.indexes.extend(slot.indexes)
+            merged.absorbed.extend(slot.absorbed)
+            if slot.vacation is None:
+                continue
+            if merged.vacation is None:
+                merged.vacation = slot.vacation
+            else:
+                merged.absorbed.append(slot.vacation)
 
-    if _create:
-        earliest_overlap, *overlaps = employee_vacation_overlap
+        timeline = timelines[vacation_in.type]
+        low, high = bounds.get(vacation_in.type) or _neighbours(timeline, vacation_in)
+        timeline[low:high] = [merged]
 
-        earliest_overlap.start_date = min(
-            earliest_overlap.start_date, vacation_in.start_date
-        )
-        earliest_overlap.end_date = max(earliest_overlap.end_date, vacation_in.end_date)
-        if overlaps:
-            earliest_overlap.end_date = overlaps[-1].end_date
-        overlaps_to_delete = overlaps
-        to_update = earliest_overlap
-    else:
-        vacation_in.start_date = min(
-            employee_vacation_overlap[0].start_date, vacation_in.start_date
+    for slot in (slot for timeline in timelines.values() for slot in timeline):
+        if not slot.indexes:
+            continue
+
+        update_balance(
+            session,
+            employee.id,
+            removed=(
+                slot.absorbed
+                if slot.vacation is None
+                else [*slot.absorbed, slot.vacation]
+            ),
+            added=[slot],
+            calendar=calendar,
+            schedule=schedule,
         )
-        vacation_in.end_date = max(
-            employee_vacation_overlap[-1].end_date, vacation_in.end_date
+
+        VacationRepository.delete_many(session, slot.absorbed)
+
+        workdays = compute_workdays(
+            slot.start_date,
+            slot.end_date,
+            calendar=calendar,
+            schedule=schedule,
         )
-        to_update = vacation_in
-        overlaps_to_delete = employee_vacation_overlap
+        if slot.vacation is None:
+            vacation = VacationRepository.create(
+                session,
+                employee.id,
+                workdays,
+                VacationCreateSchema(
+                    start_date=slot.start_date,
+                    end_date=slot.end_date,
+                    type=slot.type,
+                ),
+            )
+        else:
+            slot.vacation.start_date = slot.start_date
+            slot.vacation.end_date = slot.end_date
+            slot.vacation.total_work_days = workdays
+            vacation = VacationRepository.update(session, slot.vacation)
 
-    for overlap in overlaps_to_delete:
-        session.delete(overlap._model)  # pylint:disable=protected-access
+        for index in slot.indexes:
+            results[index].vacation = vacation
 
-    to_update.total_work_days = compute_workdays(
-        to_update.start_date,
-        to_update.end_date,
-    )
+    return results
 
-    return VacationRepository.update(session, to_update)
+
+def _lock_vacation(session: Session, vacation: VacationSchema) -> VacationSchema:
+    """
+    Lock employee vacations then read the vacation again, it may have been
+    merged or deleted while waiting
+    """
+    EmployeeRepository.lock(session, vacation.employee.id)
+    if (vacation := VacationRepository.refresh(session, vacation)) is None:
+        raise VacationNotFoundException("Vacation was deleted meanwhile")
+    return vacation
 
 
 def update_vacation(
@@ -156,7 +369,73 @@ def update_vacation(
     """
     Handle update of vacation
     """
-    for key, value in update_data.model_dump().items():
+    vacation = _lock_vacation(session, vacation)
+    replaced = _Slot(vacation.start_date, vacation.end_date, vacation.type)
+    changes = update_data.model_dump()
+    # Each assignment is checked against the other date, moving a vacation
+    # past its end sets the end first
+    if changes.get("start_date", vacation.start_date) > vacation.end_date:
+        changes = {"end_date": changes.pop("end_date", vacation.end_date), **changes}
+    for key, value in changes.items():
         setattr(vacation, key, value)
 
-    return new_vacation(session, vacation, vacation.employee, _create=False)
+    return new_vacation(
+        session, vacation, vacation.employee, _create=False, _replaced=replaced
+    )
+
+
+def delete_vacation(session: Session, vacation: VacationSchema) -> VacationSchema:
+    """
+    Handle deletion of vacation
+    """
+    vacation = _lock_vacation(session, vacation)
+    calendar, schedule = _get_work_time(session, vacation.employee.id)
+    update_balance(
+        session,
+        vacation.employee.id,
+        removed=[vacation],
+        calendar=calendar,
+        schedule=schedule,
+    )
+    VacationRepository.delete(session, vacation)
+    return vacation
+
+
+async def new_vacation_async(
+    session: AsyncSession,
+    vacation_in: VacationCreateSchema,
+    employee: EmployeeSchema,
+) -> VacationSchema:
+    """
+    `new_vacation` with an asyncio session
+    """
+    return await session.run_sync(new_vacation, vacation_in, employee)
+
+
+async def new_vacations_async(
+    session: AsyncSession,
+    vacations_in: Sequence[VacationCreateSchema],
+    employee: EmployeeSchema,
+) -> list[VacationBatchResultSchema]:
+    """
+    `new_vacations` with an asyncio session
+    """
+    return await session.run_sync(new_vacations, vacations_in, employee)
+
+
+async def update_vacation_async(
+    session: AsyncSession, vacation: VacationSchema, update_data: VacationUpdateSchema
+) -> VacationSchema:
+    """
+    `update_vacation` with an asyncio session
+    """
+    return await session.run_sync(update_vacation, vacation, update_data)
+
+
+async def delete_vacation_async(
+    session: AsyncSession, vacation: VacationSchema
+) -> VacationSchema:
+    """
+    `delete_vacation` with an asyncio session
+    """
+    return await session.run_sync(delete_vacation, vacation)
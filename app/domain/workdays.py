@@ -0,0 +1,285 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import Container, Iterable, Iterator, Sequence
+from datetime import date, timedelta
+from functools import lru_cache
+
+
+__all__ = (
+    "FULL_TIME",
+    "WEEKEND",
+    "WorkCalendar",
+    "WorkSchedule",
+    "compute_workdays",
+    "compute_workdays_batch",
+    "schedule_days_off",
+    "workday_flags",
+    "year_parts",
+)
+
+
+WEEKEND = (5, 6)
+
+# Weekly schedules are bitmasks, bit `n` set when weekday `n` is worked
+FULL_TIME = 0b0011111
+
+
+def _workday_flags(days_off: Container[int]) -> tuple[bool, ...]:
+    """
+    Worked flag for each day of the week, indexed like `date.weekday`
+    """
+    return tuple(weekday not in days_off for weekday in range(7))
+
+
+@lru_cache(maxsize=128)
+def schedule_days_off(work_schedule: int) -> tuple[int, ...]:
+    """
+    Weekday indexes not worked in a weekly schedule bitmask
+    """
+    return tuple(weekday for weekday in range(7) if not work_schedule >> weekday & 1)
+
+
+@lru_cache(maxsize=128)
+def _week_table(flags: tuple[bool, ...]) -> tuple[int, ...]:
+    """
+    Prefix sums of worked days over two consecutive weeks
+
+    `table[first + n] - table[first]` is the number of worked days in the `n`
+    days (n < 7) starting on weekday `first`
+    """
+    table = [0]
+    for i in range(14):
+        table.append(table[-1] + flags[i % 7])
+    return tuple(table)
+
+
+class WorkCalendar:
+    """
+    Holiday calendar answering workday counts with prefix-sum lookups
+
+    For each year and weekly pattern a bitmap of worked days is built once,
+    then folded into a prefix-sum array so that counting an interval inside
+    a year is two array lookups
+    """
+
+    def __init__(self, holidays: Iterable[date] = ()):
+        self.holidays = frozenset(holidays)
+        self._prefixes: dict[tuple[int, tuple[bool, ...]], array] = {}
+
+    def _year_prefix(self, year: int, flags: tuple[bool, ...]) -> array:
+        """
+        `prefix[n]` is the number of worked days in the first `n` days of `year`
+        """
+        if (prefix := self._prefixes.get((year, flags))) is not None:
+            return prefix
+
+        first = date(year, 1, 1).toordinal()
+        length = date(year + 1, 1, 1).toordinal() - first
+        bitmap = bytearray(flags[(first + i - 1) % 7] for i in range(length))
+        for holiday in self.holidays:
+            if holiday.year == year:
+                bitmap[holiday.toordinal() - first] = 0
+
+        prefix = array("H", (0,))
+        for worked in bitmap:
+            prefix.append(prefix[-1] + worked)
+        self._prefixes[(year, flags)] = prefix
+        return prefix
+
+    def count(
+        self,
+        start_date: date,
+        end_date: date,
+        days_off: Container[int] = WEEKEND,
+    ) -> int:
+        """
+        Number of worked days between two days, both included
+        """
+        if end_date < start_date:
+            return 0
+
+        flags = _workday_flags(days_off)
+        start_index = start_date.timetuple().tm_yday - 1
+        end_index = end_date.timetuple().tm_yday
+        if start_date.year == end_date.year:
+            prefix = self._year_prefix(start_date.year, flags)
+            return prefix[end_index] - prefix[start_index]
+
+        prefix = self._year_prefix(start_date.year, flags)
+        total = prefix[-1] - prefix[start_index]
+        for year in range(start_date.year + 1, end_date.year):
+            total += self._year_prefix(year, flags)[-1]
+        return total + self._year_prefix(end_date.year, flags)[end_index]
+
+
+class WorkSchedule:
+    """
+    Weekly schedule bitmask with effective-dated changes
+
+    `work_schedule` applies until the first change, each change applies from
+    its effective date until the next one
+    """
+
+    def __init__(
+        self,
+        work_schedule: int = FULL_TIME,
+        changes: Iterable[tuple[date, int]] = (),
+    ):
+        self.work_schedule = work_schedule
+        self.changes = sorted(changes)
+        self._effective_dates = [effective_date for effective_date, _ in self.changes]
+
+    def segments(
+        self,
+        start_date: date,
+        end_date: date,
+    ) -> Iterator[tuple[date, date, int]]:
+        """
+        Split an interval into `(start_date, end_date, work_schedule)` parts
+        """
+        index = bisect_right(self._effective_dates, start_date)
+        work_schedule = self.changes[index - 1][1] if index else self.work_schedule
+        for effective_date, next_schedule in self.changes[index:]:
+            if effective_date > end_date:
+                break
+            yield start_date, effective_date - timedelta(days=1), work_schedule
+            start_date, work_schedule = effective_date, next_schedule
+        yield start_date, end_date, work_schedule
+
+
+def year_parts(start_date: date, end_date: date) -> Iterator[tuple[int, date, date]]:
+    """
+    Split an interval into `(year, start_date, end_date)` parts
+    """
+    for year in range(start_date.year, end_date.year + 1):
+        yield year, max(start_date, date(year, 1, 1)), min(end_date, date(year, 12, 31))
+
+
+def compute_workdays(
+    start_date: date,
+    end_date: date,
+    days_off: Container[int] = WEEKEND,
+    calendar: WorkCalendar | None = None,
+    schedule: WorkSchedule | None = None,
+) -> int:
+    """
+    Compute days worked between two days.
+    Day indexes for `days_off` have the same meaning as `date.weekday`
+    Holidays of `calendar` are not worked
+    When given, `schedule` replaces `days_off`
+    """
+    if schedule is not None:
+        return sum(
+            compute_workdays(
+                segment_start,
+                segment_end,
+                schedule_days_off(work_schedule),
+                calendar,
+            )
+            for segment_start, segment_end, work_schedule in schedule.segments(
+                start_date, end_date
+            )
+        )
+
+    if calendar is not None:
+        return calendar.count(start_date, end_date, days_off)
+
+    days = (end_date - start_date).days + 1
+    if days <= 0:
+        return 0
+
+    table = _week_table(_workday_flags(days_off))
+    weeks, remainder = divmod(days, 7)
+    first = start_date.weekday()
+    return weeks * table[7] + table[first + remainder] - table[first]
+
+
+def compute_workdays_batch(
+    start_dates: Sequence[date],
+    end_dates: Sequence[date],
+    days_off: Container[int] = WEEKEND,
+    calendar: WorkCalendar | None = None,
+    work_schedules: Sequence[int] | None = None,
+) -> list[int]:
+    """
+    Compute days worked for many intervals at once, in the spirit of
+    `numpy.busday_count` but with `compute_workdays` inclusive bounds.
+
+    `work_schedules` gives a weekly schedule bitmask per interval and
+    replaces `days_off`
+
+    All sequences must have the same length, result keeps their order
+    """
+    if len(start_dates) != len(end_dates):
+        raise ValueError("start_dates and end_dates must have the same length")
+    if work_schedules is None:
+        work_schedules = (None,) * len(start_dates)
+    elif len(work_schedules) != len(start_dates):
+        raise ValueError("work_schedules and start_dates must have the same length")
+
+    if calendar is not None:
+        return [
+            calendar.count(
+                start_date,
+                end_date,
+                days_off if work_schedule is None else schedule_days_off(work_schedule),
+            )
+            for start_date, end_date, work_schedule in zip(
+                start_dates, end_dates, work_schedules
+            )
+        ]
+
+    tables = {None: _week_table(_workday_flags(days_off))}
+    counts = []
+    for start_date, end_date, work_schedule in zip(
+        start_dates, end_dates, work_schedules
+    ):
+        start = start_date.toordinal()
+        days = end_date.toordinal() - start + 1
+        if days <= 0:
+            counts.append(0)
+            continue
+        if (table := tables.get(work_schedule)) is None:
+            table = tables[work_schedule] = _week_table(
+                _workday_flags(schedule_days_off(work_schedule))
+            )
+        weeks, remainder = divmod(days, 7)
+        # date.fromordinal(1) is a monday
+        first = (start - 1) % 7
+        counts.append(weeks * table[7] + table[first + remainder] - table[first])
+    return counts
+
+
+def workday_flags(
+    start_date: date,
+    end_date: date,
+    days_off: Container[int] = WEEKEND,
+    calendar: WorkCalendar | None = None,
+    schedule: WorkSchedule | None = None,
+) -> bytearray:
+    """
+    Worked flag of each day between two days, both included, with the same
+    rules as `compute_workdays`
+    """
+    first = start_date.toordinal()
+    flags = bytearray(max(end_date.toordinal() - first + 1, 0))
+    segments = (
+        (
+            (segment_start, segment_end, schedule_days_off(work_schedule))
+            for segment_start, segment_end, work_schedule in schedule.segments(
+                start_date, end_date
+            )
+        )
+        if schedule is not None
+        else ((start_date, end_date, days_off),)
+    )
+    for segment_start, segment_end, segment_days_off in segments:
+        week = _workday_flags(segment_days_off)
+        for ordinal in range(segment_start.toordinal(), segment_end.toordinal() + 1):
+            # date.fromordinal(1) is a monday
+            flags[ordinal - first] = week[(ordinal - 1) % 7]
+    if calendar is not None:
+        for holiday in calendar.holidays:
+            if start_date <= holiday <= end_date:
+                flags[holiday.toordinal() - first] = 0
+    return flags
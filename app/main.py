@@ -2,8 +2,10 @@ from contextlib import AsyncExitStack, asynccontextmanager
 
 from fastapi import FastAPI
 
-from app.api import add_app_routes, stats_middleware
+from app.api import add_app_routes, read_your_writes_middleware, stats_middleware
 from app.core.config import settings
+from app.db.cache import identity_cache_lifespan
+from app.db.session import async_engine_lifespan
 from app.reporting.sentry import init_sentry
 from app.timeseries.mongo import mongo_lifespan
 
@@ -16,6 +18,8 @@ async def _lifespan(_: FastAPI):
     resource_managers = (
         mongo_lifespan,
         init_sentry,
+        async_engine_lifespan,
+        identity_cache_lifespan,
     )
 
     async with AsyncExitStack() as stack:
@@ -31,4 +35,5 @@ app = FastAPI(
 )
 
 add_app_routes(app)
+app.middleware("http")(read_your_writes_middleware)
 app.middleware("http")(stats_middleware)
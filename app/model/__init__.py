@@ -1,4 +1,7 @@
+from .balance import *
 from .base import *
+from .calendar import *
 from .employee import *
+from .schedule import *
 from .team import *
 from .vacation import *
@@ -0,0 +1,35 @@
+from sqlalchemy import ForeignKey, SmallInteger, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel, CustomUUID
+from .vacation import VacationType
+
+
+__all__ = ("VacationBalanceModel",)
+
+
+class VacationBalanceModel(BaseModel):
+    """
+    Worked days taken as vacation by an employee in a year, per type
+
+    Maintained as deltas when vacations are written
+    """
+
+    __tablename__ = "vacation_balance"
+    __table_args__ = (
+        UniqueConstraint(
+            "employee_id",
+            "year",
+            "type",
+            name="vacation_balance_employee_id_year_type_uq",
+        ),
+    )
+
+    year: Mapped[int] = mapped_column(SmallInteger)
+    type: Mapped[VacationType]
+    days: Mapped[int]
+
+    employee_id: Mapped[CustomUUID(as_uuid=True)] = mapped_column(
+        ForeignKey("employee.id", name="vacation_balance_employee_id_fk"),
+        nullable=False,
+    )
@@ -1,6 +1,6 @@
 import uuid as uid
 
-from sqlalchemy import Column
+from sqlalchemy import BigInteger, Column, FetchedValue, text
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import as_declarative
 
@@ -8,6 +8,7 @@ from sqlalchemy.orm import as_declarative
 __all__ = (
     "BaseModel",
     "CustomUUID",
+    "VersionMixin",
 )
 
 
@@ -31,3 +32,18 @@ class BaseModel:
         index=True,
         default=uid.uuid4,
     )
+
+
+class VersionMixin:
+    """
+    Rows numbered from the `row_version` sequence on insert and again by a
+    trigger on each update changing them, versions are unique across tables
+    and grow with every write
+    """
+
+    version = Column(
+        BigInteger,
+        nullable=False,
+        server_default=text("nextval('row_version')"),
+        server_onupdate=FetchedValue(),
+    )
@@ -0,0 +1,55 @@
+from datetime import date
+from typing import TYPE_CHECKING
+
+from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import BaseModel, CustomUUID
+
+
+if TYPE_CHECKING:
+    from .employee import EmployeeModel
+
+
+__all__ = (
+    "CalendarModel",
+    "HolidayModel",
+)
+
+
+class CalendarModel(BaseModel):
+    """
+    Calendar model, a named set of holidays (country, site...)
+    """
+
+    __tablename__ = "calendar"
+
+    name: Mapped[str]
+    holidays: Mapped[list["HolidayModel"]] = relationship(
+        back_populates="calendar",
+        order_by="HolidayModel.day",
+    )
+    employees: Mapped[list["EmployeeModel"]] = relationship(
+        back_populates="calendar",
+    )
+
+
+class HolidayModel(BaseModel):
+    """
+    Holiday model
+    """
+
+    __tablename__ = "holiday"
+    __table_args__ = (
+        UniqueConstraint("calendar_id", "day", name="holiday_calendar_id_day_uq"),
+    )
+
+    day: Mapped[date]
+    name: Mapped[str]
+
+    calendar_id: Mapped[CustomUUID(as_uuid=True)] = mapped_column(
+        ForeignKey("calendar.id", name="holiday_calendar_id_fk"),
+        nullable=False,
+    )
+
+    calendar: Mapped["CalendarModel"] = relationship(back_populates="holidays")
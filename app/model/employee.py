@@ -4,29 +4,48 @@ import sqlalchemy as sa
 from sqlalchemy import ForeignKey
 from sqlalchemy.orm import Mapped, relationship
 
-from .base import BaseModel, CustomUUID
+from .base import BaseModel, CustomUUID, VersionMixin
 
 
 if TYPE_CHECKING:
+    from .calendar import CalendarModel
     from .team import TeamModel
 
 
 __all__ = ("EmployeeModel",)
 
 
-class EmployeeModel(BaseModel):
+class EmployeeModel(VersionMixin, BaseModel):
     """
     Employee model
     """
 
     __tablename__ = "employee"
+    __table_args__ = (
+        sa.CheckConstraint(
+            "work_schedule BETWEEN 1 AND 127",
+            name="employee_work_schedule_ck",
+        ),
+    )
+
     first_name = sa.Column(sa.String, nullable=False)
     last_name = sa.Column(sa.String, nullable=False)
 
+    # Weekly schedule bitmask, bit `n` set when weekday `n` is worked
+    work_schedule = sa.Column(sa.SmallInteger, nullable=False, server_default="31")
+
     team_id = sa.Column(
         CustomUUID(as_uuid=True),
         ForeignKey("team.id", name="employee_team_id_fk"),
         nullable=False,
+        index=True,
+    )
+
+    calendar_id = sa.Column(
+        CustomUUID(as_uuid=True),
+        ForeignKey("calendar.id", name="employee_calendar_id_fk"),
+        nullable=True,
     )
 
     team: Mapped["TeamModel"] = relationship(back_populates="employees")
+    calendar: Mapped["CalendarModel | None"] = relationship(back_populates="employees")
@@ -0,0 +1,36 @@
+from datetime import date
+
+from sqlalchemy import CheckConstraint, ForeignKey, SmallInteger, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel, CustomUUID
+
+
+__all__ = ("EmployeeScheduleModel",)
+
+
+class EmployeeScheduleModel(BaseModel):
+    """
+    Effective-dated change of an employee weekly schedule
+    """
+
+    __tablename__ = "employee_schedule"
+    __table_args__ = (
+        UniqueConstraint(
+            "employee_id",
+            "effective_date",
+            name="employee_schedule_employee_id_effective_date_uq",
+        ),
+        CheckConstraint(
+            "work_schedule BETWEEN 1 AND 127",
+            name="employee_schedule_work_schedule_ck",
+        ),
+    )
+
+    effective_date: Mapped[date]
+    work_schedule: Mapped[int] = mapped_column(SmallInteger)
+
+    employee_id: Mapped[CustomUUID(as_uuid=True)] = mapped_column(
+        ForeignKey("employee.id", name="employee_schedule_employee_id_fk"),
+        nullable=False,
+    )
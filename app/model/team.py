@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy.orm import Mapped, relationship
 
-from .base import BaseModel
+from .base import BaseModel, VersionMixin
 
 
 if TYPE_CHECKING:
@@ -12,7 +12,7 @@ if TYPE_CHECKING:
 __all__ = ("TeamModel",)
 
 
-class TeamModel(BaseModel):
+class TeamModel(VersionMixin, BaseModel):
     """
     Team model
     """
@@ -2,10 +2,11 @@ from datetime import date
 from enum import IntEnum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import Computed, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import DATERANGE, ExcludeConstraint, Range
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import BaseModel, CustomUUID
+from .base import BaseModel, CustomUUID, VersionMixin
 
 
 if TYPE_CHECKING:
@@ -27,17 +28,44 @@ class VacationType(IntEnum):
     UNPAID = 1
 
 
-class VacationModel(BaseModel):
+class VacationModel(VersionMixin, BaseModel):
     """
     Vacation model
     """
 
     __tablename__ = "vacation"
+    __table_args__ = (
+        Index("ix_vacation_employee_id_start_date", "employee_id", "start_date"),
+        Index("ix_vacation_start_date_end_date", "start_date", "end_date"),
+        # Sort of vacation pages
+        Index("ix_vacation_start_date_id", "start_date", "id"),
+        Index(
+            "ix_vacation_employee_id_period",
+            "employee_id",
+            "period",
+            postgresql_using="gist",
+        ),
+        # Deferred so a merge can widen a vacation before deleting the ones
+        # it absorbs
+        ExcludeConstraint(
+            ("employee_id", "="),
+            ("type", "="),
+            ("period", "&&"),
+            name="vacation_employee_id_type_period_excl",
+            using="gist",
+            deferrable=True,
+            initially="DEFERRED",
+        ),
+    )
 
     start_date: Mapped[date]
     end_date: Mapped[date]
     total_work_days: Mapped[int]
-    type: Mapped[VacationType]
+    type: Mapped[VacationType] = mapped_column(index=True)
+    period: Mapped[Range[date]] = mapped_column(
+        DATERANGE,
+        Computed("daterange(start_date, end_date, '[]')", persisted=True),
+    )
 
     employee_id: Mapped[CustomUUID(as_uuid=True)] = mapped_column(
         ForeignKey("employee.id", name="vacation_employee_id_fk"),
@@ -1,4 +1,8 @@
+from .balance import *
 from .base import *
+from .calendar import *
 from .employee import *
+from .imports import *
+from .schedule import *
 from .team import *
 from .vacation import *
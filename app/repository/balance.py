@@ -0,0 +1,133 @@
+from collections.abc import Collection, Mapping
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from ..model.balance import VacationBalanceModel
+from ..model.employee import EmployeeModel
+from ..model.vacation import VacationType
+from ..repository.base import AsyncRepository
+from ..schema.balance import BalanceSchema
+
+
+__all__ = (
+    "AsyncVacationBalanceRepository",
+    "VacationBalanceRepository",
+)
+
+
+# (employee ID, year, type) -> worked days
+BalanceKey = tuple[UUID, int, VacationType]
+
+
+class _VacationBalanceRepository:
+    """
+    Vacation balance ledger repository
+    """
+
+    model = VacationBalanceModel
+
+    def add(self, session, deltas: Mapping[BalanceKey, int]):
+        """
+        Add worked days to balances, creating missing ones
+        """
+        rows = [
+            {
+                "id": uuid4(),
+                "employee_id": employee_id,
+                "year": year,
+                "type": type_,
+                "days": days,
+            }
+            for (employee_id, year, type_), days in deltas.items()
+            if days
+        ]
+        if not rows:
+            return
+        statement = pg_insert(self.model).values(rows)
+        session.execute(
+            statement.on_conflict_do_update(
+                constraint="vacation_balance_employee_id_year_type_uq",
+                set_={"days": self.model.days + statement.excluded.days},
+            )
+        )
+
+    def replace(
+        self,
+        session,
+        employee_ids: Collection[UUID] | None,
+        balances: Mapping[BalanceKey, int],
+    ):
+        """
+        Replace all balances of some employees, all of them if `employee_ids`
+        is None
+        """
+        query = delete(self.model)
+        if employee_ids is not None:
+            query = query.where(self.model.employee_id.in_(employee_ids))
+        session.execute(query)
+        if any(balances.values()):
+            session.execute(
+                insert(self.model),
+                [
+                    {
+                        "id": uuid4(),
+                        "employee_id": employee_id,
+                        "year": year,
+                        "type": type_,
+                        "days": days,
+                    }
+                    for (employee_id, year, type_), days in balances.items()
+                    if days
+                ],
+            )
+
+    def get_by_employee_id(
+        self, session, employee_id: UUID, year: int | None = None
+    ) -> list[BalanceSchema]:
+        """
+        Get balances of an employee, of every year if `year` is None
+        """
+        query = (
+            select(self.model.year, self.model.type, self.model.days)
+            .where(self.model.employee_id == employee_id, self.model.days != 0)
+            .order_by(self.model.year, self.model.type)
+        )
+        if year is not None:
+            query = query.where(self.model.year == year)
+        return [
+            BalanceSchema.model_validate(row, from_attributes=True)
+            for row in session.execute(query)
+        ]
+
+    def get_by_team_id(
+        self, session, team_id: UUID, year: int | None = None
+    ) -> list[BalanceSchema]:
+        """
+        Get balances summed over employees of a team, of every year if
+        `year` is None
+        """
+        query = (
+            select(
+                self.model.year,
+                self.model.type,
+                func.sum(self.model.days).label("days"),
+            )
+            .join(EmployeeModel, EmployeeModel.id == self.model.employee_id)
+            .where(EmployeeModel.team_id == team_id)
+            .group_by(self.model.year, self.model.type)
+            .having(func.sum(self.model.days) != 0)
+            .order_by(self.model.year, self.model.type)
+        )
+        if year is not None:
+            query = query.where(self.model.year == year)
+        return [
+            BalanceSchema.model_validate(row, from_attributes=True)
+            for row in session.execute(query)
+        ]
+
+
+VacationBalanceRepository = _VacationBalanceRepository()
+
+AsyncVacationBalanceRepository = AsyncRepository(VacationBalanceRepository)
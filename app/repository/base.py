@@ -1,14 +1,62 @@
+import base64
+import dataclasses
+import inspect
+import json
 from abc import ABC, abstractmethod
-from typing import Any, Generic, Literal, TypeAlias, TypeVar
+from collections.abc import Callable, Sequence
+from functools import cached_property, lru_cache, wraps
+from typing import Any, Generic, Literal, NamedTuple, TypeAlias, TypeVar, get_type_hints
+from uuid import UUID
 
-from sqlalchemy import asc, desc
-from sqlalchemy.orm import Query, Session
+from pydantic import TypeAdapter
+from pydantic_core import to_jsonable_python
+from sqlalchemy import (
+    Row,
+    Select,
+    any_,
+    asc,
+    bindparam,
+    delete,
+    desc,
+    func,
+    insert,
+    literal_column,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    Query,
+    Session,
+    attributes,
+    joinedload,
+    lazyload,
+    noload,
+    raiseload,
+    selectinload,
+)
 
+from ..db.cache import IdentityCache, invalidate
+from ..db.replica import ON_REPLICA
 from ..model.base import BaseModel
 from ..schema.base import BaseSchema
+from ..schema.lookup import LookupSchema
+from ..schema.page import PageSchema
 
 
-__all__ = ("BaseRepository",)
+__all__ = (
+    "AsyncRepository",
+    "BaseRepository",
+    "InvalidCursorException",
+    "InvalidFieldsException",
+    "MAX_PAGE_SIZE",
+    "PAGE_SIZE",
+)
+
+
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
 
 
 Schema = TypeVar("Schema", bound=BaseSchema)
@@ -18,6 +66,28 @@ Model = TypeVar("Model", bound=BaseModel)
 FilterDef: TypeAlias = dict[str, Any]
 OrderByOrdDef: TypeAlias = Literal["ASC", "DESC"]
 OrderByDef: TypeAlias = dict[str, OrderByOrdDef]
+LoadStrategyDef: TypeAlias = Literal["joined", "selectin", "lazy", "raise", "noload"]
+LoadDef: TypeAlias = dict[str, LoadStrategyDef]
+
+
+class _Projection(NamedTuple):
+    columns: list
+    joins: list
+    build: Callable[[Row], Any]
+    # Positions of page keys in a row
+    keys: list[int]
+
+
+class InvalidCursorException(ValueError):
+    """
+    Raised when a page cursor was not issued by the repository
+    """
+
+
+class InvalidFieldsException(ValueError):
+    """
+    Raised when requested fields or relationships cannot be projected
+    """
 
 
 class BaseRepository(Generic[Schema, Model], ABC):
@@ -34,11 +104,23 @@ class BaseRepository(Generic[Schema, Model], ABC):
         *,
         update_schema: BaseSchema | None = None,
         insert_schema: BaseSchema | None = None,
+        load: LoadDef | None = None,
+        page_keys: tuple[str, ...] = ("id",),
+        projection: type | None = None,
+        cache: IdentityCache | None = None,
     ):
         self.model = model
         self.schema = schema
         self.update_schema = update_schema or schema
         self.insert_schema = insert_schema or schema
+        # Default loading strategy of relationships, overridable per query
+        self.load = load or {}
+        # Unique ascending sort of pages, should match an index
+        self.page_keys = page_keys
+        # Read only dataclass of list endpoints, see `project_many`
+        self.projection = projection
+        # Schemas by ID for `get_cached`, dropped when updated or deleted
+        self.cache = cache
 
     def _create_schema_and_assign_model(self, model: Model) -> Schema:
         schema = self.schema.model_validate(model)
@@ -75,6 +157,19 @@ class BaseRepository(Generic[Schema, Model], ABC):
             query = query.order_by(mapping[value](getattr(self.model, key)))
         return query
 
+    def _load_options(self, load: LoadDef | None = None) -> list:
+        mapping = {
+            "joined": joinedload,
+            "selectin": selectinload,
+            "lazy": lazyload,
+            "raise": raiseload,
+            "noload": noload,
+        }
+        return [
+            mapping[value](getattr(self.model, key))
+            for key, value in {**self.load, **(load or {})}.items()
+        ]
+
     def _query(  # pylint:disable=too-many-arguments
         self,
         session: Session,
@@ -86,11 +181,16 @@ class BaseRepository(Generic[Schema, Model], ABC):
         ne: FilterDef | None = None,
         eq: FilterDef | None = None,
         order_by: OrderByDef | None = None,
+        load: LoadDef | None = None,
         **kwargs,
     ) -> Query:
+        """
+        Relationships are loaded following `load`, which overrides the
+        repository defaults per relationship
+        """
         eq = eq or {}
         eq.update(kwargs)
-        query = session.query(self.model)
+        query = session.query(self.model).options(*self._load_options(load))
         query = self._setup_filters(query, gt=gt, ge=ge, lt=lt, le=le, ne=ne, eq=eq)
         query = self._setup_order_by(query, **(order_by or {}))
         return query
@@ -104,6 +204,28 @@ class BaseRepository(Generic[Schema, Model], ABC):
             return None
         return self._create_schema_and_assign_model(model)
 
+    def get_cached(
+        self, session: Session, id_: UUID, *, version: str | None = None
+    ) -> Schema | None:
+        """
+        Return an object by ID from `cache`, read with `get` and cached when
+        missing, or None if not found
+
+        With the `version` just read, only an object cached at that version
+        is returned
+
+        Cached objects are not attached to the session, read them with
+        `get` to update them
+        """
+        generation = self.cache.generation
+        if (schema := self.cache.get(id_, version)) is not None:
+            return schema
+        schema = self.get(session, id=id_)
+        # Replicas may not have the writes invalidations were sent for yet
+        if schema is not None and not session.info.get(ON_REPLICA):
+            self.cache.put(schema, generation, version)
+        return schema
+
     def get_many(self, session, *_, **kwargs) -> list[Schema]:
         """
         Returns a list of objects
@@ -113,6 +235,344 @@ class BaseRepository(Generic[Schema, Model], ABC):
             for model in self._query(session, **kwargs).all()
         ]
 
+    def get_many_by_ids(
+        self, session: Session, ids: Sequence[UUID]
+    ) -> LookupSchema[Schema]:
+        """
+        Returns objects of `ids` in their order, looked up with one
+        `= ANY(:ids)` query whatever their count, duplicates are returned once
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return LookupSchema[self.schema](items=[], missing=[])
+        found = {
+            model.id: model
+            for model in self._query(session).filter(
+                self.model.id
+                == any_(bindparam("ids", ids, type_=ARRAY(self.model.id.type)))
+            )
+        }
+        return LookupSchema[self.schema](
+            items=[
+                self._create_schema_and_assign_model(found[id_])
+                for id_ in ids
+                if id_ in found
+            ],
+            missing=[id_ for id_ in ids if id_ not in found],
+        )
+
+    def _encode_cursor(self, values: tuple) -> str:
+        return base64.urlsafe_b64encode(
+            json.dumps(to_jsonable_python(values)).encode()
+        ).decode()
+
+    @cached_property
+    def _cursor_adapter(self) -> TypeAdapter:
+        return TypeAdapter(
+            tuple[
+                tuple(
+                    getattr(self.model, key).type.python_type for key in self.page_keys
+                )
+            ]
+        )
+
+    def _decode_cursor(self, cursor: str) -> tuple:
+        try:
+            return self._cursor_adapter.validate_json(base64.urlsafe_b64decode(cursor))
+        # Bad base64 or JSON, values of the wrong type and non-ASCII text
+        except ValueError as exc:
+            raise InvalidCursorException("Invalid cursor") from exc
+
+    def _seek(self, query: Query | Select, *, limit: int, cursor: str | None):
+        """
+        Sort a query by `page_keys` and keep rows after `cursor`, one more
+        than `limit` to know whether there is a next page
+
+        Rows are sought with a row comparison on the sort keys instead of an
+        OFFSET, the cost of a page does not depend on how deep it is
+        """
+        keys = [getattr(self.model, key) for key in self.page_keys]
+        if cursor is not None:
+            values = self._decode_cursor(cursor)
+            # The leading key alone lets any index starting with it be used
+            query = query.filter(keys[0] >= values[0], tuple_(*keys) > tuple_(*values))
+        return query.order_by(*keys).limit(limit + 1)
+
+    @lru_cache(maxsize=128)
+    def _projection(
+        self,
+        fields: tuple[str, ...] | None = None,
+        expand: tuple[str, ...] | None = None,
+    ) -> _Projection:
+        """
+        Columns to select for `projection`, a field typed with a dataclass is
+        read from the many-to-one relationship of the same name
+
+        With `fields` or `expand` rows are built as dicts of the requested
+        fields, foreign keys of relationships can be requested too, and only
+        relationships in `expand` are joined
+        """
+        hints = get_type_hints(self.projection)
+        scalars, nested = [], {}
+        for field in dataclasses.fields(self.projection):
+            if dataclasses.is_dataclass(hints[field.name]):
+                nested[field.name] = hints[field.name]
+            else:
+                scalars.append(field.name)
+        if fields is None and expand is None:
+            return self._dataclass_projection(nested)
+
+        requested = list(dict.fromkeys(scalars if fields is None else fields))
+        foreign_keys = [
+            column.key
+            for name in nested
+            for column in getattr(self.model, name).property.local_columns
+        ]
+        unknown = set(requested) - {*scalars, *foreign_keys}
+        unknown |= set(expand or ()) - set(nested)
+        if unknown:
+            raise InvalidFieldsException(f"Unknown fields {', '.join(sorted(unknown))}")
+
+        columns = [getattr(self.model, name) for name in requested]
+        joins, slices = [], []
+        for name in dict.fromkeys(expand or ()):
+            relationship = getattr(self.model, name)
+            target = relationship.property.mapper.class_
+            names = [field.name for field in dataclasses.fields(nested[name])]
+            slices.append((name, names, len(columns)))
+            columns.extend(getattr(target, field) for field in names)
+            joins.append(relationship)
+        # Page keys are selected for the cursor even when not requested
+        keys = []
+        for key in self.page_keys:
+            if key not in requested:
+                columns.append(getattr(self.model, key))
+            keys.append(requested.index(key) if key in requested else len(columns) - 1)
+
+        def build(row: Row) -> dict:
+            item = dict(zip(requested, row))
+            for name, names, start in slices:
+                item[name] = dict(zip(names, row[start : start + len(names)]))
+            return item
+
+        return _Projection(columns, joins, build, keys)
+
+    def _dataclass_projection(self, nested: dict[str, type]) -> _Projection:
+        columns, joins, slices = [], [], []
+        for field in dataclasses.fields(self.projection):
+            start = len(columns)
+            if field.name in nested:
+                relationship = getattr(self.model, field.name)
+                target = relationship.property.mapper.class_
+                columns.extend(
+                    getattr(target, f.name)
+                    for f in dataclasses.fields(nested[field.name])
+                )
+                joins.append(relationship)
+                slices.append((nested[field.name], start, len(columns)))
+            else:
+                columns.append(getattr(self.model, field.name))
+                slices.append((None, start, start + 1))
+        names = [field.name for field in dataclasses.fields(self.projection)]
+        keys = [slices[names.index(key)][1] for key in self.page_keys]
+
+        projection = self.projection
+        if not joins:
+            return _Projection(columns, joins, lambda row: projection(*row), keys)
+        return _Projection(
+            columns,
+            joins,
+            lambda row: projection(
+                *[
+                    row[start] if nested is None else nested(*row[start:end])
+                    for nested, start, end in slices
+                ]
+            ),
+            keys,
+        )
+
+    def _select(  # pylint:disable=too-many-arguments
+        self,
+        projection: _Projection,
+        *_,
+        gt: FilterDef | None = None,
+        ge: FilterDef | None = None,
+        lt: FilterDef | None = None,
+        le: FilterDef | None = None,
+        ne: FilterDef | None = None,
+        eq: FilterDef | None = None,
+        order_by: OrderByDef | None = None,
+        **kwargs,
+    ) -> Select:
+        """
+        Counterpart of `_query` selecting the columns of a projection
+        """
+        eq = eq or {}
+        eq.update(kwargs)
+        query = select(*projection.columns)
+        for relationship in projection.joins:
+            query = query.join(relationship)
+        query = self._setup_filters(query, gt=gt, ge=ge, lt=lt, le=le, ne=ne, eq=eq)
+        query = self._setup_order_by(query, **(order_by or {}))
+        return query
+
+    def _project(
+        self, session: Session, projection: _Projection, query: Select
+    ) -> list:
+        build = projection.build
+        return [build(row) for row in session.execute(query)]
+
+    def _project_page(  # pylint:disable=too-many-arguments
+        self,
+        session: Session,
+        projection: _Projection,
+        query: Select,
+        *,
+        limit: int = PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> PageSchema:
+        rows = session.execute(self._seek(query, limit=limit, cursor=cursor)).all()
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = self._encode_cursor(
+                tuple(rows[limit - 1][key] for key in projection.keys)
+            )
+        build = projection.build
+        # Items are built from trusted rows, validating them again is wasted
+        return PageSchema.model_construct(
+            items=[build(row) for row in rows[:limit]], next_cursor=next_cursor
+        )
+
+    def project_many(
+        self,
+        session: Session,
+        *_,
+        fields: Sequence[str] | None = None,
+        expand: Sequence[str] | None = None,
+        **kwargs,
+    ) -> list:
+        """
+        Returns a list of read only `projection` objects, filtered like
+        `get_many`, or dicts of `fields` and `expand` relationships
+
+        Only the needed columns are selected and no ORM object nor schema is
+        built, for reads that are only serialized
+        """
+        projection = self._sparse_projection(fields, expand)
+        return self._project(session, projection, self._select(projection, **kwargs))
+
+    def project_page(  # pylint:disable=too-many-arguments
+        self,
+        session: Session,
+        *_,
+        limit: int = PAGE_SIZE,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+        expand: Sequence[str] | None = None,
+        **kwargs,
+    ) -> PageSchema:
+        """
+        Returns a page of `projection` objects, filtered like `get_many`
+        """
+        projection = self._sparse_projection(fields, expand)
+        return self._project_page(
+            session,
+            projection,
+            self._select(projection, **kwargs),
+            limit=limit,
+            cursor=cursor,
+        )
+
+    def page_version(  # pylint:disable=too-many-arguments
+        self,
+        session: Session,
+        *_,
+        limit: int = PAGE_SIZE,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+        expand: Sequence[str] | None = None,
+        **kwargs,
+    ) -> str:
+        """
+        Version of the page `project_page` returns for the same arguments,
+        read without loading the page
+        """
+        projection = self._sparse_projection(fields, expand)
+        return self._page_version(
+            session,
+            projection,
+            self._select(projection, **kwargs),
+            limit=limit,
+            cursor=cursor,
+        )
+
+    def _version(self, session: Session, query: Select) -> str | None:
+        """
+        Digest of the versions `query` selects, None without rows
+
+        Versions are unique across rows and writes, the digest changes with
+        any row written, added or removed, unlike their maximum and count
+        when removing a row brings an older one in a page
+
+        The digest is of the set of versions, aggregated sorted by their text
+        so it does not depend on the order rows are read in, the order of a
+        page only changes with a write, which changes the set
+        """
+        rows = query.subquery()
+        version = func.concat_ws(".", *rows.c)
+        return session.scalar(
+            select(
+                func.md5(
+                    func.string_agg(
+                        version, aggregate_order_by(literal_column("','"), version)
+                    )
+                )
+            ).select_from(rows)
+        )
+
+    def _page_version(  # pylint:disable=too-many-arguments
+        self,
+        session: Session,
+        projection: _Projection,
+        query: Select,
+        *,
+        limit: int,
+        cursor: str | None,
+    ) -> str:
+        """
+        Version of the rows of a page and of the relationships it joins
+        """
+        versions = [
+            self.model.version,
+            *(join.property.mapper.class_.version for join in projection.joins),
+        ]
+        query = query.with_only_columns(*versions, maintain_column_froms=True)
+        return (
+            self._version(session, self._seek(query, limit=limit, cursor=cursor)) or ""
+        )
+
+    def _sparse_projection(
+        self, fields: Sequence[str] | None, expand: Sequence[str] | None
+    ) -> _Projection:
+        return self._projection(
+            None if fields is None else tuple(fields),
+            None if expand is None else tuple(expand),
+        )
+
+    def refresh(self, session: Session, schema_in: Schema) -> Schema | None:
+        """
+        Reload an object from db, None if it was deleted meanwhile
+        """
+        model = session.get(
+            self.model,
+            schema_in.id,
+            options=self._load_options(),
+            populate_existing=True,
+        )
+        if model is None:
+            return None
+        return self._create_schema_and_assign_model(model)
+
     @abstractmethod
     def create(
         self,
@@ -126,6 +586,42 @@ class BaseRepository(Generic[Schema, Model], ABC):
         insert_schema = self.insert_schema(**schema_in.model_dump(), **kwargs)
         return self._create_or_update(session, insert_schema)
 
+    @cached_property
+    def _insert_adapter(self) -> TypeAdapter:
+        return TypeAdapter(list[self.insert_schema])
+
+    def bulk_create(
+        self, session: Session, schemas_in: Sequence[BaseSchema], **kwargs
+    ) -> list[Schema]:
+        """
+        Create new objects in DB, returned in the order of `schemas_in`
+
+        The list is validated in one pass and rows are inserted with
+        multi-row `INSERT ... RETURNING` statements, without a flush of one
+        object at a time
+        """
+        if not schemas_in:
+            return []
+        rows = self._insert_adapter.dump_python(
+            self._insert_adapter.validate_python(
+                [{**schema_in.model_dump(), **kwargs} for schema_in in schemas_in]
+            )
+        )
+        models = session.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            rows,
+        ).all()
+        # Objects just inserted have no children yet, no need to load them
+        collections = [
+            relationship.key
+            for relationship in self.model.__mapper__.relationships
+            if relationship.uselist
+        ]
+        for model in models:
+            for key in collections:
+                attributes.set_committed_value(model, key, [])
+        return [self._create_schema_and_assign_model(model) for model in models]
+
     def update(self, session: Session, schema_in: Schema):
         """
         Update an object in DB
@@ -135,10 +631,9 @@ class BaseRepository(Generic[Schema, Model], ABC):
         for key in self.update_schema.model_fields:
             setattr(model, key, getattr(schema_in, key))
 
-        return self._create_or_update(
-            session,
-            model_in=model,
-        )
+        if self.cache is not None:
+            invalidate(session, self.cache, [schema_in.id])
+        return self._create_or_update(session, model_in=model)
 
     def _create_or_update(
         self,
@@ -150,6 +645,8 @@ class BaseRepository(Generic[Schema, Model], ABC):
         """
         Update or insert object in DB
         Should not directly be called in client code
+
+        Changes are only flushed, whoever opened the session commits
         """
         model = (
             self.model(**schema_in.model_dump()) if schema_in is not None else model_in
@@ -157,7 +654,7 @@ class BaseRepository(Generic[Schema, Model], ABC):
         if model is None:
             raise ValueError("Neither a model nor a schema were provided")
         session.add(model)
-        session.commit()
+        session.flush()
         return self._create_schema_and_assign_model(model)
 
     def delete(self, session: Session, schema_in: Schema):
@@ -165,4 +662,46 @@ class BaseRepository(Generic[Schema, Model], ABC):
         Delete object from db
         """
         session.delete(schema_in._model)  # pylint:disable=protected-access
-        session.commit()
+        session.flush()
+        if self.cache is not None:
+            invalidate(session, self.cache, [schema_in.id])
+
+    def delete_many(self, session: Session, schemas_in: Sequence[Schema]):
+        """
+        Delete objects from db in one statement
+        """
+        if not schemas_in:
+            return
+        ids = [schema_in.id for schema_in in schemas_in]
+        session.execute(delete(self.model).where(self.model.id.in_(ids)))
+        if self.cache is not None:
+            invalidate(session, self.cache, ids)
+
+
+Repository = TypeVar("Repository")
+
+
+class AsyncRepository(Generic[Repository]):
+    """
+    Asyncio variant of a repository, every method is awaited with an
+    `AsyncSession` in place of the `Session`
+
+    Methods run as they are on the sync session behind the `AsyncSession`,
+    SQLAlchemy switches to the event loop on each round trip to the database,
+    other attributes such as `model` or `cache` are those of the repository
+    """
+
+    def __init__(self, repository: Repository):
+        self.repository = repository
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self.repository, name)
+        if not inspect.ismethod(method):
+            return method
+
+        @wraps(method)
+        async def run(session: AsyncSession, *args, **kwargs):
+            return await session.run_sync(method, *args, **kwargs)
+
+        setattr(self, name, run)
+        return run
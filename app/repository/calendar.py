@@ -0,0 +1,89 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import select
+
+from ..model.calendar import CalendarModel, HolidayModel
+from ..repository.base import AsyncRepository, BaseRepository
+from ..schema.calendar import (
+    CalendarCreateSchema,
+    CalendarSchema,
+    CalendarUpdateSchema,
+    HolidayCreateSchema,
+    HolidayInsertSchema,
+    HolidaySchema,
+)
+
+
+__all__ = (
+    "AsyncCalendarRepository",
+    "AsyncHolidayRepository",
+    "CalendarRepository",
+    "HolidayRepository",
+)
+
+
+class _CalendarRepository(BaseRepository[CalendarSchema, CalendarModel]):
+    """
+    Calendar repository
+    """
+
+    def get_by_id(self, session, calendar_id: UUID):
+        """
+        Get Calendar by id
+        """
+        return self.get(session, id=calendar_id)
+
+    def create(
+        self,
+        session,
+        schema_in: CalendarCreateSchema,
+        **kwargs,
+    ):
+        return super().create(session, schema_in, **kwargs)
+
+
+class _HolidayRepository(BaseRepository[HolidaySchema, HolidayModel]):
+    """
+    Holiday repository
+    """
+
+    def get_by_id_calendar_id(self, session, holiday_id: UUID, calendar_id: UUID):
+        """
+        Get Holiday by ID and calendar ID
+        """
+        return self.get(session, id=holiday_id, calendar_id=calendar_id)
+
+    def get_days(self, session, calendar_id: UUID) -> list[date]:
+        """
+        Get only the days of all holidays of a calendar
+        """
+        return session.scalars(
+            select(self.model.day).where(self.model.calendar_id == calendar_id)
+        ).all()
+
+    def create(  # pylint:disable=arguments-differ,arguments-renamed
+        self,
+        session,
+        calendar_id: UUID,
+        schema_in: HolidayCreateSchema,
+    ):
+        return super().create(session, schema_in, calendar_id=calendar_id)
+
+
+CalendarRepository = _CalendarRepository(
+    model=CalendarModel,
+    schema=CalendarSchema,
+    insert_schema=CalendarCreateSchema,
+    update_schema=CalendarUpdateSchema,
+    load={"holidays": "selectin"},
+)
+
+HolidayRepository = _HolidayRepository(
+    model=HolidayModel,
+    schema=HolidaySchema,
+    insert_schema=HolidayInsertSchema,
+)
+
+AsyncCalendarRepository = AsyncRepository(CalendarRepository)
+AsyncHolidayRepository = AsyncRepository(HolidayRepository)
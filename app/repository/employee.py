@@ -1,11 +1,21 @@
+from collections.abc import Collection, Sequence
 from uuid import UUID
 
+from sqlalchemy import ColumnElement, Row, Text, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from ..db.cache import IdentityCache, invalidate
 from ..model import EmployeeModel
-from ..repository.base import BaseRepository
+from ..repository.base import AsyncRepository, BaseRepository
+from ..repository.team import TeamRepository
 from ..schema.employee import EmployeeCreateSchema, EmployeeSchema, EmployeeUpdateSchema
+from ..schema.projection import EmployeeProjection
 
 
-__all__ = ("EmployeeRepository",)
+__all__ = (
+    "AsyncEmployeeRepository",
+    "EmployeeRepository",
+)
 
 
 class _EmployeeRepository(BaseRepository[EmployeeSchema, EmployeeModel]):
@@ -19,17 +29,133 @@ class _EmployeeRepository(BaseRepository[EmployeeSchema, EmployeeModel]):
         """
         return self.get(session, id=employee_id)
 
+    def _lock_key(self, key: str | ColumnElement[str]) -> ColumnElement[int]:
+        return func.hashtextextended(key, 0)
+
+    def lock(self, session, employee_id: UUID):
+        """
+        Wait for other transactions writing vacations of an employee, locks
+        are held until the end of the transaction
+
+        Writes for other employees are not blocked, unlike SERIALIZABLE, but
+        wait for `lock_all` holders
+        """
+        session.execute(
+            select(
+                func.pg_advisory_xact_lock_shared(
+                    self._lock_key(self.model.__tablename__)
+                ),
+                func.pg_advisory_xact_lock(self._lock_key(str(employee_id))),
+            )
+        )
+
+    def lock_many(self, session, employee_ids: Sequence[UUID]):
+        """
+        `lock` many employees in one statement, in the order of
+        `employee_ids`, which callers sort so that two of them cannot wait
+        for each other
+        """
+        keys = func.unnest(
+            bindparam(
+                "keys", [str(employee_id) for employee_id in employee_ids], ARRAY(Text)
+            )
+        )
+        session.execute(
+            select(
+                func.pg_advisory_xact_lock_shared(
+                    self._lock_key(self.model.__tablename__)
+                )
+            )
+        )
+        session.execute(select(func.pg_advisory_xact_lock(self._lock_key(keys))))
+
+    def lock_all(self, session):
+        """
+        Wait for transactions writing vacations of any employee and block new
+        ones until the end of the transaction, for bulk writes
+        """
+        session.execute(
+            select(func.pg_advisory_xact_lock(self._lock_key(self.model.__tablename__)))
+        )
+
+    def get_ids(
+        self,
+        session,
+        *,
+        after: UUID | None = None,
+        limit: int,
+        calendar_id: UUID | None = None,
+    ) -> list[UUID]:
+        """
+        Get employee IDs, ordered, in pages of `limit` starting after `after`,
+        only those following `calendar_id` when given
+        """
+        query = select(self.model.id).order_by(self.model.id).limit(limit)
+        if after is not None:
+            query = query.where(self.model.id > after)
+        if calendar_id is not None:
+            query = query.where(self.model.calendar_id == calendar_id)
+        return session.scalars(query).all()
+
+    def get_work_schedules(
+        self,
+        session,
+        employee_ids: Collection[UUID] | None = None,
+        *,
+        team_id: UUID | None = None,
+    ) -> list[Row]:
+        """
+        Get `(id, work_schedule, calendar_id)` rows for some employees,
+        all of them if `employee_ids` is None, only those of `team_id` when
+        given
+        """
+        query = select(
+            self.model.id,
+            self.model.work_schedule,
+            self.model.calendar_id,
+        )
+        if employee_ids is not None:
+            query = query.where(self.model.id.in_(employee_ids))
+        if team_id is not None:
+            query = query.where(self.model.team_id == team_id)
+        return session.execute(query).all()
+
+    def _invalidate_teams(self, session, team_ids: Collection[UUID]):
+        # Teams are cached with their employees
+        invalidate(session, TeamRepository.cache, team_ids)
+
     def create(
         self,
         session,
         schema_in: EmployeeCreateSchema,
         **kwargs,
     ):
-        return super().create(session, schema_in, **kwargs)
+        employee = super().create(session, schema_in, **kwargs)
+        self._invalidate_teams(session, [employee.team_id])
+        return employee
+
+    def bulk_create(
+        self, session, schemas_in: Sequence[EmployeeCreateSchema], **kwargs
+    ) -> list[EmployeeSchema]:
+        employees = super().bulk_create(session, schemas_in, **kwargs)
+        self._invalidate_teams(session, {employee.team_id for employee in employees})
+        return employees
+
+    def update(self, session, schema_in: EmployeeSchema):
+        previous_team_id = schema_in._model.team_id  # pylint:disable=protected-access
+        employee = super().update(session, schema_in)
+        self._invalidate_teams(session, {previous_team_id, employee.team_id})
+        return employee
 
 
 EmployeeRepository = _EmployeeRepository(
     model=EmployeeModel,
     schema=EmployeeSchema,
+    insert_schema=EmployeeCreateSchema,
     update_schema=EmployeeUpdateSchema,
+    load={"team": "raise", "calendar": "raise"},
+    projection=EmployeeProjection,
+    cache=IdentityCache("employee"),
 )
+
+AsyncEmployeeRepository = AsyncRepository(EmployeeRepository)
@@ -0,0 +1,545 @@
+import io
+from collections.abc import Collection, Iterable, Iterator, Mapping
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    Integer,
+    MetaData,
+    Row,
+    SmallInteger,
+    String,
+    Table,
+    and_,
+    any_,
+    bindparam,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    null,
+    or_,
+    select,
+    text,
+    tuple_,
+    union,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, ENUM, Insert, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from ..model.base import CustomUUID
+from ..model.calendar import CalendarModel
+from ..model.employee import EmployeeModel
+from ..model.team import TeamModel
+from ..model.vacation import VacationModel, VacationType
+from ..schema.imports import ImportKind
+
+
+__all__ = ("ImportRepository",)
+
+
+# Staging tables only live for the import transaction, they are kept out of
+# the models metadata so migrations never see them
+_metadata = MetaData()
+
+
+def _staging_table(name: str, *columns: Column) -> Table:
+    return Table(
+        f"import_{name}",
+        _metadata,
+        Column("line", BigInteger, nullable=False),
+        *columns,
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+_vacation_type = ENUM(VacationType, name="vacationtype", create_type=False)
+
+_STAGING = {
+    ImportKind.TEAM: _staging_table(
+        "team",
+        Column("id", CustomUUID(as_uuid=True)),
+        Column("name", String),
+    ),
+    ImportKind.EMPLOYEE: _staging_table(
+        "employee",
+        Column("id", CustomUUID(as_uuid=True)),
+        Column("first_name", String),
+        Column("last_name", String),
+        Column("team_id", CustomUUID(as_uuid=True)),
+        Column("calendar_id", CustomUUID(as_uuid=True)),
+        Column("work_schedule", SmallInteger),
+    ),
+    ImportKind.VACATION: _staging_table(
+        "vacation",
+        Column("employee_id", CustomUUID(as_uuid=True)),
+        Column("start_date", Date),
+        Column("end_date", Date),
+        Column("type", _vacation_type),
+    ),
+}
+
+# Merged vacation periods of one import, `vacation_id` is the vacation kept
+# for the period and `created` tells whether it has to be inserted
+_vacation_island = Table(
+    "import_vacation_island",
+    _metadata,
+    Column("employee_id", CustomUUID(as_uuid=True)),
+    Column("type", _vacation_type),
+    Column("start_date", Date),
+    Column("end_date", Date),
+    Column("vacation_ids", ARRAY(CustomUUID(as_uuid=True))),
+    Column("vacation_id", CustomUUID(as_uuid=True)),
+    Column("created", Boolean, nullable=False, server_default="false"),
+    Column("total_work_days", Integer, nullable=False, server_default="0"),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value: Any) -> str:
+    """
+    Value in `COPY` text format
+    """
+    if value is None:
+        return "\\N"
+    # Enums are stored by name
+    if isinstance(value, Enum):
+        return value.name
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def _value_columns(table: Table) -> list[Column]:
+    return [column for column in table.c if column.name != "line"]
+
+
+class _ImportRepository:
+    """
+    Bulk import repository
+
+    Rows are copied into temporary staging tables then merged into the model
+    tables with set-based statements, everything in the caller transaction
+    """
+
+    def create_staging(self, session: Session, kind: ImportKind):
+        """
+        Create staging table of an import, dropped on commit
+        """
+        _STAGING[kind].create(session.connection())
+
+    def copy(
+        self,
+        session: Session,
+        kind: ImportKind,
+        rows: Iterable[tuple[int, Mapping[str, Any]]],
+    ):
+        """
+        Load `(line, values)` rows in staging table with `COPY`
+        """
+        table = _STAGING[kind]
+        value_columns = _value_columns(table)
+        buffer = io.StringIO()
+        for line, values in rows:
+            row = (line, *(values[column.name] for column in value_columns))
+            buffer.write("\t".join(map(_copy_value, row)) + "\n")
+        buffer.seek(0)
+
+        columns = ", ".join(column.name for column in table.c)
+        with session.connection().connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table.name} ({columns}) FROM STDIN",
+                buffer,
+            )
+
+    def analyze_staging(self, session: Session, kind: ImportKind):
+        """
+        Collect staging table statistics, autovacuum never sees temporary
+        tables and the merge plans depend on them
+        """
+        session.execute(text(f"ANALYZE {_STAGING[kind].name}"))
+
+    def _reject(
+        self, session: Session, table: Table, criteria, error: str, *, limit: int
+    ) -> tuple[int, list[tuple[int, str]]]:
+        lines = session.scalars(
+            select(table.c.line).where(criteria).order_by(table.c.line).limit(limit)
+        ).all()
+        count = session.execute(delete(table).where(criteria)).rowcount
+        return count, [(line, error) for line in lines]
+
+    def reject_unknown_references(
+        self,
+        session: Session,
+        kind: ImportKind,
+        *,
+        limit: int,
+    ) -> Iterator[tuple[int, list[tuple[int, str]]]]:
+        """
+        Remove staged rows referencing missing objects
+
+        Yields for each reference the number of rows removed and the line of
+        the first `limit` of them along with an error message
+        """
+        table = _STAGING[kind]
+        if kind == ImportKind.EMPLOYEE:
+            references = (
+                (table.c.team_id, TeamModel.id, "Unknown team"),
+                (table.c.calendar_id, CalendarModel.id, "Unknown calendar"),
+            )
+        elif kind == ImportKind.VACATION:
+            references = ((table.c.employee_id, EmployeeModel.id, "Unknown employee"),)
+        else:
+            references = ()
+        for column, referenced, error in references:
+            yield self._reject(
+                session,
+                table,
+                and_(column.is_not(None), ~exists().where(referenced == column)),
+                error,
+                limit=limit,
+            )
+
+    def reject_bridging_types(
+        self, session: Session, *, limit: int
+    ) -> tuple[int, list[tuple[int, str]]]:
+        """
+        Remove staged vacations overlapping or touching vacations of more than
+        one type, existing or staged, the rule `new_vacation` enforces
+
+        Returns the number of rows removed and the line of the first `limit`
+        of them along with an error message
+        """
+        staged = _STAGING[ImportKind.VACATION]
+        other = staged.alias("other")
+        vacation = VacationModel.__table__
+        types = union(
+            select(vacation.c.type)
+            .where(
+                vacation.c.employee_id == staged.c.employee_id,
+                # Widened by a day to also catch adjacent vacations
+                vacation.c.period.overlaps(
+                    func.daterange(staged.c.start_date - 1, staged.c.end_date + 1, "[]")
+                ),
+            )
+            .correlate(staged),
+            select(other.c.type)
+            .where(
+                other.c.employee_id == staged.c.employee_id,
+                other.c.line != staged.c.line,
+                other.c.start_date <= staged.c.end_date + 1,
+                other.c.end_date >= staged.c.start_date - 1,
+            )
+            .correlate(staged),
+        ).subquery()
+        return self._reject(
+            session,
+            staged,
+            select(func.count()).select_from(types).scalar_subquery() > 1,
+            "Bridging vacations of different types",
+            limit=limit,
+        )
+
+    def _assign_ids(self, session: Session, table: Table):
+        session.execute(
+            update(table).where(table.c.id.is_(None)).values(id=func.gen_random_uuid())
+        )
+
+    def _upsert_statement(self, session: Session, kind: ImportKind, model) -> Insert:
+        """
+        Statement inserting staged rows or updating the existing ones with the
+        same ID, the last line wins when an ID is staged many times
+        """
+        table = _STAGING[kind]
+        self._assign_ids(session, table)
+        columns = [column.name for column in _value_columns(table)]
+        statement = pg_insert(model.__table__).from_select(
+            columns,
+            select(*_value_columns(table))
+            .distinct(table.c.id)
+            .order_by(table.c.id, table.c.line.desc()),
+        )
+        return statement.on_conflict_do_update(
+            index_elements=["id"],
+            set_={
+                column: statement.excluded[column]
+                for column in columns
+                if column != "id"
+            },
+        )
+
+    def merge_teams(self, session: Session) -> int:
+        """
+        Upsert staged teams, return the number of teams written
+        """
+        return session.execute(
+            self._upsert_statement(session, ImportKind.TEAM, TeamModel)
+        ).rowcount
+
+    def merge_employees(self, session: Session) -> tuple[int, list[UUID]]:
+        """
+        Upsert staged employees, return the number of employees written and
+        the IDs of existing ones whose calendar or weekly schedule changed
+        """
+        staged = _STAGING[ImportKind.EMPLOYEE]
+        employee = EmployeeModel.__table__
+        # Read in the snapshot of the upsert, before it
+        previous = (
+            select(employee.c.id, employee.c.calendar_id, employee.c.work_schedule)
+            .where(employee.c.id.in_(select(staged.c.id)))
+            .cte("previous")
+        )
+        written = (
+            self._upsert_statement(session, ImportKind.EMPLOYEE, EmployeeModel)
+            .returning(employee.c.id, employee.c.calendar_id, employee.c.work_schedule)
+            .cte("written")
+        )
+        changed = and_(
+            previous.c.id.is_not(None),
+            tuple_(previous.c.calendar_id, previous.c.work_schedule).is_distinct_from(
+                tuple_(written.c.calendar_id, written.c.work_schedule)
+            ),
+        )
+        count, changed_ids = session.execute(
+            select(
+                func.count(),
+                func.array_agg(aggregate_order_by(written.c.id, written.c.id)).filter(
+                    changed
+                ),
+            ).select_from(written.outerjoin(previous, previous.c.id == written.c.id))
+        ).one()
+        return count, changed_ids or []
+
+    def build_vacation_islands(self, session: Session) -> int:
+        """
+        Merge staged vacations with each other and with existing vacations
+        of the same employee and type they overlap or touch
+
+        Every merged period keeps its earliest existing vacation and is
+        written by `apply_vacation_islands` once its worked days are set
+
+        Return the number of staged vacations merged
+        """
+        staged = _STAGING[ImportKind.VACATION]
+        vacation = VacationModel.__table__
+
+        touching = exists().where(
+            staged.c.employee_id == vacation.c.employee_id,
+            staged.c.type == vacation.c.type,
+            # Widened by a day to also catch adjacent vacations
+            vacation.c.period.overlaps(
+                func.daterange(staged.c.start_date - 1, staged.c.end_date + 1, "[]")
+            ),
+        )
+        periods = (
+            select(
+                vacation.c.id.label("vacation_id"),
+                vacation.c.employee_id,
+                vacation.c.type,
+                vacation.c.start_date,
+                vacation.c.end_date,
+            )
+            .where(touching)
+            .union_all(
+                select(
+                    null().label("vacation_id"),
+                    staged.c.employee_id,
+                    staged.c.type,
+                    staged.c.start_date,
+                    staged.c.end_date,
+                )
+            )
+            .cte("periods")
+        )
+
+        # Gaps and islands, a period starts a new island unless it overlaps
+        # or touches one of the periods before it
+        window = {
+            "partition_by": (periods.c.employee_id, periods.c.type),
+            "order_by": (periods.c.start_date, periods.c.end_date),
+        }
+        previous_end = func.max(periods.c.end_date).over(**window, rows=(None, -1))
+        marked = select(
+            periods,
+            case((periods.c.start_date <= previous_end + 1, 0), else_=1).label(
+                "starts_island"
+            ),
+        ).cte("marked")
+        numbered = select(
+            marked,
+            func.sum(marked.c.starts_island)
+            .over(
+                partition_by=(marked.c.employee_id, marked.c.type),
+                order_by=(marked.c.start_date, marked.c.end_date),
+                rows=(None, 0),
+            )
+            .label("island"),
+        ).cte("numbered")
+
+        island = _vacation_island
+        island.create(session.connection())
+        session.execute(
+            insert(island).from_select(
+                ["employee_id", "type", "start_date", "end_date", "vacation_ids"],
+                select(
+                    numbered.c.employee_id,
+                    numbered.c.type,
+                    func.min(numbered.c.start_date),
+                    func.max(numbered.c.end_date),
+                    func.array_agg(
+                        aggregate_order_by(
+                            numbered.c.vacation_id, numbered.c.start_date
+                        )
+                    ).filter(numbered.c.vacation_id.is_not(None)),
+                ).group_by(numbered.c.employee_id, numbered.c.type, numbered.c.island),
+            )
+        )
+        session.execute(
+            update(island).values(
+                vacation_id=func.coalesce(
+                    island.c.vacation_ids[1], func.gen_random_uuid()
+                ),
+                created=island.c.vacation_ids.is_(None),
+            )
+        )
+        return session.scalar(select(func.count()).select_from(staged))
+
+    def get_island_employee_ids(
+        self,
+        session: Session,
+        *,
+        after: UUID | None = None,
+        limit: int,
+    ) -> list[UUID]:
+        """
+        Get IDs of employees with merged vacations, ordered, in pages of
+        `limit` starting after `after`
+        """
+        island = _vacation_island
+        query = (
+            select(island.c.employee_id)
+            .distinct()
+            .order_by(island.c.employee_id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(island.c.employee_id > after)
+        return session.scalars(query).all()
+
+    def get_island_intervals(
+        self,
+        session: Session,
+        employee_ids: Collection[UUID],
+    ) -> list[Row]:
+        """
+        Get `(id, employee_id, start_date, end_date)` rows of merged vacations
+        of some employees, `id` being the vacation kept
+        """
+        island = _vacation_island
+        return session.execute(
+            select(
+                island.c.vacation_id.label("id"),
+                island.c.employee_id,
+                island.c.start_date,
+                island.c.end_date,
+            ).where(island.c.employee_id.in_(employee_ids))
+        ).all()
+
+    def set_island_workdays(
+        self, session: Session, total_work_days: Mapping[UUID, int]
+    ):
+        """
+        Set worked days of merged vacations by kept vacation ID
+        """
+        if not total_work_days:
+            return
+        island = _vacation_island
+        rows = (
+            func.unnest(
+                bindparam(
+                    "ids",
+                    list(total_work_days),
+                    type_=ARRAY(CustomUUID(as_uuid=True)),
+                ),
+                bindparam("days", list(total_work_days.values()), type_=ARRAY(Integer)),
+            )
+            .table_valued("id", "days")
+            .render_derived()
+        )
+        session.execute(
+            update(island)
+            .where(island.c.vacation_id == rows.c.id)
+            .values(total_work_days=rows.c.days)
+        )
+
+    def apply_vacation_islands(self, session: Session) -> int:
+        """
+        Write merged vacations, existing ones merged in another are deleted
+
+        New vacations without worked day are not inserted, return their number
+        """
+        island = _vacation_island
+        vacation = VacationModel.__table__
+
+        session.execute(
+            delete(vacation).where(
+                vacation.c.id == any_(island.c.vacation_ids),
+                vacation.c.id != island.c.vacation_id,
+            )
+        )
+        session.execute(
+            update(vacation)
+            .where(
+                vacation.c.id == island.c.vacation_id,
+                ~island.c.created,
+                or_(
+                    vacation.c.start_date != island.c.start_date,
+                    vacation.c.end_date != island.c.end_date,
+                    vacation.c.total_work_days != island.c.total_work_days,
+                ),
+            )
+            .values(
+                start_date=island.c.start_date,
+                end_date=island.c.end_date,
+                total_work_days=island.c.total_work_days,
+            )
+        )
+        session.execute(
+            insert(vacation).from_select(
+                [
+                    "id",
+                    "employee_id",
+                    "type",
+                    "start_date",
+                    "end_date",
+                    "total_work_days",
+                ],
+                select(
+                    island.c.vacation_id,
+                    island.c.employee_id,
+                    island.c.type,
+                    island.c.start_date,
+                    island.c.end_date,
+                    island.c.total_work_days,
+                ).where(island.c.created, island.c.total_work_days > 0),
+            )
+        )
+        return session.scalar(
+            select(func.count())
+            .select_from(island)
+            .where(island.c.created, island.c.total_work_days == 0)
+        )
+
+
+ImportRepository = _ImportRepository()
@@ -0,0 +1,77 @@
+from collections.abc import Collection
+from uuid import UUID
+
+from sqlalchemy import Row, select
+
+from ..model.schedule import EmployeeScheduleModel
+from ..repository.base import AsyncRepository, BaseRepository
+from ..schema.schedule import (
+    EmployeeScheduleCreateSchema,
+    EmployeeScheduleInsertSchema,
+    EmployeeScheduleSchema,
+)
+
+
+__all__ = (
+    "AsyncEmployeeScheduleRepository",
+    "EmployeeScheduleRepository",
+)
+
+
+class _EmployeeScheduleRepository(
+    BaseRepository[EmployeeScheduleSchema, EmployeeScheduleModel]
+):
+    """
+    Employee schedule change repository
+    """
+
+    def get_by_employee_id(self, session, employee_id: UUID):
+        """
+        Get schedule changes by employee ID
+        """
+        return self.get_many(
+            session,
+            employee_id=employee_id,
+            order_by={"effective_date": "ASC"},
+        )
+
+    def get_by_id_employee_id(self, session, schedule_id: UUID, employee_id: UUID):
+        """
+        Get schedule change by ID and employee ID
+        """
+        return self.get(session, id=schedule_id, employee_id=employee_id)
+
+    def get_changes(
+        self,
+        session,
+        employee_ids: Collection[UUID] | None = None,
+    ) -> list[Row]:
+        """
+        Get `(employee_id, effective_date, work_schedule)` rows of changes
+        for some employees, all of them if `employee_ids` is None
+        """
+        query = select(
+            self.model.employee_id,
+            self.model.effective_date,
+            self.model.work_schedule,
+        )
+        if employee_ids is not None:
+            query = query.where(self.model.employee_id.in_(employee_ids))
+        return session.execute(query).all()
+
+    def create(  # pylint:disable=arguments-differ,arguments-renamed
+        self,
+        session,
+        employee_id: UUID,
+        schema_in: EmployeeScheduleCreateSchema,
+    ):
+        return super().create(session, schema_in, employee_id=employee_id)
+
+
+EmployeeScheduleRepository = _EmployeeScheduleRepository(
+    model=EmployeeScheduleModel,
+    schema=EmployeeScheduleSchema,
+    insert_schema=EmployeeScheduleInsertSchema,
+)
+
+AsyncEmployeeScheduleRepository = AsyncRepository(EmployeeScheduleRepository)
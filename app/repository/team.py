@@ -1,11 +1,19 @@
 from uuid import UUID
 
+from sqlalchemy import select
+
+from ..db.cache import IdentityCache
+from ..model.employee import EmployeeModel
 from ..model.team import TeamModel
-from ..repository.base import BaseRepository
+from ..repository.base import AsyncRepository, BaseRepository
+from ..schema.projection import TeamProjection
 from ..schema.team import TeamCreateSchema, TeamSchema, TeamUpdateSchema
 
 
-__all__ = ("TeamRepository",)
+__all__ = (
+    "AsyncTeamRepository",
+    "TeamRepository",
+)
 
 
 class _TeamRepository(BaseRepository[TeamSchema, TeamModel]):
@@ -19,6 +27,19 @@ class _TeamRepository(BaseRepository[TeamSchema, TeamModel]):
         """
         return self.get(session, id=team_id)
 
+    def get_version(self, session, team_id: UUID) -> str | None:
+        """
+        Version of a team and its employees, None if not found
+        """
+        return self._version(
+            session,
+            select(self.model.version)
+            .where(self.model.id == team_id)
+            .union_all(
+                select(EmployeeModel.version).where(EmployeeModel.team_id == team_id)
+            ),
+        )
+
     def create(
         self,
         session,
@@ -31,5 +52,11 @@ class _TeamRepository(BaseRepository[TeamSchema, TeamModel]):
 TeamRepository = _TeamRepository(
     model=TeamModel,
     schema=TeamSchema,
+    insert_schema=TeamCreateSchema,
     update_schema=TeamUpdateSchema,
+    load={"employees": "selectin"},
+    projection=TeamProjection,
+    cache=IdentityCache("team"),
 )
+
+AsyncTeamRepository = AsyncRepository(TeamRepository)
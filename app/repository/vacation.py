@@ -1,11 +1,30 @@
+from collections.abc import Collection, Mapping, Sequence
 from datetime import date
 from uuid import UUID
 
-from sqlalchemy import or_
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Result,
+    Row,
+    Select,
+    String,
+    bindparam,
+    cast,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, Range
+from sqlalchemy.orm import Query
 
+from ..model.base import CustomUUID
 from ..model.employee import EmployeeModel
 from ..model.vacation import VacationModel, VacationType
-from ..repository.base import BaseRepository
+from ..repository.base import PAGE_SIZE, AsyncRepository, BaseRepository
+from ..schema.page import PageSchema
+from ..schema.projection import VacationProjection
 from ..schema.vacation import (
     VacationCreateSchema,
     VacationInsertSchema,
@@ -14,7 +33,10 @@ from ..schema.vacation import (
 )
 
 
-__all__ = ("VacationRepository",)
+__all__ = (
+    "AsyncVacationRepository",
+    "VacationRepository",
+)
 
 
 class _VacationRepository(BaseRepository[VacationSchema, VacationModel]):
@@ -42,33 +64,301 @@ class _VacationRepository(BaseRepository[VacationSchema, VacationModel]):
         """
         return self.get(session, id=vacation_id, employee_id=employee_id)
 
-    def get_by_query_params(  # pylint:disable=too-many-arguments
+    def query_overlapping(  # pylint:disable=too-many-arguments
+        self,
+        session,
+        employee_id: UUID,
+        start_date: date,
+        end_date: date,
+        *,
+        exclude_id: UUID | None = None,
+    ) -> Query:
+        """
+        Build query of employee vacations overlapping or adjacent to a period,
+        ordered by start date
+
+        Range operators are answered by the GiST index on `(employee_id, period)`
+        """
+        period = Range(start_date, end_date, bounds="[]")
+        query = self._query(
+            session,
+            order_by={"start_date": "ASC"},
+            employee_id=employee_id,
+        ).filter(
+            or_(
+                self.model.period.overlaps(period),
+                self.model.period.adjacent_to(period),
+            )
+        )
+        if exclude_id is not None:
+            query = query.filter(self.model.id != exclude_id)
+        # Vacations loaded before the employee was locked may be stale
+        return query.populate_existing()
+
+    def get_overlapping(  # pylint:disable=too-many-arguments
+        self,
+        session,
+        employee_id: UUID,
+        start_date: date,
+        end_date: date,
+        *,
+        exclude_id: UUID | None = None,
+    ) -> list[VacationSchema]:
+        """
+        Get employee vacations overlapping or adjacent to a period,
+        ordered by start date
+        """
+        query = self.query_overlapping(
+            session, employee_id, start_date, end_date, exclude_id=exclude_id
+        )
+        return [self._create_schema_and_assign_model(model) for model in query.all()]
+
+    def query_by_params(  # pylint:disable=too-many-arguments
         self,
         session,
         start_date: date | None = None,
         end_date: date | None = None,
         type_: VacationType | None = None,
         team_id: UUID | None = None,
-    ) -> list[VacationSchema]:
+    ) -> Query:
         """
-        Get vacation by different query params
+        Build query of vacations overlapping `[start_date, end_date]`
+        filtered by type and team
         """
-        query = self._query(session)
+        query = self._query(session).filter(
+            *self._params_filters(start_date, end_date, type_, team_id)
+        )
+        if team_id is not None:
+            query = query.join(EmployeeModel)
+        return query
+
+    def _params_filters(
+        self,
+        start_date: date | None,
+        end_date: date | None,
+        type_: VacationType | None,
+        team_id: UUID | None,
+    ) -> list[ColumnElement[bool]]:
+        filters = []
         if start_date is not None:
-            query = query.filter(
-                self.model.start_date >= start_date,
-            ).filter(or_(self.model.end_date >= start_date))
+            filters.append(self.model.end_date >= start_date)
         if end_date is not None:
-            query = query.filter(
-                self.model.start_date <= end_date,
-            ).filter(or_(self.model.end_date <= end_date))
+            filters.append(self.model.start_date <= end_date)
         if type_ is not None:
-            query = query.filter(self.model.type == type_)
+            filters.append(self.model.type == type_)
         if team_id is not None:
-            query = query.join(EmployeeModel).filter(EmployeeModel.team_id == team_id)
+            filters.append(EmployeeModel.team_id == team_id)
+        return filters
 
+    def get_by_query_params(  # pylint:disable=too-many-arguments
+        self,
+        session,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        type_: VacationType | None = None,
+        team_id: UUID | None = None,
+    ) -> list[VacationSchema]:
+        """
+        Get vacations overlapping `[start_date, end_date]` filtered by type
+        and team
+        """
+        query = self.query_by_params(
+            session,
+            start_date=start_date,
+            end_date=end_date,
+            type_=type_,
+            team_id=team_id,
+        )
         return [self._create_schema_and_assign_model(model) for model in query.all()]
 
+    def project_page_by_query_params(  # pylint:disable=too-many-arguments
+        self,
+        session,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        type_: VacationType | None = None,
+        team_id: UUID | None = None,
+        *,
+        limit: int = PAGE_SIZE,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+        expand: Sequence[str] | None = None,
+    ) -> PageSchema[VacationProjection]:
+        """
+        Get a page of read only vacations overlapping `[start_date, end_date]`
+        filtered by type and team, ordered by start date
+
+        See `project_many` for `fields` and `expand`
+        """
+        projection = self._sparse_projection(fields, expand)
+        return self._project_page(
+            session,
+            projection,
+            self._params_select(projection, start_date, end_date, type_, team_id),
+            limit=limit,
+            cursor=cursor,
+        )
+
+    def page_version_by_query_params(  # pylint:disable=too-many-arguments
+        self,
+        session,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        type_: VacationType | None = None,
+        team_id: UUID | None = None,
+        *,
+        limit: int = PAGE_SIZE,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+        expand: Sequence[str] | None = None,
+    ) -> str:
+        """
+        Version of the page `project_page_by_query_params` returns for the
+        same arguments, read without loading the page
+        """
+        projection = self._sparse_projection(fields, expand)
+        return self._page_version(
+            session,
+            projection,
+            self._params_select(projection, start_date, end_date, type_, team_id),
+            limit=limit,
+            cursor=cursor,
+        )
+
+    def _params_select(  # pylint:disable=too-many-arguments
+        self,
+        projection,
+        start_date: date | None,
+        end_date: date | None,
+        type_: VacationType | None,
+        team_id: UUID | None,
+    ) -> Select:
+        query = self._select(projection).where(
+            *self._params_filters(start_date, end_date, type_, team_id)
+        )
+        if team_id is not None and not any(
+            join is self.model.employee for join in projection.joins
+        ):
+            query = query.join(EmployeeModel)
+        return query
+
+    def stream_by_query_params(  # pylint:disable=too-many-arguments
+        self,
+        session,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        type_: VacationType | None = None,
+        team_id: UUID | None = None,
+        *,
+        chunk_size: int = 1000,
+    ) -> Result:
+        """
+        Stream vacations overlapping `[start_date, end_date]` filtered by type
+        and team as flat rows with their employee, ordered by start date
+
+        Rows are fetched `chunk_size` at a time from a server-side cursor,
+        iterate `partitions()` to get them a chunk at a time
+        """
+        query = (
+            select(
+                # IDs are only written out, text skips building UUID objects
+                cast(self.model.id, String).label("id"),
+                cast(self.model.employee_id, String).label("employee_id"),
+                EmployeeModel.first_name,
+                EmployeeModel.last_name,
+                cast(EmployeeModel.team_id, String).label("team_id"),
+                self.model.type,
+                self.model.start_date,
+                self.model.end_date,
+                self.model.total_work_days,
+            )
+            .join(EmployeeModel)
+            .where(*self._params_filters(start_date, end_date, type_, team_id))
+            .order_by(self.model.start_date, self.model.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        return session.execute(query)
+
+    def get_team_intervals(
+        self,
+        session,
+        team_id: UUID,
+        start_date: date,
+        end_date: date,
+    ) -> list[Row]:
+        """
+        Get `(employee_id, start_date, end_date)` rows for vacations of a team
+        overlapping `[start_date, end_date]`, ordered by employee and start
+        """
+        return session.execute(
+            select(self.model.employee_id, self.model.start_date, self.model.end_date)
+            .join(EmployeeModel)
+            .where(
+                EmployeeModel.team_id == team_id,
+                self.model.end_date >= start_date,
+                self.model.start_date <= end_date,
+            )
+            .order_by(self.model.employee_id, self.model.start_date)
+        ).all()
+
+    def get_intervals(
+        self,
+        session,
+        employee_ids: Collection[UUID] | None = None,
+        *,
+        day: date | None = None,
+    ) -> list[Row]:
+        """
+        Get `(id, employee_id, type, start_date, end_date, total_work_days)`
+        rows for vacations of some employees, all of them if `employee_ids`
+        is None, only those covering `day` when given
+        """
+        query = select(
+            self.model.id,
+            self.model.employee_id,
+            self.model.type,
+            self.model.start_date,
+            self.model.end_date,
+            self.model.total_work_days,
+        )
+        if employee_ids is not None:
+            query = query.where(self.model.employee_id.in_(employee_ids))
+        if day is not None:
+            query = query.where(
+                self.model.start_date <= day, self.model.end_date >= day
+            )
+        return session.execute(query).all()
+
+    def update_total_work_days(
+        self,
+        session,
+        total_work_days: Mapping[UUID, int],
+    ):
+        """
+        Set `total_work_days` of many vacations by ID in one statement
+        """
+        if not total_work_days:
+            return
+        # Arrays are unnested server side, a single statement whatever the size
+        rows = (
+            func.unnest(
+                bindparam(
+                    "ids",
+                    list(total_work_days),
+                    type_=ARRAY(CustomUUID(as_uuid=True)),
+                ),
+                bindparam("days", list(total_work_days.values()), type_=ARRAY(Integer)),
+            )
+            .table_valued("id", "days")
+            .render_derived()
+        )
+        session.execute(
+            update(self.model)
+            .where(self.model.id == rows.c.id)
+            .values(total_work_days=rows.c.days)
+            .execution_options(synchronize_session=False)
+        )
+
     def create(  # pylint:disable=arguments-differ,arguments-renamed
         self,
         session,
@@ -77,7 +367,10 @@ class _VacationRepository(BaseRepository[VacationSchema, VacationModel]):
         schema_in: VacationCreateSchema,
     ):
         return super().create(
-            session, schema_in, employee_id=employee_id, total_work_days=total_work_days
+            session,
+            schema_in,
+            employee_id=employee_id,
+            total_work_days=total_work_days,
         )
 
 
@@ -86,4 +379,9 @@ VacationRepository = _VacationRepository(
     schema=VacationSchema,
     insert_schema=VacationInsertSchema,
     update_schema=VacationUpdateSchema,
+    load={"employee": "joined"},
+    page_keys=("start_date", "id"),
+    projection=VacationProjection,
 )
+
+AsyncVacationRepository = AsyncRepository(VacationRepository)
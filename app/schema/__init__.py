@@ -1,4 +1,16 @@
+from .availability import *
+from .balance import *
 from .base import *
+from .cache import *
+from .calendar import *
+from .coalesce import *
 from .employee import *
+from .export import *
+from .imports import *
+from .lookup import *
+from .page import *
+from .pool import *
+from .projection import *
+from .schedule import *
 from .team import *
 from .vacation import *
@@ -0,0 +1,22 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+__all__ = ("TeamAvailabilitySchema",)
+
+
+class TeamAvailabilitySchema(BaseModel):
+    """
+    Team headcount per day, columns hold one value per day from
+    `start_date` to `end_date`
+
+    On each day `absent` counts employees on vacation on a day they work and
+    `present` the other employees working that day
+    """
+
+    start_date: date
+    end_date: date
+    employees: int
+    absent: list[int]
+    present: list[int]
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+from ..model.vacation import VacationType
+
+
+__all__ = ("BalanceSchema",)
+
+
+class BalanceSchema(BaseModel):
+    """
+    Worked days taken as vacation in a year for a type
+    """
+
+    year: int
+    type: VacationType
+    days: int
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+__all__ = ("IdentityCacheStatsSchema",)
+
+
+class IdentityCacheStatsSchema(BaseModel):
+    """
+    Usage of an identity cache, counters are since the process started
+    """
+
+    name: str
+    size: int
+    maxsize: int
+    enabled: bool
+    hits: int
+    misses: int
+    invalidations: int
@@ -0,0 +1,67 @@
+from datetime import date
+
+from pydantic import UUID4, BaseModel
+
+from ..model.calendar import CalendarModel, HolidayModel
+from .base import BaseSchema, UpdateSchema
+
+
+__all__ = (
+    "CalendarSchema",
+    "CalendarCreateSchema",
+    "CalendarUpdateSchema",
+    "HolidaySchema",
+    "HolidayCreateSchema",
+    "HolidayInsertSchema",
+)
+
+
+class _HolidayBaseSchema(BaseModel):
+    day: date
+    name: str
+
+
+class HolidaySchema(BaseSchema[HolidayModel], _HolidayBaseSchema):
+    """
+    Holiday schema
+    """
+
+    calendar_id: UUID4
+
+
+class HolidayInsertSchema(_HolidayBaseSchema):
+    """
+    Holiday insert schema
+    """
+
+    calendar_id: UUID4
+
+
+class HolidayCreateSchema(_HolidayBaseSchema):
+    """
+    Holiday creation schema
+    """
+
+
+class _CalendarBaseSchema:
+    name: str
+
+
+class CalendarSchema(BaseSchema[CalendarModel], _CalendarBaseSchema):
+    """
+    Calendar schema
+    """
+
+    holidays: list[HolidaySchema]
+
+
+class CalendarCreateSchema(BaseModel, _CalendarBaseSchema):
+    """
+    Calendar creation schema
+    """
+
+
+class CalendarUpdateSchema(_CalendarBaseSchema, UpdateSchema):
+    """
+    Calendar update schema
+    """
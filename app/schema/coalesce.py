@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+__all__ = ("CoalescingStatsSchema",)
+
+
+class CoalescingStatsSchema(BaseModel):
+    """
+    Usage of a request coalescer, counters are since the process started
+    """
+
+    name: str
+    enabled: bool
+    requests: int
+    loads: int
+    # Requests served by the load of another
+    coalesced: int
+    in_flight: int
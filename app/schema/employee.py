@@ -1,7 +1,8 @@
 from pydantic import UUID4, BaseModel
 
 from ..model.employee import EmployeeModel
-from .base import BaseSchema
+from .base import BaseSchema, UpdateSchema
+from .schedule import WorkScheduleMask
 
 
 __all__ = (
@@ -15,6 +16,8 @@ class _EmployeeBaseSchema:
     first_name: str
     last_name: str
     team_id: UUID4
+    calendar_id: UUID4 | None = None
+    work_schedule: WorkScheduleMask = 0b0011111  # monday to friday
 
 
 class EmployeeSchema(BaseSchema[EmployeeModel], _EmployeeBaseSchema):
@@ -29,7 +32,7 @@ class EmployeeCreateSchema(BaseModel, _EmployeeBaseSchema):
     """
 
 
-class EmployeeUpdateSchema(BaseModel):
+class EmployeeUpdateSchema(UpdateSchema):
     """
     Employee update schema
     """
@@ -37,3 +40,5 @@ class EmployeeUpdateSchema(BaseModel):
     first_name: str = None
     last_name: str = None
     team_id: UUID4 = None
+    calendar_id: UUID4 | None = None
+    work_schedule: WorkScheduleMask = None
@@ -0,0 +1,13 @@
+from enum import StrEnum
+
+
+__all__ = ("ExportFormat",)
+
+
+class ExportFormat(StrEnum):
+    """
+    Export file formats
+    """
+
+    CSV = "csv"
+    NDJSON = "ndjson"
@@ -0,0 +1,94 @@
+from enum import StrEnum
+from typing import Any
+
+from pydantic import UUID4, BaseModel, field_validator
+
+from ..model.vacation import VacationType
+from .employee import EmployeeCreateSchema
+from .team import TeamCreateSchema
+from .vacation import VacationCreateSchema
+
+
+__all__ = (
+    "EmployeeImportSchema",
+    "ImportErrorSchema",
+    "ImportFormat",
+    "ImportKind",
+    "ImportReportSchema",
+    "TeamImportSchema",
+    "VacationImportSchema",
+)
+
+
+class ImportKind(StrEnum):
+    """
+    Objects that can be bulk imported
+    """
+
+    TEAM = "team"
+    EMPLOYEE = "employee"
+    VACATION = "vacation"
+
+
+class ImportFormat(StrEnum):
+    """
+    Bulk import file formats
+    """
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class TeamImportSchema(TeamCreateSchema):
+    """
+    Team import row, an existing team is updated when `id` is given
+    """
+
+    id: UUID4 | None = None
+
+
+class EmployeeImportSchema(EmployeeCreateSchema):
+    """
+    Employee import row, an existing employee is updated when `id` is given
+    """
+
+    id: UUID4 | None = None
+
+
+class VacationImportSchema(VacationCreateSchema):
+    """
+    Vacation import row
+    """
+
+    employee_id: UUID4
+
+    @field_validator("type", mode="before")
+    @classmethod
+    def _type_from_name(cls, v: Any) -> Any:
+        if isinstance(v, str) and v.upper() in VacationType.__members__:
+            return VacationType[v.upper()]
+        return v
+
+
+class ImportErrorSchema(BaseModel):
+    """
+    Rejected import row, `line` is the line number in the imported file
+    """
+
+    line: int
+    error: str
+
+
+class ImportReportSchema(BaseModel):
+    """
+    Outcome of a bulk import
+
+    `error_rows` only holds the first rejected rows, `errors` counts all of them
+    """
+
+    kind: ImportKind
+    rows: int = 0
+    imported: int = 0
+    skipped: int = 0
+    errors: int = 0
+    error_rows: list[ImportErrorSchema] = []
@@ -0,0 +1,19 @@
+from typing import Generic, TypeVar
+
+from pydantic import UUID4, BaseModel
+
+
+__all__ = ("LookupSchema",)
+
+
+Item = TypeVar("Item")
+
+
+class LookupSchema(BaseModel, Generic[Item]):
+    """
+    Objects found by ID in the order they were asked for, IDs not found are
+    in `missing`
+    """
+
+    items: list[Item]
+    missing: list[UUID4]
@@ -0,0 +1,19 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+
+__all__ = ("PageSchema",)
+
+
+Item = TypeVar("Item")
+
+
+class PageSchema(BaseModel, Generic[Item]):
+    """
+    Page of a list, pass `next_cursor` back to get the following page,
+    it is None on the last page
+    """
+
+    items: list[Item]
+    next_cursor: str | None = None
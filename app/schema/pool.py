@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+
+__all__ = ("PoolStatsSchema",)
+
+
+class PoolStatsSchema(BaseModel):
+    """
+    Usage of a database connection pool, counters and peaks are since the
+    process started
+    """
+
+    name: str
+    size: int
+    max_overflow: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds: float
+    max_wait_seconds: float
+    peak_checked_out: int
+    peak_overflow: int
@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from datetime import date
+from uuid import UUID
+
+from ..model.vacation import VacationType
+
+
+__all__ = (
+    "EmployeeProjection",
+    "TeamProjection",
+    "VacationProjection",
+)
+
+
+@dataclass(slots=True)
+class EmployeeProjection:
+    """
+    Read only employee, serializes like `EmployeeSchema`
+    """
+
+    first_name: str
+    last_name: str
+    team_id: UUID
+    calendar_id: UUID | None
+    work_schedule: int
+    id: UUID
+
+
+@dataclass(slots=True)
+class TeamProjection:
+    """
+    Read only team without its employees
+    """
+
+    name: str
+    id: UUID
+
+
+@dataclass(slots=True)
+class VacationProjection:
+    """
+    Read only vacation, serializes like `VacationSchema`
+    """
+
+    start_date: date
+    end_date: date
+    type: VacationType
+    id: UUID
+    employee: EmployeeProjection
+    total_work_days: int
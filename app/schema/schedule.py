@@ -0,0 +1,48 @@
+from datetime import date
+from typing import Annotated
+
+from pydantic import UUID4, BaseModel, Field
+
+from ..model.schedule import EmployeeScheduleModel
+from .base import BaseSchema
+
+
+__all__ = (
+    "EmployeeScheduleSchema",
+    "EmployeeScheduleCreateSchema",
+    "EmployeeScheduleInsertSchema",
+    "WorkScheduleMask",
+)
+
+
+# Weekly schedule bitmask, bit `n` set when weekday `n` is worked
+WorkScheduleMask = Annotated[int, Field(ge=1, le=0b1111111)]
+
+
+class _EmployeeScheduleBaseSchema(BaseModel):
+    effective_date: date
+    work_schedule: WorkScheduleMask
+
+
+class EmployeeScheduleSchema(
+    BaseSchema[EmployeeScheduleModel], _EmployeeScheduleBaseSchema
+):
+    """
+    Employee schedule change schema
+    """
+
+    employee_id: UUID4
+
+
+class EmployeeScheduleInsertSchema(_EmployeeScheduleBaseSchema):
+    """
+    Employee schedule change insert schema
+    """
+
+    employee_id: UUID4
+
+
+class EmployeeScheduleCreateSchema(_EmployeeScheduleBaseSchema):
+    """
+    Employee schedule change creation schema
+    """
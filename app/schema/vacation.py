@@ -10,6 +10,7 @@ from .employee import EmployeeSchema
 
 __all__ = (
     "VacationSchema",
+    "VacationBatchResultSchema",
     "VacationCreateSchema",
     "VacationInsertSchema",
 )
@@ -45,6 +46,16 @@ class VacationSchema(BaseSchema[VacationModel], _VacationBaseSchema):
     total_work_days: int
 
 
+class VacationBatchResultSchema(BaseModel):
+    """
+    Outcome of one vacation of a batch, either the vacation it ended up in
+    or the reason it was rejected
+    """
+
+    vacation: VacationSchema | None = None
+    error: str | None = None
+
+
 class VacationInsertSchema(_VacationBaseSchema):
     """
     Vacation insert schema
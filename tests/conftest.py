@@ -0,0 +1,87 @@
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, make_url, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+import app
+from app.core.config import settings
+
+
+@pytest.fixture(scope="session")
+def engine() -> Iterator[Engine]:
+    """
+    Engine of a database created for the tests next to the configured one
+    and migrated to the latest revision, dropped afterwards
+
+    Tests using it are skipped when the server cannot be reached
+    """
+    url = make_url(settings.SQLALCHEMY_DATABASE_URI.unicode_string())
+    test_url = url.set(database=f"{url.database}_test")
+    server = create_engine(url, isolation_level="AUTOCOMMIT", poolclass=NullPool)
+    drop = text(f'DROP DATABASE IF EXISTS "{test_url.database}" WITH (FORCE)')
+    try:
+        with server.connect() as connection:
+            connection.execute(drop)
+            connection.execute(text(f'CREATE DATABASE "{test_url.database}"'))
+    except (OperationalError, ProgrammingError) as exc:
+        pytest.skip(f"Cannot create a test database: {exc.orig}")
+
+    config = Config()
+    config.set_main_option(
+        "script_location", str(Path(app.__file__).parent / "alembic")
+    )
+    config.set_main_option(
+        "sqlalchemy.url",
+        test_url.render_as_string(hide_password=False).replace("%", "%%"),
+    )
+    command.upgrade(config, "head")
+
+    engine = create_engine(test_url)
+    yield engine
+    engine.dispose()
+    with server.connect() as connection:
+        connection.execute(drop)
+    server.dispose()
+
+
+@pytest.fixture
+def session(engine: Engine) -> Iterator[Session]:
+    """
+    Session in a transaction rolled back after the test, commits only
+    release savepoints
+    """
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        session = Session(
+            bind=connection,
+            autoflush=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+
+
+@pytest.fixture
+def vacation_writes_wait(engine: Engine) -> Callable[[], bool]:
+    """
+    Whether vacation writes of another transaction would wait for the test
+    session, they take a shared lock on all employees first
+    """
+    try_lock = text(
+        "SELECT pg_try_advisory_xact_lock_shared(hashtextextended('employee', 0))"
+    )
+
+    def wait() -> bool:
+        with engine.connect() as connection:
+            return not connection.scalar(try_lock)
+
+    return wait
@@ -0,0 +1,128 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.domain.availability import team_availability
+from app.domain.workdays import FULL_TIME, WorkCalendar, WorkSchedule, workday_flags
+
+
+START, END = date(2024, 4, 1), date(2024, 5, 31)
+
+CALENDAR_ID = uuid4()
+CALENDAR = WorkCalendar([date(2024, 5, 1), date(2024, 5, 8)])
+
+
+@pytest.fixture
+def team(mocker):
+    """
+    Five employees on two calendars and three schedules, with overlapping
+    vacations of different types and vacations around the period
+    """
+    employees = [
+        SimpleNamespace(id=uuid4(), calendar_id=calendar_id, work_schedule=schedule)
+        for calendar_id, schedule in [
+            (None, FULL_TIME),
+            (None, FULL_TIME),
+            (CALENDAR_ID, FULL_TIME),
+            (CALENDAR_ID, 0b0010101),
+            (None, FULL_TIME),
+        ]
+    ]
+    changes = [
+        SimpleNamespace(
+            employee_id=employees[1].id,
+            effective_date=date(2024, 5, 6),
+            work_schedule=0b0000111,
+        )
+    ]
+    vacations = sorted(
+        (
+            SimpleNamespace(employee_id=employees[i].id, start_date=start, end_date=end)
+            for i, start, end in [
+                (0, date(2024, 3, 25), date(2024, 4, 5)),
+                (0, date(2024, 4, 3), date(2024, 4, 10)),
+                (0, date(2024, 4, 20), date(2024, 4, 22)),
+                (1, date(2024, 5, 2), date(2024, 5, 14)),
+                (2, date(2024, 4, 29), date(2024, 5, 10)),
+                (3, date(2024, 4, 1), date(2024, 5, 31)),
+                (4, date(2024, 5, 30), date(2024, 6, 15)),
+            ]
+        ),
+        key=lambda vacation: (str(vacation.employee_id), vacation.start_date),
+    )
+    mocker.patch(
+        "app.domain.availability.EmployeeRepository.get_work_schedules",
+        return_value=employees,
+    )
+    mocker.patch(
+        "app.domain.availability.EmployeeScheduleRepository.get_changes",
+        return_value=changes,
+    )
+    mocker.patch(
+        "app.domain.availability.VacationRepository.get_team_intervals",
+        return_value=vacations,
+    )
+    mocker.patch(
+        "app.domain.availability.get_work_calendar",
+        side_effect=lambda _session, calendar_id: calendar_id and CALENDAR,
+    )
+    return employees, changes, vacations
+
+
+def test_team_availability_matches_day_by_day_count(team):
+    employees, changes, vacations = team
+    days = (END - START).days + 1
+    absent, present = [0] * days, [0] * days
+    for employee in employees:
+        flags = workday_flags(
+            START,
+            END,
+            calendar=CALENDAR if employee.calendar_id else None,
+            schedule=WorkSchedule(
+                employee.work_schedule,
+                [
+                    (change.effective_date, change.work_schedule)
+                    for change in changes
+                    if change.employee_id == employee.id
+                ],
+            ),
+        )
+        for i in range(days):
+            if not flags[i]:
+                continue
+            day = START + timedelta(days=i)
+            if any(
+                vacation.employee_id == employee.id
+                and vacation.start_date <= day <= vacation.end_date
+                for vacation in vacations
+            ):
+                absent[i] += 1
+            else:
+                present[i] += 1
+
+    availability = team_availability(None, uuid4(), START, END)
+
+    assert availability.employees == len(employees)
+    assert availability.absent == absent
+    assert availability.present == present
+
+
+def test_team_availability_counts_overlapping_vacations_once(team):
+    availability = team_availability(None, uuid4(), START, END)
+    # Employee 0 is away on two overlapping vacations and employee 3 on one,
+    # employee 3 does not work on tuesdays
+    tuesday = (date(2024, 4, 9) - START).days
+    assert availability.absent[tuesday] == 1
+    wednesday = (date(2024, 4, 3) - START).days
+    assert availability.absent[wednesday] == 2
+
+
+def test_team_availability_skips_days_not_worked(team):
+    availability = team_availability(None, uuid4(), START, END)
+    saturday = (date(2024, 4, 6) - START).days
+    assert availability.absent[saturday] == availability.present[saturday] == 0
+    # Holiday of the calendar of employees 2 and 3 only
+    holiday = (date(2024, 5, 1) - START).days
+    assert availability.absent[holiday] + availability.present[holiday] == 3
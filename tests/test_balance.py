@@ -0,0 +1,50 @@
+from datetime import date
+
+from app.domain.balance import backfill_balances
+from app.model.vacation import VacationType
+from app.repository.balance import VacationBalanceRepository
+from app.repository.employee import EmployeeRepository
+from app.repository.team import TeamRepository
+from app.repository.vacation import VacationRepository
+from app.schema.employee import EmployeeCreateSchema
+from app.schema.team import TeamCreateSchema
+from app.schema.vacation import VacationCreateSchema
+
+
+def test_backfill_rebuilds_balances_with_vacation_writes_locked(
+    session, vacation_writes_wait
+):
+    team = TeamRepository.create(session, TeamCreateSchema(name="backfill"))
+    employees = [
+        EmployeeRepository.create(
+            session,
+            EmployeeCreateSchema(
+                first_name="backfill", last_name=str(i), team_id=team.id
+            ),
+        )
+        for i in range(3)
+    ]
+    # Written without balances nor employee locks
+    for employee in employees:
+        VacationRepository.create(
+            session,
+            employee.id,
+            5,
+            VacationCreateSchema(
+                # Monday to friday
+                start_date=date(2093, 3, 2),
+                end_date=date(2093, 3, 6),
+                type=VacationType.PAID,
+            ),
+        )
+    # Stale balance, replaced
+    VacationBalanceRepository.add(
+        session, {(employees[0].id, 2093, VacationType.PAID): 2}
+    )
+
+    backfill_balances(session, page_size=2)
+    for employee in employees:
+        (balance,) = VacationBalanceRepository.get_by_employee_id(session, employee.id)
+        assert (balance.year, balance.days) == (2093, 5)
+
+    assert vacation_writes_wait()
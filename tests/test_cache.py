@@ -0,0 +1,148 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import cache
+from app.db.cache import (
+    IdentityCache,
+    LocalCacheBackend,
+    ProcessCache,
+    identity_cache_stats,
+    invalidate,
+)
+from app.schema.team import TeamSchema
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture(autouse=True)
+def backend(monkeypatch) -> LocalCacheBackend:
+    backend = LocalCacheBackend()
+    monkeypatch.setattr(cache, "_caches", {})
+    monkeypatch.setattr(cache, "get_cache_backend", lambda: backend)
+    monkeypatch.setattr(settings, "IDENTITY_CACHE_SIZE", 3)
+    monkeypatch.setattr(settings, "IDENTITY_CACHE_TTL", 60)
+    return backend
+
+
+def test_least_recently_used_values_are_evicted():
+    values: ProcessCache[str] = ProcessCache("test")
+    ids = [uuid4() for _ in range(4)]
+    for id_ in ids[:3]:
+        values.set(id_, str(id_), values.generation)
+    assert values.get(ids[0]) == str(ids[0])
+    values.set(ids[3], str(ids[3]), values.generation)
+    assert values.get(ids[1]) is None
+    assert [values.get(id_) for id_ in (ids[0], ids[2], ids[3])] == [
+        str(ids[0]),
+        str(ids[2]),
+        str(ids[3]),
+    ]
+
+
+def test_values_expire_after_ttl(clock):
+    values: ProcessCache[str] = ProcessCache("test")
+    id_ = uuid4()
+    values.set(id_, "value", values.generation)
+    clock.now += 59
+    assert values.get(id_) == "value"
+    clock.now += 1
+    assert values.get(id_) is None
+    assert (values.hits, values.misses) == (1, 1)
+
+
+def test_values_read_before_an_invalidation_are_not_cached():
+    values: ProcessCache[str] = ProcessCache("test")
+    id_ = uuid4()
+    generation = values.generation
+    # Another session invalidates while this one reads
+    values.pop(uuid4())
+    values.set(id_, "stale", generation)
+    assert values.get(id_) is None
+    values.set(id_, "fresh", values.generation)
+    assert values.get(id_) == "fresh"
+
+
+def test_values_cached_at_another_version_are_missed():
+    values: ProcessCache[str] = ProcessCache("test")
+    id_ = uuid4()
+    values.set(id_, "value", values.generation, "1")
+    assert values.get(id_, "1") == values.get(id_) == "value"
+    assert values.get(id_, "2") is None
+
+
+def test_cache_is_bypassed_while_backend_is_disconnected(backend):
+    values: ProcessCache[str] = ProcessCache("test")
+    id_ = uuid4()
+    values.set(id_, "value", values.generation)
+    backend.connected = False
+    assert not values.enabled
+    assert values.get(id_) is None
+    values.set(uuid4(), "value", values.generation)
+    backend.connected = True
+    assert values.get(id_) == "value"
+    assert len(values._entries) == 1
+
+
+@pytest.mark.parametrize("size, ttl", [(0, 60), (3, 0)])
+def test_cache_is_disabled_by_settings(monkeypatch, size, ttl):
+    monkeypatch.setattr(settings, "IDENTITY_CACHE_SIZE", size)
+    monkeypatch.setattr(settings, "IDENTITY_CACHE_TTL", ttl)
+    values: ProcessCache[str] = ProcessCache("test")
+    values.set(uuid4(), "value", values.generation)
+    assert not values.enabled and not values._entries
+
+
+def test_identity_cache_returns_copies():
+    teams: IdentityCache[TeamSchema] = IdentityCache("team")
+    team = TeamSchema(id=uuid4(), name="team", employees=[])
+    team._model = object()
+    teams.put(team, teams.generation)
+    cached = teams.get(team.id)
+    assert cached.model_dump() == team.model_dump() and cached is not team
+    assert cached._model is None
+    cached.name = "renamed"
+    assert teams.get(team.id).name == "team"
+
+
+def test_invalidate_drops_values_now_and_on_commit():
+    values: ProcessCache[str] = ProcessCache("test")
+    id_, other_id = uuid4(), uuid4()
+    values.set(id_, "value", values.generation)
+    values.set(other_id, "other", values.generation)
+    session = Session()
+
+    invalidate(session, values, [id_])
+    assert values.get(id_) is None
+    # Cached by another session from the rows before the write committed
+    values.set(id_, "stale", values.generation)
+    session.commit()
+    assert values.get(id_) is None
+    assert values.get(other_id) == "other"
+
+    invalidate(session, values)
+    assert values.get(other_id) is None
+
+
+def test_identity_cache_stats():
+    values: ProcessCache[str] = ProcessCache("test")
+    values.set(uuid4(), "value", values.generation)
+    values.get(uuid4())
+    (stats,) = identity_cache_stats()
+    assert (stats.name, stats.size, stats.maxsize, stats.misses) == ("test", 1, 3, 1)
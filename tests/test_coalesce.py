@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from app.api import coalesce
+from app.api.coalesce import Coalescer, coalescing_stats
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def coalescers(monkeypatch):
+    monkeypatch.setattr(coalesce, "_coalescers", {})
+    monkeypatch.setattr(settings, "REQUEST_COALESCING", True)
+    monkeypatch.setattr(settings, "REQUEST_COALESCING_TTL", 0)
+
+
+class _Loader:
+    """
+    Load returning the number of its call, each waits for `release`
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        return call
+
+
+async def _burst(coalescer: Coalescer, load: _Loader, keys: list) -> list:
+    tasks = [asyncio.ensure_future(coalescer.run(key, load)) for key in keys]
+    await asyncio.sleep(0)
+    load.release.set()
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_concurrent_requests_share_one_load():
+    async def run():
+        coalescer, load = Coalescer("test"), _Loader()
+        assert await _burst(coalescer, load, ["a"] * 5) == [1] * 5
+        assert load.calls == 1
+        assert (coalescer.requests, coalescer.loads, coalescer.coalesced) == (5, 1, 4)
+        # Nothing is kept once the load completed
+        assert await coalescer.run("a", load) == 2
+        assert not coalescer._loads
+
+    asyncio.run(run())
+
+
+def test_distinct_keys_and_none_load_separately():
+    async def run():
+        coalescer, load = Coalescer("test"), _Loader()
+        results = await _burst(coalescer, load, ["a", "b", None, None])
+        assert sorted(results) == [1, 2, 3, 4]
+        assert coalescer.coalesced == 0
+
+    asyncio.run(run())
+
+
+def test_disabled_coalescing_loads_every_request(monkeypatch):
+    monkeypatch.setattr(settings, "REQUEST_COALESCING", False)
+
+    async def run():
+        coalescer, load = Coalescer("test"), _Loader()
+        assert sorted(await _burst(coalescer, load, ["a"] * 3)) == [1, 2, 3]
+
+    asyncio.run(run())
+
+
+def test_errors_are_shared_but_not_kept():
+    async def run():
+        coalescer, calls = Coalescer("test"), []
+
+        async def fail():
+            calls.append(None)
+            await asyncio.sleep(0)
+            raise RuntimeError("load failed")
+
+        results = await asyncio.gather(
+            *(coalescer.run("a", fail) for _ in range(3)), return_exceptions=True
+        )
+        assert [type(result) for result in results] == [RuntimeError] * 3
+        assert len(calls) == 1
+        await asyncio.sleep(0)
+        assert not coalescer._loads
+        with pytest.raises(RuntimeError):
+            await coalescer.run("a", fail)
+        assert len(calls) == 2
+
+    asyncio.run(run())
+
+
+def test_cancelled_request_does_not_cancel_shared_load():
+    async def run():
+        coalescer, load = Coalescer("test"), _Loader()
+        first = asyncio.ensure_future(coalescer.run("a", load))
+        second = asyncio.ensure_future(coalescer.run("a", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        load.release.set()
+        assert await second == 1
+        assert first.cancelled()
+        assert load.calls == 1
+
+    asyncio.run(run())
+
+
+def test_results_are_kept_for_ttl(monkeypatch):
+    monkeypatch.setattr(settings, "REQUEST_COALESCING_TTL", 0.05)
+
+    async def run():
+        coalescer, load = Coalescer("test"), _Loader()
+        load.release.set()
+        assert await coalescer.run("a", load) == 1
+        assert await coalescer.run("a", load) == 1
+        await asyncio.sleep(0.1)
+        assert await coalescer.run("a", load) == 2
+
+    asyncio.run(run())
+
+
+def test_coalescing_stats():
+    async def run():
+        coalescer, load = Coalescer("test"), _Loader()
+        task = asyncio.ensure_future(coalescer.run("a", load))
+        await asyncio.sleep(0)
+        (stats,) = coalescing_stats()
+        assert (stats.name, stats.requests, stats.in_flight) == ("test", 1, 1)
+        load.release.set()
+        await task
+        (stats,) = coalescing_stats()
+        assert (stats.loads, stats.in_flight) == (1, 0)
+
+    asyncio.run(run())
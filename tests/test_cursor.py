@@ -0,0 +1,53 @@
+import base64
+import json
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+from app.repository.base import InvalidCursorException
+from app.repository.team import TeamRepository
+from app.repository.vacation import VacationRepository
+
+
+def _cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def test_cursor_round_trip():
+    values = (date(2024, 2, 29), uuid4())
+    cursor = VacationRepository._encode_cursor(values)
+    assert VacationRepository._decode_cursor(cursor) == values
+    # Cursors are safe in a query string as is
+    assert set(cursor) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_="
+    )
+
+
+def test_cursor_is_decoded_against_page_keys():
+    (id_,) = values = (uuid4(),)
+    assert TeamRepository._decode_cursor(TeamRepository._encode_cursor(values)) == (
+        id_,
+    )
+    with pytest.raises(InvalidCursorException):
+        VacationRepository._decode_cursor(TeamRepository._encode_cursor(values))
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not base64",
+        "é",
+        _cursor(["2024-02-29", str(uuid4())])[:-6],
+        base64.urlsafe_b64encode(b"not json").decode(),
+        _cursor({"start_date": "2024-02-29", "id": str(uuid4())}),
+        _cursor(["2024-02-30", str(uuid4())]),
+        _cursor(["2024-02-29", "not an id"]),
+        _cursor(["2024-02-29"]),
+        _cursor(["2024-02-29", str(uuid4()), 1]),
+    ],
+)
+def test_tampered_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursorException):
+        VacationRepository._decode_cursor(cursor)
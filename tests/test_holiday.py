@@ -0,0 +1,98 @@
+from datetime import date
+
+import pytest
+
+from app.domain.holiday import add_holiday, remove_holiday
+from app.domain.vacation import new_vacation
+from app.model.vacation import VacationType
+from app.repository.balance import VacationBalanceRepository
+from app.repository.calendar import CalendarRepository
+from app.repository.employee import EmployeeRepository
+from app.repository.team import TeamRepository
+from app.repository.vacation import VacationRepository
+from app.schema.calendar import CalendarCreateSchema, HolidayCreateSchema
+from app.schema.employee import EmployeeCreateSchema
+from app.schema.team import TeamCreateSchema
+from app.schema.vacation import VacationCreateSchema
+
+
+# Monday 2090-12-25 to friday 2091-01-05, 5 worked days in each year
+START, END = date(2090, 12, 25), date(2091, 1, 5)
+
+
+@pytest.fixture
+def calendar(session):
+    return CalendarRepository.create(session, CalendarCreateSchema(name="holidays"))
+
+
+def _employee(session, calendar_id=None):
+    team = TeamRepository.create(session, TeamCreateSchema(name="holidays"))
+    employee = EmployeeRepository.create(
+        session,
+        EmployeeCreateSchema(
+            first_name="holidays",
+            last_name="holidays",
+            team_id=team.id,
+            calendar_id=calendar_id,
+        ),
+    )
+    vacation = new_vacation(
+        session,
+        VacationCreateSchema(start_date=START, end_date=END, type=VacationType.PAID),
+        employee,
+    )
+    return employee, vacation
+
+
+def _counts(session, employee, vacation) -> tuple[int, dict[int, int]]:
+    return (
+        VacationRepository.refresh(session, vacation).total_work_days,
+        {
+            balance.year: balance.days
+            for balance in VacationBalanceRepository.get_by_employee_id(
+                session, employee.id
+            )
+        },
+    )
+
+
+def test_holidays_recount_vacations_and_balances(session, calendar):
+    employee, vacation = _employee(session, calendar.id)
+    other, other_vacation = _employee(session)
+    assert _counts(session, employee, vacation) == (10, {2090: 5, 2091: 5})
+
+    holiday = add_holiday(
+        session, calendar, HolidayCreateSchema(day=date(2091, 1, 1), name="new year")
+    )
+    assert _counts(session, employee, vacation) == (9, {2090: 5, 2091: 4})
+    # Employees following another calendar are left as they were
+    assert _counts(session, other, other_vacation) == (10, {2090: 5, 2091: 5})
+
+    remove_holiday(session, holiday)
+    assert _counts(session, employee, vacation) == (10, {2090: 5, 2091: 5})
+
+
+def test_vacation_writes_wait_for_holiday_recount(
+    session, calendar, vacation_writes_wait
+):
+    add_holiday(
+        session, calendar, HolidayCreateSchema(day=date(2091, 1, 1), name="new year")
+    )
+    assert vacation_writes_wait()
+
+
+def test_holidays_on_days_not_worked_change_nothing(session, calendar):
+    employee, vacation = _employee(session, calendar.id)
+    # A saturday
+    add_holiday(
+        session, calendar, HolidayCreateSchema(day=date(2090, 12, 30), name="none")
+    )
+    assert _counts(session, employee, vacation) == (10, {2090: 5, 2091: 5})
+
+
+def test_employee_ids_are_filtered_by_calendar(session, calendar):
+    employee, _ = _employee(session, calendar.id)
+    other, _ = _employee(session)
+    ids = EmployeeRepository.get_ids(session, limit=1000, calendar_id=calendar.id)
+    assert ids == [employee.id]
+    assert other.id in EmployeeRepository.get_ids(session, limit=1000)
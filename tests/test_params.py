@@ -0,0 +1,39 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.params import split_fields, split_ids
+from app.repository.base import MAX_PAGE_SIZE
+
+
+@pytest.mark.parametrize(
+    "value, fields",
+    [
+        (None, None),
+        ("", ()),
+        ("id", ("id",)),
+        ("id,start_date", ("id", "start_date")),
+        (" id , employee.team_id ,,", ("id", "employee.team_id")),
+    ],
+)
+def test_split_fields(value, fields):
+    assert split_fields(value) == fields
+
+
+def test_split_ids():
+    ids = [uuid4(), uuid4()]
+    assert split_ids(f"{ids[0]}, {ids[1]},") == ids
+
+
+@pytest.mark.parametrize("ids", ["not-an-id", f"{uuid4()},1"])
+def test_split_ids_rejects_invalid_ids(ids):
+    with pytest.raises(HTTPException) as exc_info:
+        split_ids(ids)
+    assert exc_info.value.status_code == 400
+
+
+def test_split_ids_rejects_too_many_ids():
+    with pytest.raises(HTTPException) as exc_info:
+        split_ids(",".join(str(uuid4()) for _ in range(MAX_PAGE_SIZE + 1)))
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,101 @@
+from collections.abc import Callable
+from datetime import date, timedelta
+
+import pytest
+
+from app.db.statements import record_statements
+from app.model.calendar import HolidayModel
+from app.model.vacation import VacationType
+from app.repository.calendar import CalendarRepository
+from app.repository.employee import EmployeeRepository
+from app.repository.team import TeamRepository
+from app.repository.vacation import VacationRepository
+from app.schema.calendar import CalendarCreateSchema
+from app.schema.employee import EmployeeCreateSchema
+from app.schema.team import TeamCreateSchema
+from app.schema.vacation import VacationCreateSchema
+
+
+SIZES = (5, 50)
+
+
+def _create(session, size: int, year: int) -> str:
+    """
+    Flush `size` teams and calendars named alike, each with two employees or
+    holidays, and one vacation per employee in `year`
+    """
+    name = f"query counts {size}"
+    for i in range(size):
+        team = TeamRepository.create(session, TeamCreateSchema(name=name))
+        calendar = CalendarRepository.create(session, CalendarCreateSchema(name=name))
+        session.add_all(
+            HolidayModel(calendar_id=calendar.id, day=date(year, 1, 1 + j), name=name)
+            for j in range(2)
+        )
+        for j in range(2):
+            employee = EmployeeRepository.create(
+                session,
+                EmployeeCreateSchema(
+                    first_name=name, last_name=str(j), team_id=team.id
+                ),
+            )
+            start_date = date(year, 2, 1) + timedelta(days=i % 300)
+            VacationRepository.create(
+                session,
+                employee.id,
+                1,
+                VacationCreateSchema(
+                    start_date=start_date, end_date=start_date, type=VacationType.PAID
+                ),
+            )
+    session.flush()
+    return name
+
+
+def _teams(session, name: str, _year: int) -> Callable[[], list]:
+    return lambda: TeamRepository.get_many(session, name=name)
+
+
+def _teams_by_ids(session, name: str, _year: int) -> Callable[[], list]:
+    ids = [
+        team["id"]
+        for team in TeamRepository.project_many(session, name=name, fields=["id"])
+    ]
+    return lambda: TeamRepository.get_many_by_ids(session, ids).items
+
+
+def _calendars(session, name: str, _year: int) -> Callable[[], list]:
+    return lambda: CalendarRepository.get_many(session, name=name)
+
+
+def _vacations(session, _name: str, year: int) -> Callable[[], list]:
+    return lambda: VacationRepository.get_by_query_params(
+        session, start_date=date(year, 1, 1), end_date=date(year, 12, 31)
+    )
+
+
+# Reads prepared outside of the statements counted
+READS = {
+    "teams with employees": _teams,
+    "teams by ids": _teams_by_ids,
+    "calendars with holidays": _calendars,
+    "vacations with employee": _vacations,
+}
+
+
+@pytest.mark.parametrize("read_name", READS)
+def test_queries_do_not_grow_with_objects(engine, session, read_name):
+    counts = []
+    for size, year in zip(SIZES, (2091, 2092)):
+        read = READS[read_name](session, _create(session, size, year), year)
+        # Objects already in the session would hide lazy loads
+        session.expunge_all()
+        with record_statements(engine) as statements:
+            objects = read()
+            for obj in objects:
+                obj.model_dump()
+        counts.append((len(objects), len(statements)))
+
+    ((small, small_count), (large, large_count)) = counts
+    assert 0 < small < large
+    assert small_count == large_count
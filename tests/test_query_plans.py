@@ -0,0 +1,64 @@
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from app.benchmarks.pagination import create_vacations
+from app.db.explain import explain, full_scans
+from app.model.vacation import VacationType
+from app.repository.vacation import VacationRepository
+
+
+START, END = date(2025, 1, 1), date(2025, 3, 31)
+
+HOT_QUERIES = {
+    "vacation by window": lambda session: VacationRepository.query_by_params(
+        session, start_date=START, end_date=END
+    ),
+    "vacation by window and type": lambda session: VacationRepository.query_by_params(
+        session, start_date=START, end_date=END, type_=VacationType.PAID
+    ),
+    "vacation by window and team": lambda session: VacationRepository.query_by_params(
+        session, start_date=START, end_date=END, team_id=uuid4()
+    ),
+    "vacation overlaps": lambda session: VacationRepository.query_overlapping(
+        session, uuid4(), START, END
+    ),
+}
+
+
+def test_full_scans():
+    plan = {
+        "Node Type": "Nested Loop",
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "employee"},
+            {
+                "Node Type": "Index Scan",
+                "Index Name": "vacation_period_idx",
+                "Index Cond": "(period && '[2025-01-01,2025-04-01)'::daterange)",
+            },
+            {
+                "Node Type": "Bitmap Heap Scan",
+                "Plans": [
+                    {"Node Type": "Bitmap Index Scan", "Index Name": "team_pkey"}
+                ],
+            },
+        ],
+    }
+    assert list(full_scans(plan)) == ["employee", "team_pkey"]
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_queries_use_indexes(session, name):
+    # Tables autovacuum happens to analyze while empty are planned as full
+    # scans, statistics of sized tables keep plans stable
+    create_vacations(session, 10_000)
+    session.execute(text("ANALYZE employee, team"))
+    # Plans must be able to avoid full scans even when the planner would
+    # prefer one, on a small table or to hash a join on a wide window
+    for setting in ("enable_seqscan", "enable_hashjoin", "enable_mergejoin"):
+        session.execute(text(f"SET LOCAL {setting} = off"))
+    query = HOT_QUERIES[name](session)
+    (plan,) = session.execute(explain(query.statement)).scalar_one()
+    assert sorted(set(full_scans(plan["Plan"]))) == []
@@ -0,0 +1,183 @@
+import asyncio
+from types import SimpleNamespace
+from typing import NamedTuple
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db import replica
+from app.db.replica import ON_REPLICA, REPLICATION_LAG, ReplicaSet
+from app.db.session import (
+    _create_async_engine,
+    _get_async_engine,
+    _get_replicas,
+    async_read_session,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(replica, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def test_replicas_are_taken_in_turn():
+    engines = ["a", "b", "c"]
+    replicas = ReplicaSet(engines, retry_seconds=30, max_lag_seconds=5)
+    assert [replicas.available()[0] for _ in range(4)] == ["a", "b", "c", "a"]
+    assert replicas.available() == ["b", "c", "a"]
+    assert ReplicaSet([], retry_seconds=30, max_lag_seconds=5).available() == []
+
+
+def test_replica_down_is_left_aside_for_retry_seconds(clock):
+    replicas = ReplicaSet(["a", "b"], retry_seconds=30, max_lag_seconds=5)
+    replicas.mark_down("a")
+    assert replicas.is_down("a") and not replicas.is_down("b")
+    assert replicas.available() == replicas.available() == ["b"]
+    clock.now += 30
+    assert not replicas.is_down("a")
+    assert sorted(replicas.available()) == ["a", "b"]
+
+
+def test_lagging_replica_is_left_aside(clock):
+    replicas = ReplicaSet(["a"], retry_seconds=30, max_lag_seconds=5)
+    assert replicas.lag_check_due("a")
+    assert not replicas.check_lag("a", 5.5)
+    assert replicas.is_down("a") and replicas.available() == []
+
+
+def test_lag_is_checked_again_once_it_may_exceed_the_limit(clock):
+    replicas = ReplicaSet(["a"], retry_seconds=30, max_lag_seconds=5)
+    assert replicas.check_lag("a", 2)
+    clock.now += 2.9
+    assert not replicas.lag_check_due("a")
+    clock.now += 0.1
+    assert replicas.lag_check_due("a")
+    # Outside of recovery there is no lag
+    assert replicas.check_lag("a", None)
+    clock.now += 4.9
+    assert not replicas.lag_check_due("a")
+
+
+@pytest.fixture
+def replicas() -> ReplicaSet:
+    if not settings.SQLALCHEMY_REPLICA_URIS:
+        pytest.skip("SQLALCHEMY_REPLICA_URIS is not set")
+    return _get_replicas()
+
+
+def _run(coroutine, *replica_sets: ReplicaSet):
+    """
+    Run a coroutine, engines are disposed after as their connections belong
+    to its event loop
+    """
+
+    async def run():
+        try:
+            return await coroutine
+        finally:
+            for replica_set in replica_sets:
+                for engine in replica_set.engines:
+                    await engine.dispose()
+            await _get_async_engine().dispose()
+
+    return asyncio.run(run())
+
+
+_DATABASE = text("SELECT inet_server_addr(), inet_server_port(), current_database()")
+
+
+class _Read(NamedTuple):
+    database: tuple
+    read_only: bool
+    isolation: str
+    on_replica: bool
+
+
+async def _read(**kwargs) -> _Read:
+    async with async_read_session(**kwargs) as session:
+        return _Read(
+            tuple((await session.execute(_DATABASE)).one()),
+            await session.scalar(text("SHOW transaction_read_only")) == "on",
+            await session.scalar(text("SHOW transaction_isolation")),
+            bool(session.info.get(ON_REPLICA)),
+        )
+
+
+def test_reads_go_to_a_replica(replicas):
+    async def run():
+        return await _read(primary=True), await _read()
+
+    primary, read = _run(run(), replicas)
+    assert read.database != primary.database
+    assert read.on_replica and not primary.on_replica
+    assert read.read_only and primary.read_only
+    # Statements of a read share a snapshot
+    assert read.isolation == primary.isolation == "repeatable read"
+
+
+def test_unreachable_replica_is_skipped(replicas):
+    unreachable = _create_async_engine(
+        "postgresql://unreachable@127.0.0.1:1/unreachable",
+        "unreachable",
+        timeout=settings.SQLALCHEMY_REPLICA_CONNECT_TIMEOUT,
+    )
+    with_unreachable = ReplicaSet(
+        [unreachable, *replicas.engines],
+        replicas.retry_seconds,
+        replicas.max_lag_seconds,
+    )
+
+    async def run():
+        return await _read(replicas=with_unreachable), await _read(replicas=replicas)
+
+    skipped, read = _run(run(), with_unreachable)
+    assert skipped.on_replica and skipped.database == read.database
+    assert with_unreachable.is_down(unreachable)
+
+
+def test_lagging_replica_is_skipped(replicas):
+    # No lag is allowed below 0 seconds, these replicas always lag
+    lagging = ReplicaSet(replicas.engines, replicas.retry_seconds, -1)
+
+    async def run():
+        return await _read(replicas=lagging), await _read(primary=True)
+
+    fallback, primary = _run(run(), replicas)
+    assert not fallback.on_replica and fallback.database == primary.database
+    assert all(lagging.is_down(engine) for engine in lagging.engines)
+
+
+def test_reads_fall_back_to_the_primary_without_replica(replicas):
+    down = ReplicaSet(
+        replicas.engines, replicas.retry_seconds, replicas.max_lag_seconds
+    )
+    for engine in down.engines:
+        down.mark_down(engine)
+
+    async def run():
+        return await _read(replicas=down), await _read(primary=True)
+
+    fallback, primary = _run(run(), replicas)
+    assert not fallback.on_replica and fallback.database == primary.database
+
+
+def test_replication_lag_is_within_limit(replicas):
+    async def run():
+        lags = []
+        for engine in replicas.engines:
+            async with engine.connect() as connection:
+                lags.append(await connection.scalar(REPLICATION_LAG) or 0)
+        return lags
+
+    assert max(_run(run(), replicas)) <= replicas.max_lag_seconds
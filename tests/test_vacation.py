@@ -0,0 +1,241 @@
+from datetime import date, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.domain.exceptions import (
+    BridgingDifferentTypesException,
+    VacationAlreadyExistsException,
+)
+from app.domain.vacation import _merge_overlaps, _neighbours, _Slot, new_vacations
+from app.domain.workdays import WorkSchedule, compute_workdays
+from app.model.vacation import VacationType
+from app.schema.employee import EmployeeSchema
+from app.schema.vacation import VacationCreateSchema, VacationSchema
+
+
+PAID, UNPAID = VacationType.PAID, VacationType.UNPAID
+
+
+def _slot(start: int, end: int, type_: VacationType = PAID) -> _Slot:
+    return _Slot(date(2024, 1, start), date(2024, 1, end), type_)
+
+
+def _vacation(start: int, end: int, type_: VacationType = PAID) -> VacationCreateSchema:
+    return VacationCreateSchema(
+        start_date=date(2024, 1, start), end_date=date(2024, 1, end), type=type_
+    )
+
+
+def test_merge_overlaps_absorbs_same_type():
+    before, after = _slot(1, 3), _slot(9, 10)
+    assert _merge_overlaps(_vacation(4, 8), [before, after]) == (
+        date(2024, 1, 1),
+        date(2024, 1, 10),
+        [before, after],
+    )
+
+
+def test_merge_overlaps_keeps_end_of_longer_new_vacation():
+    # The merged vacation used to end with the last absorbed one
+    overlap = _slot(1, 5)
+    assert _merge_overlaps(_vacation(3, 12), [overlap]) == (
+        date(2024, 1, 1),
+        date(2024, 1, 12),
+        [overlap],
+    )
+
+
+def test_merge_overlaps_without_neighbours():
+    assert _merge_overlaps(_vacation(4, 8), []) == (
+        date(2024, 1, 4),
+        date(2024, 1, 8),
+        [],
+    )
+
+
+def test_merge_overlaps_rejects_covered_vacation():
+    with pytest.raises(VacationAlreadyExistsException):
+        _merge_overlaps(_vacation(4, 8), [_slot(1, 10)])
+    with pytest.raises(VacationAlreadyExistsException):
+        _merge_overlaps(_vacation(4, 8), [_slot(4, 8, UNPAID)])
+
+
+def test_merge_overlaps_rejects_bridging_types():
+    with pytest.raises(BridgingDifferentTypesException):
+        _merge_overlaps(_vacation(4, 8), [_slot(1, 3), _slot(9, 10, UNPAID)])
+
+
+def test_merge_overlaps_leaves_single_other_type():
+    # Touching a vacation of another type alone is allowed, it is kept apart
+    assert _merge_overlaps(_vacation(4, 8), [_slot(9, 10, UNPAID)]) == (
+        date(2024, 1, 4),
+        date(2024, 1, 8),
+        [],
+    )
+
+
+@pytest.mark.parametrize(
+    "start, end, bounds",
+    [
+        # Between slots, not touching them
+        (8, 9, (2, 2)),
+        # Adjacent to the slot before and the one after
+        (7, 10, (1, 3)),
+        # Overlapping the first slot only
+        (2, 3, (0, 1)),
+        # Spanning every slot
+        (1, 31, (0, 4)),
+        # After the last slot, day after it
+        (27, 28, (4, 4)),
+        (26, 28, (3, 4)),
+        # Before the first slot, day before it
+        (1, 1, (0, 1)),
+    ],
+)
+def test_neighbours(start, end, bounds):
+    timeline = [_slot(2, 4), _slot(5, 6), _slot(11, 15), _slot(20, 25)]
+    assert _neighbours(timeline, _vacation(start, end)) == bounds
+
+
+@pytest.fixture
+def employee() -> EmployeeSchema:
+    return EmployeeSchema(
+        id=uuid4(), first_name="first", last_name="last", team_id=uuid4()
+    )
+
+
+@pytest.fixture
+def repository(mocker, employee: EmployeeSchema):
+    """
+    Vacations of `employee` kept in a list instead of the database
+    """
+    vacations: list[VacationSchema] = []
+
+    def get_overlapping(_session, _employee_id, start_date, end_date):
+        return sorted(
+            (
+                vacation
+                for vacation in vacations
+                if vacation.start_date <= end_date + timedelta(days=1)
+                and vacation.end_date >= start_date - timedelta(days=1)
+            ),
+            key=lambda vacation: vacation.start_date,
+        )
+
+    def create(_session, _employee_id, workdays, vacation_in):
+        vacation = VacationSchema(
+            id=uuid4(),
+            employee=employee,
+            total_work_days=workdays,
+            **vacation_in.model_dump(),
+        )
+        vacations.append(vacation)
+        return vacation
+
+    def delete_many(_session, deleted):
+        for vacation in deleted:
+            vacations.remove(vacation)
+
+    mocker.patch("app.domain.vacation.EmployeeRepository.lock")
+    mocker.patch(
+        "app.domain.vacation._get_work_time", return_value=(None, WorkSchedule())
+    )
+    mocker.patch("app.domain.vacation.update_balance")
+    mocker.patch(
+        "app.domain.vacation.VacationRepository.get_overlapping",
+        side_effect=get_overlapping,
+    )
+    mocker.patch("app.domain.vacation.VacationRepository.create", side_effect=create)
+    mocker.patch(
+        "app.domain.vacation.VacationRepository.update",
+        side_effect=lambda _session, vacation: vacation,
+    )
+    mocker.patch(
+        "app.domain.vacation.VacationRepository.delete_many", side_effect=delete_many
+    )
+    return vacations
+
+
+def _periods(vacations) -> list[tuple[date, date, VacationType]]:
+    return sorted(
+        (vacation.start_date, vacation.end_date, vacation.type)
+        for vacation in vacations
+    )
+
+
+def test_new_vacations_merges_batch_into_timeline(repository, employee):
+    existing = VacationSchema(
+        id=uuid4(),
+        employee=employee,
+        total_work_days=3,
+        start_date=date(2024, 1, 10),
+        end_date=date(2024, 1, 12),
+        type=PAID,
+    )
+    repository.append(existing)
+
+    results = new_vacations(
+        None,
+        [
+            # Merged with the existing vacation through the next one
+            _vacation(15, 16),
+            _vacation(13, 14),
+            # Overlaps the paid vacation merged so far
+            _vacation(3, 10),
+            # Touches the paid vacation only, kept apart as of another type
+            _vacation(17, 17, UNPAID),
+            # Apart from everything
+            _vacation(22, 23, UNPAID),
+            # Inside a vacation of the batch
+            _vacation(4, 5),
+        ],
+        employee,
+    )
+
+    assert [result.error is None for result in results] == [
+        True,
+        True,
+        True,
+        True,
+        True,
+        False,
+    ]
+    assert "already exists" in results[5].error
+    assert _periods(repository) == [
+        (date(2024, 1, 3), date(2024, 1, 16), PAID),
+        (date(2024, 1, 17), date(2024, 1, 17), UNPAID),
+        (date(2024, 1, 22), date(2024, 1, 23), UNPAID),
+    ]
+    # Vacations merged together share the existing vacation they extend
+    assert {results[i].vacation.id for i in range(3)} == {existing.id}
+    assert results[0].vacation.total_work_days == compute_workdays(
+        date(2024, 1, 3), date(2024, 1, 16)
+    )
+
+
+def test_new_vacations_rejects_bridging_batch_and_existing(repository, employee):
+    repository.append(
+        VacationSchema(
+            id=uuid4(),
+            employee=employee,
+            total_work_days=5,
+            start_date=date(2024, 1, 8),
+            end_date=date(2024, 1, 12),
+            type=UNPAID,
+        )
+    )
+    results = new_vacations(None, [_vacation(6, 7), _vacation(1, 5)], employee)
+    assert "Bridging" in results[0].error
+    assert results[1].error is None
+    assert _periods(repository) == [
+        (date(2024, 1, 1), date(2024, 1, 5), PAID),
+        (date(2024, 1, 8), date(2024, 1, 12), UNPAID),
+    ]
+
+
+def test_new_vacations_rejects_vacation_without_workdays(repository, employee):
+    # 2024-01-06 and 07 are a weekend
+    (result,) = new_vacations(None, [_vacation(6, 7)], employee)
+    assert result.vacation is None and "not worked" in result.error
+    assert not repository
@@ -0,0 +1,113 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from uuid import UUID
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.benchmarks.vacation_concurrency import check_vacations, random_vacation
+from app.domain.exceptions import DomainException
+from app.domain.vacation import new_vacation, update_vacation
+from app.model.balance import VacationBalanceModel
+from app.model.employee import EmployeeModel
+from app.model.team import TeamModel
+from app.model.vacation import VacationModel
+from app.repository.employee import EmployeeRepository
+from app.repository.team import TeamRepository
+from app.repository.vacation import VacationRepository
+from app.schema.employee import EmployeeCreateSchema
+from app.schema.team import TeamCreateSchema
+from app.schema.vacation import VacationCreateSchema, VacationUpdateSchema
+
+
+WORKERS = 8
+WRITES = 80
+
+
+@pytest.fixture
+def employee_id(engine) -> UUID:
+    """
+    Employee committed for the writes of other sessions, deleted afterwards
+    """
+    with Session(engine) as session, session.begin():
+        team = TeamRepository.create(session, TeamCreateSchema(name="concurrency"))
+        employee = EmployeeRepository.create(
+            session,
+            EmployeeCreateSchema(
+                first_name="concurrency", last_name="concurrency", team_id=team.id
+            ),
+        )
+    yield employee.id
+    with Session(engine) as session, session.begin():
+        for model in (VacationModel, VacationBalanceModel):
+            session.execute(delete(model).where(model.employee_id == employee.id))
+        session.execute(delete(EmployeeModel).where(EmployeeModel.id == employee.id))
+        session.execute(delete(TeamModel).where(TeamModel.id == team.id))
+
+
+def _write(engine, employee_id: UUID, write) -> bool:
+    """
+    Create a vacation or update one of the employee, each write in its own
+    transaction, return whether it was accepted
+    """
+    with Session(engine, autoflush=False) as session:
+        try:
+            with session.begin():
+                if isinstance(write, VacationCreateSchema):
+                    employee = EmployeeRepository.get_by_id(session, employee_id)
+                    new_vacation(session, write, employee)
+                    return True
+                index, update_data = write
+                if not (
+                    vacations := VacationRepository.get_by_employee_id(
+                        session, employee_id
+                    )
+                ):
+                    return False
+                update_vacation(session, vacations[index % len(vacations)], update_data)
+                return True
+        except DomainException:
+            return False
+
+
+def _run(engine, employee_id: UUID, writes: list) -> list[bool]:
+    with ThreadPoolExecutor(WORKERS) as executor:
+        return list(
+            executor.map(lambda write: _write(engine, employee_id, write), writes)
+        )
+
+
+def _check(engine, employee_id: UUID, created: list) -> list[str]:
+    with Session(engine, autoflush=False) as session:
+        problems = check_vacations(
+            session, [employee_id], [(employee_id, write) for write in created]
+        )
+        session.rollback()
+    return problems
+
+
+def test_concurrent_creates_are_all_merged(engine, employee_id):
+    rng = random.Random(0)
+    writes = [random_vacation(rng, 60) for _ in range(WRITES)]
+    accepted = _run(engine, employee_id, writes)
+    assert any(accepted)
+    created = [write for write, ok in zip(writes, accepted) if ok]
+    assert _check(engine, employee_id, created) == []
+
+
+def test_concurrent_creates_and_updates_stay_merged(engine, employee_id):
+    rng = random.Random(1)
+    writes = []
+    for i in range(WRITES):
+        vacation = random_vacation(rng, 60)
+        if i % 2:
+            vacation = (
+                rng.randrange(WRITES),
+                VacationUpdateSchema(
+                    start_date=vacation.start_date, end_date=vacation.end_date
+                ),
+            )
+        writes.append(vacation)
+    assert any(_run(engine, employee_id, writes))
+    assert _check(engine, employee_id, []) == []
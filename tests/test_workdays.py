@@ -0,0 +1,180 @@
+import random
+from collections.abc import Container
+from datetime import date, timedelta
+
+import pytest
+
+from app.domain.workdays import (
+    FULL_TIME,
+    WEEKEND,
+    WorkCalendar,
+    WorkSchedule,
+    compute_workdays,
+    compute_workdays_batch,
+    schedule_days_off,
+    workday_flags,
+)
+
+
+HOLIDAYS = [
+    date(2023, 12, 25),
+    date(2024, 1, 1),
+    date(2024, 2, 29),
+    date(2024, 5, 1),
+    # A saturday, not worked anyway
+    date(2024, 6, 1),
+    date(2024, 12, 31),
+    date(2025, 1, 1),
+]
+
+# Part time from march 2024, then four days a week from july
+CHANGES = [(date(2024, 3, 1), 0b0010101), (date(2024, 7, 1), 0b0001111)]
+
+
+def _days(start_date: date, end_date: date) -> list[date]:
+    return [
+        start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)
+    ]
+
+
+def _naive_workdays(
+    start_date: date,
+    end_date: date,
+    days_off: Container[int] = WEEKEND,
+    holidays: Container[date] = (),
+    changes: list[tuple[date, int]] | None = None,
+) -> int:
+    def day_off(day: date) -> Container[int]:
+        if changes is None:
+            return days_off
+        work_schedule = FULL_TIME
+        for effective_date, next_schedule in changes:
+            if effective_date <= day:
+                work_schedule = next_schedule
+        return schedule_days_off(work_schedule)
+
+    return sum(
+        day.weekday() not in day_off(day) and day not in holidays
+        for day in _days(start_date, end_date)
+    )
+
+
+def _intervals(count: int) -> list[tuple[date, date]]:
+    rng = random.Random(0)
+    intervals = []
+    for _ in range(count):
+        start_date = date(2023, 10, 1) + timedelta(days=rng.randrange(600))
+        intervals.append((start_date, start_date + timedelta(days=rng.randrange(400))))
+    return intervals
+
+
+@pytest.mark.parametrize("days_off", [WEEKEND, (), (6,), (0, 2, 4), range(7)])
+def test_compute_workdays_matches_day_by_day_count(days_off):
+    for start_date, end_date in _intervals(200):
+        assert compute_workdays(start_date, end_date, days_off) == _naive_workdays(
+            start_date, end_date, days_off
+        )
+
+
+def test_compute_workdays_of_reversed_interval_is_zero():
+    assert compute_workdays(date(2024, 1, 10), date(2024, 1, 9)) == 0
+    assert WorkCalendar(HOLIDAYS).count(date(2024, 1, 10), date(2024, 1, 9)) == 0
+
+
+def test_compute_workdays_counts_both_bounds():
+    # Monday to friday
+    assert compute_workdays(date(2024, 1, 8), date(2024, 1, 12)) == 5
+    # Saturday to sunday
+    assert compute_workdays(date(2024, 1, 13), date(2024, 1, 14)) == 0
+
+
+@pytest.mark.parametrize("days_off", [WEEKEND, (0, 1)])
+def test_work_calendar_skips_holidays_across_years(days_off):
+    calendar = WorkCalendar(HOLIDAYS)
+    for start_date, end_date in _intervals(200):
+        assert calendar.count(start_date, end_date, days_off) == _naive_workdays(
+            start_date, end_date, days_off, HOLIDAYS
+        )
+
+
+def test_work_calendar_reuses_year_prefixes():
+    calendar = WorkCalendar(HOLIDAYS)
+    calendar.count(date(2024, 1, 1), date(2025, 6, 30))
+    calendar.count(date(2024, 3, 1), date(2025, 1, 31))
+    assert sorted(year for year, _ in calendar._prefixes) == [2024, 2025]
+
+
+def test_work_schedule_segments():
+    schedule = WorkSchedule(FULL_TIME, reversed(CHANGES))
+    assert list(schedule.segments(date(2024, 1, 1), date(2024, 12, 31))) == [
+        (date(2024, 1, 1), date(2024, 2, 29), FULL_TIME),
+        (date(2024, 3, 1), date(2024, 6, 30), 0b0010101),
+        (date(2024, 7, 1), date(2024, 12, 31), 0b0001111),
+    ]
+    assert list(schedule.segments(date(2024, 4, 1), date(2024, 4, 30))) == [
+        (date(2024, 4, 1), date(2024, 4, 30), 0b0010101)
+    ]
+    # A change effective on the first day applies from that day
+    assert list(schedule.segments(date(2024, 7, 1), date(2024, 7, 5))) == [
+        (date(2024, 7, 1), date(2024, 7, 5), 0b0001111)
+    ]
+
+
+def test_schedule_days_off():
+    assert schedule_days_off(FULL_TIME) == WEEKEND
+    assert schedule_days_off(0b0010101) == (1, 3, 5, 6)
+    assert schedule_days_off(0) == tuple(range(7))
+
+
+@pytest.mark.parametrize("holidays", [(), HOLIDAYS])
+def test_compute_workdays_follows_schedule_changes(holidays):
+    calendar = WorkCalendar(holidays) if holidays else None
+    schedule = WorkSchedule(FULL_TIME, CHANGES)
+    for start_date, end_date in _intervals(200):
+        assert compute_workdays(
+            start_date, end_date, calendar=calendar, schedule=schedule
+        ) == _naive_workdays(start_date, end_date, holidays=holidays, changes=CHANGES)
+
+
+@pytest.mark.parametrize("holidays", [(), HOLIDAYS])
+def test_compute_workdays_batch_matches_single_counts(holidays):
+    calendar = WorkCalendar(holidays) if holidays else None
+    intervals = [*_intervals(100), (date(2024, 1, 10), date(2024, 1, 9))]
+    work_schedules = [
+        (FULL_TIME, 0b0010101, 0b1111111)[i % 3] for i in range(len(intervals))
+    ]
+    start_dates, end_dates = map(list, zip(*intervals))
+    assert compute_workdays_batch(
+        start_dates, end_dates, calendar=calendar, work_schedules=work_schedules
+    ) == [
+        compute_workdays(
+            start_date,
+            end_date,
+            schedule_days_off(work_schedule),
+            calendar,
+        )
+        for (start_date, end_date), work_schedule in zip(intervals, work_schedules)
+    ]
+
+
+def test_compute_workdays_batch_rejects_unequal_lengths():
+    with pytest.raises(ValueError):
+        compute_workdays_batch([date(2024, 1, 1)], [])
+    with pytest.raises(ValueError):
+        compute_workdays_batch(
+            [date(2024, 1, 1)], [date(2024, 1, 2)], work_schedules=[]
+        )
+
+
+def test_workday_flags_match_compute_workdays():
+    calendar = WorkCalendar(HOLIDAYS)
+    schedule = WorkSchedule(FULL_TIME, CHANGES)
+    start_date, end_date = date(2023, 12, 20), date(2024, 12, 31)
+    flags = workday_flags(start_date, end_date, calendar=calendar, schedule=schedule)
+    assert list(flags) == [
+        _naive_workdays(day, day, holidays=HOLIDAYS, changes=CHANGES)
+        for day in _days(start_date, end_date)
+    ]
+    assert sum(flags) == compute_workdays(
+        start_date, end_date, calendar=calendar, schedule=schedule
+    )